@@ -0,0 +1,84 @@
+# ------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# ------------------------------------
+"""
+Measures the memory per instance of the batch models and their slotted variants.
+
+Each model is instantiated many times with shared field values, so the memory traced
+while the instances are alive is the overhead of the instances themselves. Example:
+
+    python benchmarks/model_memory_benchmark.py --count 200000
+"""
+import argparse
+import gc
+import tracemalloc
+from typing import Any, Callable
+
+from kiota_abstractions.headers_collection import HeadersCollection
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from msgraph_core.requests.batch_request_item import BatchRequestItem, SlottedBatchRequestItem
+from msgraph_core.requests.batch_response_item import BatchResponseItem, SlottedBatchResponseItem
+
+
+def measure(factory: Callable[[], Any], count: int) -> float:
+    """Returns the bytes traced per instance while count instances are alive."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        instances = [factory() for _ in range(count)]
+        after = tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+    # The list holding the instances is not part of their overhead.
+    overhead = after - before - instances.__sizeof__()
+    return overhead / count
+
+
+def create_request_information() -> RequestInformation:
+    request_info = RequestInformation()
+    request_info.http_method = Method.GET
+    request_info.url = 'https://graph.microsoft.com/v1.0/users/me-token-to-replace/messages'
+    request_info.headers = HeadersCollection()
+    request_info.headers.add('Accept', 'application/json')
+    return request_info
+
+
+def create_response_item(item_class: type) -> Any:
+    item = item_class()
+    item.id = '1'
+    item.status = 200
+    return item
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--count', type=int, default=100000, help='instances per model')
+    args = parser.parse_args()
+
+    request_info = create_request_information()
+    models = [
+        (
+            'BatchRequestItem', lambda: BatchRequestItem(request_info, '1'),
+            lambda: SlottedBatchRequestItem(request_info, '1')
+        ),
+        (
+            'BatchResponseItem', lambda: create_response_item(BatchResponseItem),
+            lambda: create_response_item(SlottedBatchResponseItem)
+        ),
+    ]
+    print(f"{'model':>18} {'bytes':>8} {'slotted bytes':>14} {'saved':>7}")
+    for name, factory, slotted_factory in models:
+        size = measure(factory, args.count)
+        slotted_size = measure(slotted_factory, args.count)
+        print(
+            f'{name:>18} {size:>8.0f} {slotted_size:>14.0f} '
+            f'{(size - slotted_size) / size:>7.0%}'
+        )
+
+
+if __name__ == '__main__':
+    main()
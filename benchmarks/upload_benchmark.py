@@ -0,0 +1,116 @@
+# ------------------------------------
+# Copyright (c) Microsoft Corporation.
+# Licensed under the MIT License.
+# ------------------------------------
+"""
+Benchmarks the LargeFileUploadTask against the in-process upload session emulator.
+
+Every combination of chunk size and concurrency uploads the same file in a fresh
+process, so the peak resident set size reported for it is not inflated by the runs
+before it. Example:
+
+    python benchmarks/upload_benchmark.py --size-mb 256 --chunk-sizes 5 10 \\
+        --concurrency 1 4 --latency 0.05
+"""
+import argparse
+import asyncio
+import multiprocessing
+import os
+import resource
+import sys
+import tempfile
+import time
+
+from msgraph_core.tasks import LargeFileUploadTask
+from msgraph_core.tasks.chunk_sizer import CHUNK_SIZE_MULTIPLE
+from msgraph_core.tasks.upload_session_emulator import UploadSessionEmulator
+
+
+def get_peak_rss_mb() -> float:
+    """Returns the peak resident set size of the current process in MiB."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Reported in kilobytes on Linux and in bytes on macOS.
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+async def upload(path: str, chunk_size: int, concurrency: int, options: dict) -> float:
+    """Uploads the file once and returns the elapsed seconds."""
+    emulator = UploadSessionEmulator(store_content=False, **options)
+    size = os.path.getsize(path)
+    with open(path, 'rb') as stream:
+        task = LargeFileUploadTask(
+            emulator.create_session(size),
+            emulator.create_request_adapter(),
+            stream,
+            max_chunk_size=chunk_size,
+            max_concurrency=concurrency,
+            read_ahead=concurrency,
+        )
+        started = time.perf_counter()
+        result = await task.upload()
+        elapsed = time.perf_counter() - started
+    if not result.upload_succeeded:
+        raise RuntimeError('The upload did not complete.')
+    return elapsed
+
+
+def run(path: str, chunk_size: int, concurrency: int, options: dict, results) -> None:
+    """Runs a single configuration in a child process."""
+    elapsed = asyncio.run(upload(path, chunk_size, concurrency, options))
+    results.put((elapsed, get_peak_rss_mb()))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--size-mb', type=int, default=128, help='size of the test file')
+    parser.add_argument(
+        '--chunk-sizes',
+        type=float,
+        nargs='+',
+        default=[1.25, 5, 10, 20],
+        help='chunk sizes in MiB, rounded down to multiples of 320 KiB'
+    )
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[1, 2, 4, 8])
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds per request')
+    parser.add_argument('--bandwidth-mbps', type=float, help='link bandwidth in MiB/s')
+    parser.add_argument('--fault-rate', type=float, default=0.0)
+    args = parser.parse_args()
+
+    options = {
+        'latency': args.latency,
+        'bytes_per_second': args.bandwidth_mbps * 1024 * 1024 if args.bandwidth_mbps else None,
+        'fault_rate': args.fault_rate,
+        'retry_after': 0 if args.fault_rate else None,
+        'seed': 0,
+    }
+    context = multiprocessing.get_context('spawn')
+    with tempfile.NamedTemporaryFile(suffix='.bin') as file:
+        for _ in range(args.size_mb):
+            file.write(os.urandom(1024 * 1024))
+        file.flush()
+        print(
+            f"{'chunk MiB':>10} {'concurrency':>12} {'seconds':>9} {'MB/s':>9} {'peak RSS MiB':>13}"
+        )
+        for chunk_mb in args.chunk_sizes:
+            chunk_size = max(
+                int(chunk_mb * 1024 * 1024) // CHUNK_SIZE_MULTIPLE, 1
+            ) * CHUNK_SIZE_MULTIPLE
+            for concurrency in args.concurrency:
+                results = context.Queue()
+                process = context.Process(
+                    target=run, args=(file.name, chunk_size, concurrency, options, results)
+                )
+                process.start()
+                process.join()
+                if process.exitcode:
+                    raise RuntimeError(f'The benchmark process exited with {process.exitcode}.')
+                elapsed, peak_rss = results.get()
+                throughput = args.size_mb * 1024 * 1024 / elapsed / 1e6
+                print(
+                    f'{chunk_size / 1024 / 1024:>10.2f} {concurrency:>12} {elapsed:>9.2f} '
+                    f'{throughput:>9.1f} {peak_rss:>13.1f}'
+                )
+
+
+if __name__ == '__main__':
+    main()
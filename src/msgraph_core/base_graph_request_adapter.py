@@ -1,14 +1,19 @@
-from typing import Optional
+import re
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from typing import Any, Optional
 
 import httpx
 from kiota_abstractions.authentication import AuthenticationProvider
+from kiota_abstractions.request_information import RequestInformation
 from kiota_abstractions.serialization import (
+    ParsableFactory,
     ParseNodeFactory,
     ParseNodeFactoryRegistry,
     SerializationWriterFactory,
     SerializationWriterFactoryRegistry,
 )
-from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_http.httpx_request_adapter import AUTHENTICATE_CHALLENGED_EVENT_KEY, HttpxRequestAdapter
 
 from .graph_client_factory import GraphClientFactory
 
@@ -28,9 +33,80 @@ class BaseGraphRequestAdapter(HttpxRequestAdapter):
             serialization_writer_factory = SerializationWriterFactoryRegistry()
         if http_client is None:
             http_client = GraphClientFactory.create_with_default_middleware()
+        # Kept for stream_response, which sends requests outside of the kiota send methods.
+        self.authentication_provider = authentication_provider
+        self.http_client = http_client
         super().__init__(
             authentication_provider=authentication_provider,
             parse_node_factory=parse_node_factory,
             serialization_writer_factory=serialization_writer_factory,
             http_client=http_client
         )
+
+    @asynccontextmanager
+    async def stream_response(
+        self,
+        request_info: RequestInformation,
+        error_map: Optional[dict[str, type[ParsableFactory]]] = None
+    ) -> AsyncIterator[httpx.Response]:
+        """
+        Sends a request and hands over the response before its body has been read, so
+        large bodies can be processed as they arrive. The response is closed when the
+        context exits. Like send_async, a claims challenge is answered by authenticating
+        the request again with the claims and retrying it once.
+        Args:
+            request_info (RequestInformation): The request to send.
+            error_map (Optional[dict[str, type[ParsableFactory]]]): The error mapping used
+                when the request fails.
+        Returns:
+            AsyncIterator[httpx.Response]: The response, whose body can be read with
+                aiter_bytes.
+        Raises:
+            APIError: If the request failed.
+        """
+        parent_span = self.start_tracing_span(request_info, "stream_response")
+        try:
+            response = await self._send_streamed(request_info, parent_span)
+            try:
+                if not response.is_success:
+                    # Errors are small, read them so they can be deserialized.
+                    await response.aread()
+                    await self.throw_failed_responses(response, error_map, parent_span, parent_span)
+                yield response
+            finally:
+                await response.aclose()
+        finally:
+            parent_span.end()
+
+    async def _send_streamed(
+        self,
+        request_info: RequestInformation,
+        parent_span: Any,
+        claims: str = ''
+    ) -> httpx.Response:
+        self.set_base_url_for_request_information(request_info)
+        additional_authentication_context = {self.CLAIMS_KEY: claims} if claims else {}
+        await self.authentication_provider.authenticate_request(
+            request_info, additional_authentication_context
+        )
+        request = self.get_request_from_request_information(request_info, parent_span, parent_span)
+        response = await self.http_client.send(request, stream=True)
+        # A request already sent with claims is not retried again.
+        response_claims = None if claims else self._get_claims_challenge(response)
+        if response_claims is None:
+            return response
+        await response.aclose()
+        parent_span.add_event(AUTHENTICATE_CHALLENGED_EVENT_KEY)
+        parent_span.set_attribute("http.retry_count", 1)
+        return await self._send_streamed(request_info, parent_span, response_claims)
+
+    def _get_claims_challenge(self, response: httpx.Response) -> Optional[str]:
+        auth_header_value = response.headers.get(self.RESPONSE_AUTH_HEADER)
+        if response.status_code != 401 or not auth_header_value:
+            return None
+        if not auth_header_value.casefold().startswith(
+            self.BEARER_AUTHENTICATION_SCHEME.casefold()
+        ):
+            return None
+        claims_match = re.search('claims="([^"]+)"', auth_header_value)
+        return claims_match.group(1) if claims_match else None
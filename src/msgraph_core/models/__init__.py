@@ -1,5 +1,9 @@
 from .large_file_upload_session import LargeFileUploadSession
+from .lazy_page_result import LazyItem, LazyPageResult
 from .page_result import PageResult
 from .upload_result import UploadResult, UploadSessionDataHolder
 
-__all__ = ['PageResult', 'LargeFileUploadSession', 'UploadResult', 'UploadSessionDataHolder']
+__all__ = [
+    'PageResult', 'LazyPageResult', 'LazyItem', 'LargeFileUploadSession', 'UploadResult',
+    'UploadSessionDataHolder'
+]
@@ -0,0 +1,197 @@
+"""
+This module defines the LazyPageResult class, a page whose items are only read when
+they are used.
+
+Deserializing every item of a page into a model is most of the CPU spent on paging,
+and is wasted on the items a consumer filters out. The items of a LazyPageResult are
+LazyItem instances: they keep the parse nodes of their properties, and a JSON value, a
+property or the whole model is only read when it is first requested.
+
+Classes:
+    LazyItem: An item of a page kept as the parse nodes of its properties.
+    LazyPageResult: A page of LazyItem instances.
+"""
+from __future__ import annotations
+
+import functools
+from collections.abc import Callable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any, Optional, TypeVar
+
+from kiota_abstractions.serialization import Parsable, ParsableFactory, SerializationWriter
+from kiota_abstractions.serialization.parse_node import ParseNode
+
+from .page_result import PageResult
+
+T = TypeVar('T')
+U = TypeVar('U', bound=Parsable)
+
+
+class _AnyProperty(dict):
+    """
+    Field deserializers claiming every property, so that each is handed over as its
+    parse node instead of being read into additional data.
+    """
+
+    def __init__(self, nodes: dict[str, ParseNode]) -> None:
+        super().__init__()
+        self.nodes = nodes
+
+    def __contains__(self, name: object) -> bool:
+        return True
+
+    def __missing__(self, name: str) -> Callable[[ParseNode], None]:
+        return functools.partial(self.nodes.__setitem__, name)
+
+    def get(self, name: str, default: Any = None) -> Callable[[ParseNode], None]:
+        return self[name]
+
+
+class _Properties(Parsable):
+    """
+    Collects the parse nodes of the properties of an object without reading them.
+    """
+
+    def __init__(self, parse_node: ParseNode) -> None:
+        self.parse_node = parse_node
+        self.nodes: dict[str, ParseNode] = {}
+
+    @staticmethod
+    def create_from_discriminator_value(parse_node: ParseNode) -> _Properties:
+        return _Properties(parse_node)
+
+    def get_field_deserializers(self) -> dict[str, Callable[[ParseNode], None]]:
+        return _AnyProperty(self.nodes)
+
+    def serialize(self, writer: SerializationWriter) -> None:
+        raise NotImplementedError('The properties are only collected to be read.')
+
+
+def _read_value(properties: _Properties) -> Any:
+    if properties.nodes:
+        return LazyItem(properties.parse_node, properties.nodes)
+    return _read_json(properties.parse_node)
+
+
+def _read_json(parse_node: ParseNode) -> Any:
+    # The kind of a value is not known, so each kind is tried in turn: JSON parse nodes
+    # return None for a value of another kind.
+    for read in (
+        parse_node.get_bool_value, parse_node.get_int_value, parse_node.get_float_value,
+        parse_node.get_str_value
+    ):
+        value = read()
+        if value is not None:
+            return value
+    items = parse_node.get_collection_of_object_values(_Properties)
+    if items:
+        return [_read_value(item) for item in items]
+    # An empty array cannot be told apart from an empty object, and reads as an empty item.
+    return LazyItem(parse_node)
+
+
+class LazyItem(Mapping):
+    """
+    An item of a page kept as the parse nodes of its properties.
+
+    Reading the item like a dictionary returns the JSON values of its properties, with
+    objects as LazyItem instances and without the properties that are null.
+    get_value deserializes a single property and get_object_value the whole item; all
+    of them cache what they read.
+    """
+
+    def __init__(
+        self, parse_node: ParseNode, properties: Optional[dict[str, ParseNode]] = None
+    ) -> None:
+        """
+        Args:
+            parse_node (ParseNode): The parse node of the item.
+            properties (Optional[dict[str, ParseNode]]): The parse nodes of its properties
+                by name. Collected from parse_node when omitted.
+        """
+        self.parse_node = parse_node
+        if properties is None:
+            properties = parse_node.get_object_value(_Properties).nodes
+        self._properties = properties
+        self._json: dict[str, Any] = {}
+        self._values: dict[str, Any] = {}
+        self._object: Optional[Parsable] = None
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._json:
+            self._json[name] = _read_json(self._properties[name])
+        return self._json[name]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._properties)
+
+    def __len__(self) -> int:
+        return len(self._properties)
+
+    def __repr__(self) -> str:
+        return f'LazyItem({dict(self)!r})'
+
+    def get_value(self, name: str, getter: Callable[[ParseNode], T]) -> Optional[T]:
+        """
+        Deserializes a single property of the item.
+        Args:
+            name (str): The name of the property in the JSON object, e.g. createdDateTime.
+            getter (Callable[[ParseNode], T]): Reads the value from the parse node of the
+                property, e.g. lambda node: node.get_datetime_value().
+        Returns:
+            Optional[T]: The value, or None if the item does not have the property.
+        """
+        if name not in self._values:
+            parse_node = self._properties.get(name)
+            self._values[name] = None if parse_node is None else getter(parse_node)
+        return self._values[name]
+
+    def get_object_value(self, factory: ParsableFactory[U]) -> U:
+        """
+        Deserializes the whole item.
+        Args:
+            factory (ParsableFactory[U]): The model of the item, e.g. User.
+        Returns:
+            U: The model.
+        """
+        if self._object is None:
+            self._object = self.parse_node.get_object_value(factory)
+        return self._object  # type: ignore[return-value]
+
+
+@dataclass
+class LazyPageResult(PageResult):
+    """
+    A page whose items are LazyItem instances. Use it as the parsable factory of a
+    request, or as the first page of a PageIterator, whose following pages then are
+    lazy pages too.
+    """
+
+    @staticmethod
+    def create_from_discriminator_value(parse_node: Optional[ParseNode] = None) -> LazyPageResult:
+        """
+        Creates a new instance of the appropriate class based on discriminator value
+        Args:
+            parseNode: The parse node to use to read the discriminator value and create the object
+        Returns: LazyPageResult
+        """
+        if not parse_node:
+            raise TypeError("parse_node cannot be null")
+        return LazyPageResult()
+
+    def get_field_deserializers(self) -> dict[str, Callable[[ParseNode], None]]:
+        """Gets the deserialization information for this object.
+
+        Returns:
+            dict[str, Callable[[ParseNode], None]]: The deserialization information for this
+            object where each entry is a property key with its deserialization callback.
+        """
+        fields = super().get_field_deserializers()
+        fields["value"] = self._set_value
+        return fields
+
+    def _set_value(self, parse_node: ParseNode) -> None:
+        # Only the parse nodes of the properties of each item are collected, nothing is
+        # read until it is used.
+        items = parse_node.get_collection_of_object_values(_Properties) or []
+        self.value = [_read_value(item) for item in items]  # type: ignore[misc]
@@ -59,6 +59,7 @@ class UploadResult(Generic[T]):
         self.upload_session: Optional[UploadSessionDataHolder] = None
         self.item_response: Optional[T] = None
         self.location: Optional[str] = None
+        self.hashes: Optional[dict[str, str]] = None
 
     @property
     def upload_succeeded(self) -> bool:
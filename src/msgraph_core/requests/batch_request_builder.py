@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from typing import Optional, Type, TypeVar, Union
 
@@ -26,13 +27,31 @@ class BatchRequestBuilder:
     def __init__(
         self,
         request_adapter: RequestAdapter,
-        error_map: Optional[dict[str, Type[ParsableFactory]]] = None
+        error_map: Optional[dict[str, Type[ParsableFactory]]] = None,
+        max_concurrency: int = 1,
+        response_type: Type[BatchResponseContent] = BatchResponseContent
     ):
+        """
+        Args:
+            request_adapter (RequestAdapter): The adapter used to send the batches.
+            error_map (Optional[dict[str, Type[ParsableFactory]]]): Error mappings for
+                response handling.
+            max_concurrency (int): The batches of a BatchRequestContentCollection posted
+                at once. Each batch is throttled by the service as a whole, so keep it
+                low, e.g. 4, for requests to the same mailbox or tenant.
+            response_type (Type[BatchResponseContent]): The class the batch responses are
+                read into, e.g. SlottedBatchResponseContent to hold the responses of large
+                batch runs without a __dict__ each.
+        """
         if request_adapter is None:
             raise ValueError("request_adapter cannot be Null.")
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
         self._request_adapter = request_adapter
         self.url_template = f"{self._request_adapter.base_url.removesuffix('/')}/$batch"
         self.error_map = error_map or {}
+        self.max_concurrency = max_concurrency
+        self.response_type = response_type
 
     async def post(
         self,
@@ -55,7 +74,7 @@ class BatchRequestBuilder:
         """
         if batch_request_content is None:
             raise ValueError("batch_request_content cannot be Null.")
-        response_type = BatchResponseContent
+        response_type = self.response_type
 
         if isinstance(batch_request_content, BatchRequestContent):
             request_info = await self.to_post_request_information(batch_request_content)
@@ -85,6 +104,8 @@ class BatchRequestBuilder:
     ) -> BatchResponseContentCollection:
         """
         Sends a collection of batch requests and returns a collection of batch response contents.
+        Up to max_concurrency batches are posted at once; the responses are collected in the
+        order of the batches. If a batch fails, the batches not sent yet are cancelled.
 
         Args:
             batch_request_content_collection (BatchRequestContentCollection): The
@@ -100,8 +121,25 @@ class BatchRequestBuilder:
 
         batch_responses = BatchResponseContentCollection()
         batch_requests = batch_request_content_collection.get_batch_requests_for_execution()
-        for batch_request_content in batch_requests:
-            response = await self.post(batch_request_content, error_map)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def post_batch(
+            batch_request_content: BatchRequestContent
+        ) -> Union[BatchResponseContent, BatchResponseContentCollection]:
+            async with semaphore:
+                return await self.post(batch_request_content, error_map)
+
+        tasks = [
+            asyncio.ensure_future(post_batch(batch_request_content))
+            for batch_request_content in batch_requests
+        ]
+        try:
+            responses = await asyncio.gather(*tasks)
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for response in responses:
             if isinstance(response, BatchResponseContent):
                 batch_responses.add_response(response)
 
@@ -15,13 +15,20 @@ class BatchRequestContent(Parsable):
 
     MAX_REQUESTS = 20
 
-    def __init__(self, requests: dict[str, Union[BatchRequestItem, RequestInformation]] = {}):
+    def __init__(
+        self,
+        requests: dict[str, Union[BatchRequestItem, RequestInformation]] = {},
+        request_item_type: type[BatchRequestItem] = BatchRequestItem
+    ):
         """
         Initializes a new instance of the BatchRequestContent class.
         Args:
             Requests (dict[str, Union[BatchRequestItem, RequestInformation]]): The requests to add.
+            request_item_type (type[BatchRequestItem]): The class of the items created for
+                request informations and urllib requests, e.g. SlottedBatchRequestItem.
         """
         self._requests: dict[str, BatchRequestItem] = {}
+        self.request_item_type = request_item_type
 
         self.is_finalized = False
         for request_id, request in requests.items():
@@ -82,7 +89,7 @@ class BatchRequestContent(Parsable):
             request_id: Optional[str]: The request id to add.
         """
         request_id = request_id if request_id else str(uuid.uuid4())
-        self.add_request(request_id, BatchRequestItem(request_information))
+        self.add_request(request_id, self.request_item_type(request_information))
 
     def add_urllib_request(self, request: Request, request_id: Optional[str] = None) -> None:
         """
@@ -92,7 +99,7 @@ class BatchRequestContent(Parsable):
             request_id: Optional[str]: The request id to add.
         """
         request_id = request_id if request_id else str(uuid.uuid4())
-        self.add_request(request_id, BatchRequestItem.create_with_urllib_request(request))
+        self.add_request(request_id, self.request_item_type.create_with_urllib_request(request))
 
     def remove(self, request_id: str) -> None:
         """
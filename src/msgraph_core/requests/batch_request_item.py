@@ -14,6 +14,8 @@ from kiota_abstractions.method import Method
 from kiota_abstractions.request_information import RequestInformation
 from kiota_abstractions.serialization import Parsable, ParseNode, SerializationWriter
 
+from .slotted_variant import create_slotted_variant
+
 
 @deprecated("Use BytesIO type instead")
 class StreamInterface(BytesIO):
@@ -52,8 +54,9 @@ class BatchRequestItem(Parsable):
         if depends_on is not None:
             self.set_depends_on(depends_on)
 
-    @staticmethod
+    @classmethod
     def create_with_urllib_request(
+        cls,
         request: urllib.request.Request,
         id: str = "",
         depends_on: Optional[list[str]] = None
@@ -79,7 +82,7 @@ class BatchRequestItem(Parsable):
         for key, value in request.headers.items():
             request_info.headers.try_add(header_name=key, header_value=value)
         request_info.content = request.data  # type: ignore
-        return BatchRequestItem(
+        return cls(
             request_info,
             id,
             depends_on  # type: ignore # union types not analysed correctly
@@ -271,3 +274,8 @@ class BatchRequestItem(Parsable):
                 )
             else:
                 writer.write_str_value('body', base64.b64encode(self._body).decode('utf-8'))
+
+
+SlottedBatchRequestItem = create_slotted_variant(
+    BatchRequestItem, ('_id', '_method', '_headers', '_body', 'url', '_depends_on')
+)
@@ -11,13 +11,16 @@ from kiota_abstractions.serialization import (
     SerializationWriter,
 )
 
-from .batch_response_item import BatchResponseItem
+from .batch_response_item import BatchResponseItem, SlottedBatchResponseItem
 
 T = TypeVar('T', bound=ParsableFactory)
 
 
 class BatchResponseContent(Parsable):
 
+    # The class the responses are read into.
+    response_item_type: type[BatchResponseItem] = BatchResponseItem
+
     def __init__(self) -> None:
         """
         Initializes a new instance of the BatchResponseContent class.
@@ -147,7 +150,7 @@ class BatchResponseContent(Parsable):
         """
 
         def set_responses(n: ParseNode):
-            values = n.get_collection_of_object_values(BatchResponseItem)
+            values = n.get_collection_of_object_values(self.response_item_type)
             if values:
                 setattr(self, '_responses', {item.id: item for item in values})
             else:
@@ -172,3 +175,19 @@ class BatchResponseContent(Parsable):
         if parse_node is None:
             raise ValueError("parse_node cannot be None")
         return BatchResponseContent()
+
+
+class SlottedBatchResponseContent(BatchResponseContent):
+    """
+    A BatchResponseContent whose responses are SlottedBatchResponseItem instances.
+    """
+
+    response_item_type = SlottedBatchResponseItem
+
+    @staticmethod
+    def create_from_discriminator_value(
+        parse_node: Optional[ParseNode] = None
+    ) -> 'SlottedBatchResponseContent':
+        if parse_node is None:
+            raise ValueError("parse_node cannot be None")
+        return SlottedBatchResponseContent()
@@ -9,6 +9,8 @@ from kiota_abstractions.serialization import (
     SerializationWriter,
 )
 
+from .slotted_variant import create_slotted_variant
+
 
 @deprecated("Use BytesIO type instead")
 class StreamInterface(BytesIO):
@@ -174,3 +176,8 @@ class BatchResponseItem(Parsable):
             writer.write_bytes_value('body', self._body.getvalue())
         else:
             writer.write_bytes_value('body', None)
+
+
+SlottedBatchResponseItem = create_slotted_variant(
+    BatchResponseItem, ('_id', '_atomicity_group', '_status', '_headers', '_body')
+)
@@ -0,0 +1,52 @@
+"""
+Variants of the batch models whose instances have no __dict__.
+
+Large batch runs hold hundreds of thousands of request and response items, and the
+__dict__ of each is a measurable share of their memory. Parsable declares no
+__slots__, so no subclass of it can drop its __dict__: a slotted variant is instead a
+copy of every member of the model, registered as a virtual subclass of the model so
+isinstance checks against the model, and against Parsable, still hold.
+"""
+from typing import Optional, TypeVar
+
+from kiota_abstractions.serialization import Parsable, ParseNode
+
+T = TypeVar('T', bound=Parsable)
+
+# Members that belong to a class rather than to its behaviour.
+_CLASS_ATTRIBUTES = {'__dict__', '__weakref__', '__slots__', '__abstractmethods__'}
+
+
+def create_slotted_variant(model: type[T], slots: tuple[str, ...]) -> type[T]:
+    """
+    Creates a slotted variant of a model.
+    Args:
+        model (type[T]): The model, e.g. BatchResponseItem.
+        slots (tuple[str, ...]): The names of every attribute set on the instances.
+    Returns:
+        type[T]: The variant, named after the model with a Slotted prefix. Its
+            create_from_discriminator_value creates instances of the variant.
+    """
+    namespace: dict = {}
+    # Members inherited from the bases of the model are copied too, up to Parsable.
+    for base in reversed(model.__mro__):
+        if base is object or issubclass(Parsable, base):
+            continue
+        for name, value in vars(base).items():
+            if name in _CLASS_ATTRIBUTES or name.startswith('_abc_') or name in slots:
+                continue
+            namespace[name] = value
+    name = f'Slotted{model.__name__}'
+    namespace.update(__slots__=slots, __qualname__=name, __module__=model.__module__)
+    variant = type(name, (), namespace)
+
+    def create_from_discriminator_value(parse_node: Optional[ParseNode] = None) -> T:
+        if not parse_node:
+            raise TypeError("parse_node cannot be null")
+        return variant()
+
+    variant.create_from_discriminator_value = staticmethod(  # type: ignore[attr-defined]
+        create_from_discriminator_value
+    )
+    model.register(variant)  # type: ignore[attr-defined]
+    return variant
@@ -1,4 +1,72 @@
+from .bandwidth_limiter import BandwidthLimiter
+from .checkpoint_store import (
+    CheckpointStore,
+    InMemoryCheckpointStore,
+    JsonFileCheckpointStore,
+    SqliteCheckpointStore,
+)
+from .chunk_sizer import AdaptiveChunkSizer
+from .content_hash import ContentHasher, QuickXorHash
+from .delta_sync import DeltaChange, DeltaChangeType, DeltaSyncEngine
+from .large_file_download import LargeFileDownloadTask
 from .large_file_upload import LargeFileUploadTask
+from .multi_page_iterator import MultiPageIterator, SourcedItem
+from .page_export import (
+    ArrowIpcBatchWriter,
+    BatchWriter,
+    CsvBatchWriter,
+    PageExporter,
+    ParquetBatchWriter,
+)
 from .page_iterator import PageIterator
+from .page_iterator_checkpoint import PageIteratorCheckpoint
+from .page_pipeline import PagePipeline
+from .page_stream_parser import JsonPageStreamParser
+from .partitioned_page_iterator import PartitionedPageIterator
+from .upload_checkpoint import UploadCheckpoint
+from .upload_progress import UploadEventStream, UploadEventType, UploadObserver, UploadProgressEvent
+from .upload_retry import ChunkRetryPolicy, UploadStatistics
+from .upload_scheduler import UploadScheduler, UploadSchedulerProgress
+from .upload_session_emulator import UploadSessionEmulator
+from .upload_source import AsyncIteratorUploadSource, StreamUploadSource, UploadSource
 
-__all__ = ['PageIterator', 'LargeFileUploadTask']
+__all__ = [
+    'PageIterator',
+    'PageIteratorCheckpoint',
+    'PagePipeline',
+    'PageExporter',
+    'BatchWriter',
+    'CsvBatchWriter',
+    'ArrowIpcBatchWriter',
+    'ParquetBatchWriter',
+    'MultiPageIterator',
+    'SourcedItem',
+    'PartitionedPageIterator',
+    'JsonPageStreamParser',
+    'DeltaSyncEngine',
+    'DeltaChange',
+    'DeltaChangeType',
+    'LargeFileUploadTask',
+    'LargeFileDownloadTask',
+    'UploadSource',
+    'StreamUploadSource',
+    'AsyncIteratorUploadSource',
+    'AdaptiveChunkSizer',
+    'UploadCheckpoint',
+    'CheckpointStore',
+    'InMemoryCheckpointStore',
+    'JsonFileCheckpointStore',
+    'SqliteCheckpointStore',
+    'ChunkRetryPolicy',
+    'UploadStatistics',
+    'UploadScheduler',
+    'UploadSchedulerProgress',
+    'BandwidthLimiter',
+    'ContentHasher',
+    'QuickXorHash',
+    'UploadEventStream',
+    'UploadEventType',
+    'UploadObserver',
+    'UploadProgressEvent',
+    'UploadSessionEmulator',
+]
@@ -0,0 +1,90 @@
+"""
+Helpers for working with the inclusive byte ranges exchanged with upload sessions.
+
+Ranges are represented as sorted, non-overlapping lists of ``(start, end)`` tuples
+where both offsets are inclusive, mirroring the ``bytes start-end/total`` notation
+used by the ``Content-Range`` header and the ``nextExpectedRanges`` property.
+"""
+from collections.abc import Iterable
+
+ByteRange = tuple[int, int]
+
+
+def parse_ranges(ranges: Iterable[str], size: int) -> list[ByteRange]:
+    """
+    Parses range strings such as ``"0-1023"`` or ``"1024-"`` into inclusive tuples.
+    Open ended ranges are closed at the last byte of a payload of the given size.
+    Args:
+        ranges (Iterable[str]): The range strings to parse.
+        size (int): The total size of the payload in bytes.
+    Returns:
+        list[ByteRange]: The parsed ranges, sorted and merged.
+    """
+    parsed: list[ByteRange] = []
+    for value in ranges:
+        parts = str(value).strip().split('-')
+        if not parts[0]:
+            raise ValueError(f'Invalid byte range {value!r}.')
+        start = int(parts[0])
+        end = int(parts[1]) if len(parts) > 1 and parts[1] else size - 1
+        end = min(end, size - 1)
+        if start <= end:
+            parsed.append((start, end))
+    return merge_ranges(parsed)
+
+
+def format_ranges(ranges: Iterable[ByteRange]) -> list[str]:
+    """
+    Formats inclusive tuples back into ``start-end`` range strings.
+    """
+    return [f'{start}-{end}' for start, end in ranges]
+
+
+def merge_ranges(ranges: Iterable[ByteRange]) -> list[ByteRange]:
+    """
+    Sorts ranges and merges the ones that overlap or touch.
+    """
+    merged: list[ByteRange] = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + 1:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def subtract_range(ranges: Iterable[ByteRange], start: int, end: int) -> list[ByteRange]:
+    """
+    Removes the inclusive range ``start``-``end`` from a list of ranges.
+    """
+    remaining: list[ByteRange] = []
+    for range_start, range_end in ranges:
+        if range_end < start or range_start > end:
+            remaining.append((range_start, range_end))
+            continue
+        if range_start < start:
+            remaining.append((range_start, start - 1))
+        if range_end > end:
+            remaining.append((end + 1, range_end))
+    return remaining
+
+
+def intersect_ranges(first: Iterable[ByteRange], second: Iterable[ByteRange]) -> list[ByteRange]:
+    """
+    Returns the byte ranges present in both lists.
+    """
+    second = list(second)
+    intersection: list[ByteRange] = []
+    for start, end in first:
+        for other_start, other_end in second:
+            low, high = max(start, other_start), min(end, other_end)
+            if low <= high:
+                intersection.append((low, high))
+    return merge_ranges(intersection)
+
+
+def ranges_length(ranges: Iterable[ByteRange]) -> int:
+    """
+    Returns the number of bytes covered by the ranges.
+    """
+    return sum(end - start + 1 for start, end in ranges)
@@ -0,0 +1,38 @@
+"""
+Helpers for working through a list of jobs with a fixed number of concurrent workers.
+"""
+import asyncio
+from collections.abc import Awaitable, Callable, Iterable
+from typing import TypeVar
+
+T = TypeVar('T')
+
+
+async def run_workers(
+    jobs: Iterable[T], run_job: Callable[[T], Awaitable[None]], max_workers: int
+) -> None:
+    """
+    Runs the jobs in order, with up to max_workers of them running at once.
+
+    The first job that fails stops the others and its error is raised. Whether the
+    jobs complete, fail or the call is cancelled, every worker has stopped when it
+    returns.
+    Args:
+        jobs (Iterable[T]): The jobs, started in order.
+        run_job (Callable[[T], Awaitable[None]]): Runs a job.
+        max_workers (int): The number of jobs run at once.
+    """
+    pending = list(jobs)
+    pending.reverse()
+
+    async def work() -> None:
+        while pending:
+            await run_job(pending.pop())
+
+    workers = [asyncio.ensure_future(work()) for _ in range(min(max_workers, len(pending)))]
+    try:
+        await asyncio.gather(*workers)
+    finally:
+        for worker in workers:
+            worker.cancel()
+        await asyncio.gather(*workers, return_exceptions=True)
@@ -0,0 +1,48 @@
+"""
+Bandwidth limiting shared by concurrent uploads.
+"""
+import asyncio
+import time
+from typing import Optional
+
+
+class BandwidthLimiter:
+    """
+    A token bucket that paces requests to an average number of bytes per second.
+
+    Each request takes as many tokens as it sends bytes. Tokens refill continuously up
+    to the burst size, and a request larger than the available tokens waits until the
+    deficit has refilled. Waiting requests are admitted in the order they arrived.
+    """
+
+    def __init__(self, bytes_per_second: float, burst: Optional[int] = None) -> None:
+        """
+        Args:
+            bytes_per_second (float): The average rate to allow.
+            burst (Optional[int]): The number of bytes that can be sent at once after
+                an idle period. Defaults to one second worth of bytes.
+        """
+        if bytes_per_second <= 0:
+            raise ValueError("bytes_per_second must be positive.")
+        self.bytes_per_second = bytes_per_second
+        self.burst = bytes_per_second if burst is None else burst
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.bytes_per_second)
+        self._updated = now
+
+    async def acquire(self, size: int) -> None:
+        """
+        Waits until size bytes can be sent without exceeding the rate.
+        Args:
+            size (int): The number of bytes about to be sent.
+        """
+        async with self._lock:
+            self._refill()
+            self._tokens -= size
+            if self._tokens < 0:
+                await asyncio.sleep(-self._tokens / self.bytes_per_second)
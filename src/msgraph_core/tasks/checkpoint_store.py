@@ -0,0 +1,236 @@
+"""
+Pluggable stores for the state that lets long running tasks resume after a crash.
+
+Checkpoints are JSON compatible dictionaries saved under a string key. A local JSON
+file backend and a SQLite backend are provided; both replace a checkpoint atomically so
+a process killed mid-write leaves the previous checkpoint intact.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Any, Optional, Union
+
+
+def write_json_file(path: Union[str, os.PathLike], value: Any) -> None:
+    """
+    Writes a value as JSON, replacing the file atomically. The value is written to a
+    temporary file in the same directory, flushed to disk and renamed over the file.
+    """
+    descriptor, temp_path = tempfile.mkstemp(
+        dir=os.path.dirname(os.fspath(path)) or None, suffix='.tmp'
+    )
+    try:
+        with os.fdopen(descriptor, 'w', encoding='utf-8') as file:
+            json.dump(value, file)
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+
+
+class CheckpointWriter:
+    """
+    Runs the writes of a checkpoint in the default executor, so that flushing files to
+    disk or committing to a database never stalls the event loop.
+
+    One write runs at a time. Only the latest state of a checkpoint matters, so a write
+    submitted while another runs replaces any write still waiting for its turn.
+    """
+
+    def __init__(self) -> None:
+        self._pending: Optional[Callable[[], None]] = None
+        self._writing: Optional[asyncio.Future] = None
+
+    def submit(self, write: Callable[[], None]) -> None:
+        """
+        Schedules a write after the one running.
+        Args:
+            write (Callable[[], None]): Writes the checkpoint, e.g. a partial of
+                CheckpointStore.save.
+        Raises:
+            Exception: The error of a previous write that failed.
+        """
+        writing = self._writing
+        if writing is not None and writing.done():
+            self._writing = None
+            writing.result()
+        self._pending = write
+        if self._writing is None:
+            self._writing = asyncio.ensure_future(self._write_pending())
+
+    async def flush(self) -> None:
+        """
+        Waits until every write submitted has run.
+        Raises:
+            Exception: The error of a write that failed.
+        """
+        while self._writing is not None:
+            writing = self._writing
+            try:
+                await asyncio.shield(writing)
+            finally:
+                if self._writing is writing and writing.done():
+                    self._writing = None
+
+    async def _write_pending(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._pending is not None:
+            write, self._pending = self._pending, None
+            await loop.run_in_executor(None, write)
+
+
+class CheckpointStore(ABC):
+    """
+    Saves, loads and deletes checkpoints by key.
+    """
+
+    @abstractmethod
+    def load(self, key: str) -> Optional[dict[str, Any]]:
+        """
+        Loads a checkpoint.
+        Args:
+            key (str): The key the checkpoint was saved under.
+        Returns:
+            Optional[dict[str, Any]]: The checkpoint, or None if there is none.
+        """
+
+    @abstractmethod
+    def save(self, key: str, checkpoint: dict[str, Any]) -> None:
+        """
+        Saves a checkpoint, replacing any previous checkpoint with the same key.
+        Args:
+            key (str): The key to save the checkpoint under.
+            checkpoint (dict[str, Any]): A JSON compatible checkpoint.
+        """
+
+    @abstractmethod
+    def delete(self, key: str) -> None:
+        """
+        Deletes a checkpoint if it exists.
+        Args:
+            key (str): The key the checkpoint was saved under.
+        """
+
+
+class InMemoryCheckpointStore(CheckpointStore):
+    """
+    Keeps checkpoints in memory. Useful for tests and for resuming within a process.
+    """
+
+    def __init__(self) -> None:
+        self._checkpoints: dict[str, str] = {}
+
+    def load(self, key: str) -> Optional[dict[str, Any]]:
+        value = self._checkpoints.get(key)
+        return json.loads(value) if value is not None else None
+
+    def save(self, key: str, checkpoint: dict[str, Any]) -> None:
+        self._checkpoints[key] = json.dumps(checkpoint)
+
+    def delete(self, key: str) -> None:
+        self._checkpoints.pop(key, None)
+
+
+class JsonFileCheckpointStore(CheckpointStore):
+    """
+    Saves each checkpoint as a JSON file in a directory.
+
+    Files are written to a temporary file, flushed to disk and renamed over the
+    previous checkpoint.
+    """
+
+    def __init__(self, directory: Union[str, os.PathLike]) -> None:
+        """
+        Args:
+            directory (Union[str, os.PathLike]): The directory holding the checkpoints.
+                Created if it does not exist.
+        """
+        self.directory = os.fspath(directory)
+        os.makedirs(self.directory, exist_ok=True)
+
+    def get_path(self, key: str) -> str:
+        """
+        Gets the path of the file holding the checkpoint for a key.
+        """
+        digest = hashlib.sha256(key.encode('utf-8')).hexdigest()
+        return os.path.join(self.directory, f'{digest}.json')
+
+    def load(self, key: str) -> Optional[dict[str, Any]]:
+        try:
+            with open(self.get_path(key), encoding='utf-8') as file:
+                return json.load(file)
+        except FileNotFoundError:
+            return None
+
+    def save(self, key: str, checkpoint: dict[str, Any]) -> None:
+        write_json_file(self.get_path(key), checkpoint)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self.get_path(key))
+        except FileNotFoundError:
+            pass
+
+
+class SqliteCheckpointStore(CheckpointStore):
+    """
+    Saves checkpoints as rows of a SQLite database.
+    """
+
+    def __init__(self, path: Union[str, os.PathLike], table: str = 'checkpoints') -> None:
+        """
+        Args:
+            path (Union[str, os.PathLike]): The path of the database file.
+            table (str): The name of the table holding the checkpoints.
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name {table!r}.")
+        self.path = os.fspath(path)
+        self.table = table
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    f'CREATE TABLE IF NOT EXISTS {self.table} '
+                    '(key TEXT PRIMARY KEY, checkpoint TEXT NOT NULL)'
+                )
+        finally:
+            connection.close()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=30)
+
+    def load(self, key: str) -> Optional[dict[str, Any]]:
+        connection = self._connect()
+        try:
+            row = connection.execute(f'SELECT checkpoint FROM {self.table} WHERE key = ?',
+                                     (key, )).fetchone()
+        finally:
+            connection.close()
+        return json.loads(row[0]) if row else None
+
+    def save(self, key: str, checkpoint: dict[str, Any]) -> None:
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    f'INSERT OR REPLACE INTO {self.table} (key, checkpoint) VALUES (?, ?)',
+                    (key, json.dumps(checkpoint))
+                )
+        finally:
+            connection.close()
+
+    def delete(self, key: str) -> None:
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(f'DELETE FROM {self.table} WHERE key = ?', (key, ))
+        finally:
+            connection.close()
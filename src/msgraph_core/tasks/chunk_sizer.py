@@ -0,0 +1,96 @@
+"""
+Adaptive chunk sizing for the LargeFileUploadTask.
+
+The Microsoft Graph upload session protocol requires every chunk but the last to be a
+multiple of 320 KiB and caps a single request at 60 MiB. The AdaptiveChunkSizer picks
+the size of the next chunk within those bounds from the throughput observed for the
+previous ones.
+"""
+from typing import Optional
+
+CHUNK_SIZE_MULTIPLE = 320 * 1024
+MAX_CHUNK_SIZE = 60 * 1024 * 1024
+
+
+class AdaptiveChunkSizer:
+    """
+    Grows the chunk size on fast links, where per-request overhead dominates, and
+    shrinks it when requests are slow or fail, so a retry wastes less data.
+
+    The next chunk size targets a request duration of target_seconds at the smoothed
+    throughput measured so far. A single adjustment never changes the size by more
+    than growth_factor.
+
+    Attributes:
+        chunk_size (int): The size to use for the next chunk.
+        throughput (Optional[float]): The smoothed throughput in bytes per second.
+    """
+
+    def __init__(
+        self,
+        initial_size: int = 5 * 1024 * 1024,
+        min_size: int = CHUNK_SIZE_MULTIPLE,
+        max_size: int = MAX_CHUNK_SIZE,
+        target_seconds: float = 5.0,
+        growth_factor: float = 2.0,
+        smoothing: float = 0.5,
+    ) -> None:
+        """
+        Args:
+            initial_size (int): The size of the first chunk.
+            min_size (int): The smallest chunk size to use.
+            max_size (int): The largest chunk size to use. At most 60 MiB.
+            target_seconds (float): The duration each chunk request should take.
+            growth_factor (float): The largest change applied by a single adjustment.
+            smoothing (float): Weight of the latest sample in the throughput average.
+        """
+        if min_size < CHUNK_SIZE_MULTIPLE or min_size % CHUNK_SIZE_MULTIPLE:
+            raise ValueError(f"min_size must be a multiple of {CHUNK_SIZE_MULTIPLE} bytes.")
+        if max_size > MAX_CHUNK_SIZE or max_size < min_size:
+            raise ValueError(f"max_size must be between min_size and {MAX_CHUNK_SIZE} bytes.")
+        if target_seconds <= 0 or growth_factor <= 1 or not 0 < smoothing <= 1:
+            raise ValueError(
+                "target_seconds must be positive, growth_factor greater than 1 and "
+                "smoothing between 0 and 1."
+            )
+        self.min_size = min_size
+        self.max_size = max_size
+        self.target_seconds = target_seconds
+        self.growth_factor = growth_factor
+        self.smoothing = smoothing
+        self.throughput: Optional[float] = None
+        self.chunk_size = self._clamp(initial_size)
+
+    def _clamp(self, size: float) -> int:
+        size = min(max(size, self.min_size), self.max_size)
+        return int(size // CHUNK_SIZE_MULTIPLE) * CHUNK_SIZE_MULTIPLE
+
+    def record_success(self, size: int, elapsed_seconds: float) -> int:
+        """
+        Records a chunk that was acknowledged and computes the next chunk size.
+        Args:
+            size (int): The number of bytes sent.
+            elapsed_seconds (float): How long the request took.
+        Returns:
+            int: The size to use for the next chunk.
+        """
+        sample = size / max(elapsed_seconds, 1e-6)
+        if self.throughput is None:
+            self.throughput = sample
+        else:
+            self.throughput += self.smoothing * (sample - self.throughput)
+        target = self.throughput * self.target_seconds
+        target = min(
+            max(target, self.chunk_size / self.growth_factor), self.chunk_size * self.growth_factor
+        )
+        self.chunk_size = self._clamp(target)
+        return self.chunk_size
+
+    def record_failure(self) -> int:
+        """
+        Records a chunk request that failed and shrinks the next chunk size.
+        Returns:
+            int: The size to use for the next chunk.
+        """
+        self.chunk_size = self._clamp(self.chunk_size / self.growth_factor)
+        return self.chunk_size
@@ -0,0 +1,182 @@
+"""
+Content hashes computed incrementally while a file is uploaded.
+
+The hash names match the properties of the hashes facet of a driveItem, so the values
+reported for an upload can be compared with the ones the service computed without
+reading the file a second time.
+"""
+import base64
+import hashlib
+import threading
+from collections.abc import Iterable
+from typing import Any, Optional, Union
+
+QUICK_XOR_HASH = 'quickXorHash'
+SHA1_HASH = 'sha1Hash'
+SHA256_HASH = 'sha256Hash'
+HASH_ALGORITHMS = (QUICK_XOR_HASH, SHA1_HASH, SHA256_HASH)
+
+
+class QuickXorHash:
+    """
+    The quickXorHash used by OneDrive for Business and SharePoint.
+
+    Every byte is XORed into a 160 bit state, rotated left by 11 bits per position
+    in the file, and the length of the content is XORed into the last 64 bits.
+    Instead of rotating byte by byte, the bytes of a chunk are folded into 160 byte
+    blocks with big integer XORs: bytes whose positions are equal modulo 160 share a
+    rotation, so only the folded block is rotated when the digest is computed.
+    """
+
+    WIDTH_IN_BITS = 160
+    SHIFT = 11
+    BLOCK_SIZE = 160
+    digest_size = 20
+    name = QUICK_XOR_HASH
+
+    def __init__(self) -> None:
+        self._folded = 0
+        self._length = 0
+
+    def update(self, data: Union[bytes, memoryview]) -> None:
+        """
+        Adds the next bytes of the content.
+        """
+        if not data:
+            return
+        offset = self._length % self.BLOCK_SIZE
+        value = int.from_bytes(data, 'little') << (8 * offset)
+        blocks = -(-(offset + len(data)) // self.BLOCK_SIZE)
+        # Fold pairs of halves until a single block is left.
+        while blocks > 1:
+            half = 1 << ((blocks - 1).bit_length() - 1)
+            bits = half * self.BLOCK_SIZE * 8
+            value = (value >> bits) ^ (value & ((1 << bits) - 1))
+            blocks = max(half, blocks - half)
+        self._folded ^= value
+        self._length += len(data)
+
+    def digest(self) -> bytes:
+        """
+        Returns the 20 byte hash of the content added so far.
+        """
+        mask = (1 << self.WIDTH_IN_BITS) - 1
+        state = 0
+        folded = self._folded
+        for position in range(self.BLOCK_SIZE):
+            value = (folded >> (8 * position)) & 0xFF
+            if value:
+                shift = position * self.SHIFT % self.WIDTH_IN_BITS
+                state ^= ((value << shift) | (value >> (self.WIDTH_IN_BITS - shift))) & mask
+        state ^= self._length << (self.WIDTH_IN_BITS - 64)
+        return (state & mask).to_bytes(self.digest_size, 'little')
+
+    def get_value(self) -> str:
+        """
+        Returns the hash encoded the way the hashes facet reports it.
+        """
+        return base64.b64encode(self.digest()).decode('ascii')
+
+
+class ContentHasher:
+    """
+    Computes the configured hashes over chunks that may be handed over out of order.
+
+    Chunks are hashed in the order of their offsets. A chunk that arrives before the
+    ones preceding it is kept until the gap has been filled, which with concurrent
+    uploads amounts to at most the chunks in flight. Hashing stops once more than
+    max_pending_bytes are kept, so a gap that is never filled does not hold the whole
+    content in memory. Updates are serialised by a lock so they can run in an executor.
+    """
+
+    def __init__(
+        self,
+        algorithms: Iterable[str] = HASH_ALGORITHMS,
+        max_pending_bytes: Optional[int] = None
+    ) -> None:
+        """
+        Args:
+            algorithms (Iterable[str]): The hashes to compute, among quickXorHash,
+                sha1Hash and sha256Hash.
+            max_pending_bytes (Optional[int]): The most bytes kept for chunks that
+                arrived ahead of the offset. Unlimited when omitted.
+        """
+        self._hashes: dict[str, Any] = {}
+        for algorithm in algorithms:
+            if algorithm == QUICK_XOR_HASH:
+                self._hashes[algorithm] = QuickXorHash()
+            elif algorithm == SHA1_HASH:
+                self._hashes[algorithm] = hashlib.sha1()
+            elif algorithm == SHA256_HASH:
+                self._hashes[algorithm] = hashlib.sha256()
+            else:
+                raise ValueError(
+                    f"Unsupported hash algorithm {algorithm!r}, use one of {HASH_ALGORITHMS}."
+                )
+        self.max_pending_bytes = max_pending_bytes
+        self.offset = 0
+        self.stopped = False
+        self._pending: dict[int, Union[bytes, memoryview]] = {}
+        self._pending_bytes = 0
+        self._lock = threading.Lock()
+
+    def stop(self) -> None:
+        """
+        Stops hashing and releases the chunks kept. get_hashes then returns None.
+        """
+        with self._lock:
+            self._stop()
+
+    def _stop(self) -> None:
+        self.stopped = True
+        self._pending.clear()
+        self._pending_bytes = 0
+
+    def update(self, start: int, data: Union[bytes, memoryview]) -> None:
+        """
+        Adds a chunk of the content.
+        Args:
+            start (int): The offset of the first byte of the chunk.
+            data (Union[bytes, memoryview]): The chunk.
+        """
+        with self._lock:
+            if self.stopped:
+                return
+            if start > self.offset:
+                self._pending[start] = data
+                self._pending_bytes += len(data)
+                if self.max_pending_bytes is not None and (
+                    self._pending_bytes > self.max_pending_bytes
+                ):
+                    self._stop()
+                return
+            if start + len(data) <= self.offset:
+                return
+            chunk: Optional[Union[bytes, memoryview]] = data[self.offset - start:]
+            while chunk is not None:
+                for value in self._hashes.values():
+                    value.update(chunk)
+                self.offset += len(chunk)
+                chunk = self._pending.pop(self.offset, None)
+                if chunk is not None:
+                    self._pending_bytes -= len(chunk)
+
+    def get_hashes(self, size: int) -> Optional[dict[str, str]]:
+        """
+        Gets the hashes of the content.
+        Args:
+            size (int): The size of the content.
+        Returns:
+            Optional[dict[str, str]]: The hashes by name, or None if some of the content
+                was not hashed, e.g. because an upload was resumed.
+        """
+        with self._lock:
+            self._pending.clear()
+            self._pending_bytes = 0
+            if self.stopped or self.offset != size:
+                return None
+            return {
+                name:
+                value.get_value() if isinstance(value, QuickXorHash) else value.hexdigest().upper()
+                for name, value in self._hashes.items()
+            }
@@ -0,0 +1,218 @@
+"""
+Incremental synchronisation of a collection with delta queries.
+
+A delta query enumerates a collection page by page and ends with an @odata.deltaLink.
+Requesting the delta link later returns only the items added, changed or removed
+since, followed by a new delta link. The DeltaSyncEngine runs these rounds, persisting
+the delta link in a CheckpointStore so the next round, possibly in another process,
+continues from it.
+"""
+from collections.abc import AsyncIterator, Mapping
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Optional, Type
+
+from kiota_abstractions.api_error import APIError
+from kiota_abstractions.headers_collection import HeadersCollection
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_adapter import RequestAdapter
+from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import ParsableFactory
+
+from .checkpoint_store import CheckpointStore, InMemoryCheckpointStore
+from .page_iterator import PageIterator
+
+# The status code returned for a delta link that can no longer be used.
+RESYNC_STATUS_CODE = 410
+
+
+class DeltaChangeType(str, Enum):
+    """Enumerated list of the changes reported by a delta query"""
+    ADDED = 'added'
+    CHANGED = 'changed'
+    REMOVED = 'removed'
+
+    def __str__(self):
+        return self.value
+
+
+@dataclass
+class DeltaChange:
+    """
+    A change to an item of a synchronised collection.
+
+    Attributes:
+        change_type (DeltaChangeType): Whether the item was added, changed or removed.
+        item_id (Optional[str]): The id of the item.
+        item (Any): The item as returned by the delta query. Removed items only carry
+            their id and the @removed annotation.
+    """
+    change_type: DeltaChangeType
+    item_id: Optional[str]
+    item: Any
+
+
+class DeltaSyncEngine:
+    """
+    Runs the rounds of a delta query and persists the delta link between them.
+
+    The first round enumerates the whole collection and reports every item as added.
+    The following rounds request the saved delta link and report the changes since
+    the previous round. A delta link is only saved once the round it ends has been
+    consumed entirely, so a round that is interrupted is repeated from the previous
+    delta link. When the service rejects an expired delta link the engine starts over
+    with a full enumeration.
+
+    Delta queries do not tell new items from changed ones. Unless track_item_ids is
+    set, items are reported as added in the first round and as changed afterwards;
+    with it, the ids of the items are saved with the delta link so items that were not
+    seen before are reported as added.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        request_adapter: RequestAdapter,
+        request_info: RequestInformation,
+        parsable_factory: ParsableFactory,
+        *,
+        token_store: Optional[CheckpointStore] = None,
+        key: Optional[str] = None,
+        track_item_ids: bool = False,
+        error_mapping: Optional[dict[str, Type[ParsableFactory]]] = None,
+    ) -> None:
+        """
+        Args:
+            request_adapter (RequestAdapter): The adapter used to send the requests.
+            request_info (RequestInformation): The initial delta query, e.g. the request
+                information of a users delta request.
+            parsable_factory (ParsableFactory): Factory for the pages of the delta query.
+            token_store (Optional[CheckpointStore]): Where the delta link is saved.
+                Defaults to a store in memory, which only lasts for the process.
+            key (Optional[str]): The key the delta link is saved under. Defaults to the
+                URL of the initial delta query.
+            track_item_ids (bool): Whether the ids of the items are saved so new items
+                can be told from changed ones.
+            error_mapping (Optional[dict[str, Type[ParsableFactory]]]): The error
+                mapping of the requests.
+        """
+        self.request_adapter = request_adapter
+        self.request_info = request_info
+        self.parsable_factory = parsable_factory
+        self.token_store = token_store if token_store is not None else InMemoryCheckpointStore()
+        self.key = key or request_info.url
+        self.track_item_ids = track_item_ids
+        self.error_mapping = error_mapping if error_mapping else {}
+        self.headers: HeadersCollection = HeadersCollection()
+
+    @property
+    def delta_link(self) -> Optional[str]:
+        """
+        The delta link the next round starts from, or None before the first round.
+        """
+        checkpoint = self.token_store.load(self.key)
+        return checkpoint.get('delta_link') if checkpoint else None
+
+    def reset(self) -> None:
+        """
+        Forgets the saved delta link, so the next round enumerates the whole collection.
+        """
+        self.token_store.delete(self.key)
+
+    async def sync(self) -> AsyncIterator[DeltaChange]:
+        """
+        Runs a round of the delta query.
+        Returns:
+            AsyncIterator[DeltaChange]: The changes since the previous round, or every
+                item of the collection in the first round.
+        """
+        checkpoint = self.token_store.load(self.key) or {}
+        delta_link = checkpoint.get('delta_link')
+        response = None
+        if delta_link:
+            try:
+                response = await self._send(self._create_request(delta_link))
+            except APIError as error:
+                if error.response_status_code != RESYNC_STATUS_CODE:
+                    raise
+                # The delta link expired: enumerate the whole collection again.
+                self.reset()
+                checkpoint = {}
+                delta_link = None
+        if not delta_link:
+            response = await self._send(self.request_info)
+        if response is None:
+            return
+        known_ids = set(checkpoint.get('item_ids', [])) if self.track_item_ids else set()
+        full_enumeration = not delta_link
+
+        page_iterator = PageIterator(
+            response, self.request_adapter, error_mapping=self.error_mapping
+        )
+        page_iterator.headers = self.headers
+        async for page in page_iterator.pages():
+            for item in page.value or []:
+                change = self.get_change(item, known_ids, full_enumeration)
+                if self.track_item_ids and change.item_id is not None:
+                    if change.change_type == DeltaChangeType.REMOVED:
+                        known_ids.discard(change.item_id)
+                    else:
+                        known_ids.add(change.item_id)
+                yield change
+        new_delta_link = page_iterator.delta_link
+        if not new_delta_link:
+            raise ValueError('The delta query did not end with a deltaLink.')
+        checkpoint = {'delta_link': new_delta_link}
+        if self.track_item_ids:
+            checkpoint['item_ids'] = sorted(known_ids)
+        self.token_store.save(self.key, checkpoint)
+
+    def get_change(self, item: Any, known_ids: set[str], full_enumeration: bool) -> DeltaChange:
+        """
+        Classifies an item returned by the delta query.
+        Args:
+            item (Any): The item.
+            known_ids (set[str]): The ids of the items seen in earlier rounds, when they
+                are tracked.
+            full_enumeration (bool): Whether the round enumerates the whole collection.
+        Returns:
+            DeltaChange: The change.
+        """
+        item_id = self._get_property(item, 'id')
+        if self._is_removed(item):
+            change_type = DeltaChangeType.REMOVED
+        elif full_enumeration:
+            change_type = DeltaChangeType.ADDED
+        elif self.track_item_ids:
+            change_type = DeltaChangeType.CHANGED if item_id in known_ids else DeltaChangeType.ADDED
+        else:
+            change_type = DeltaChangeType.CHANGED
+        return DeltaChange(change_type, item_id, item)
+
+    @classmethod
+    def _is_removed(cls, item: Any) -> bool:
+        # Directory objects carry an @removed annotation, drive items a deleted facet.
+        return cls._get_property(item, '@removed'
+                                 ) is not None or cls._get_property(item, 'deleted') is not None
+
+    @staticmethod
+    def _get_property(item: Any, name: str) -> Any:
+        if isinstance(item, Mapping):
+            return item.get(name)
+        value = getattr(item, name, None)
+        if value is None:
+            additional_data = getattr(item, 'additional_data', None)
+            if isinstance(additional_data, dict):
+                value = additional_data.get(name)
+        return value
+
+    def _create_request(self, url: str) -> RequestInformation:
+        request_info = RequestInformation()
+        request_info.http_method = Method.GET
+        request_info.url = url
+        request_info.headers = self.headers
+        return request_info
+
+    async def _send(self, request_info: RequestInformation) -> Any:
+        return await self.request_adapter.send_async(
+            request_info, self.parsable_factory, self.error_mapping
+        )
@@ -0,0 +1,332 @@
+"""
+Parallel ranged downloads, the counterpart of the LargeFileUploadTask.
+"""
+import asyncio
+import functools
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable
+from typing import Optional, Union
+
+import httpx
+from kiota_abstractions.api_error import APIError
+from kiota_abstractions.headers_collection import HeadersCollection
+from kiota_abstractions.method import Method
+from kiota_abstractions.native_response_handler import NativeResponseHandler
+from kiota_abstractions.request_adapter import RequestAdapter
+from kiota_abstractions.request_information import RequestInformation
+from kiota_http.middleware.options import ResponseHandlerOption
+
+from ._byte_ranges import ByteRange, format_ranges, merge_ranges, parse_ranges, subtract_range
+from ._worker_pool import run_workers
+from .checkpoint_store import CheckpointWriter, write_json_file
+from .upload_retry import ChunkRetryPolicy, UploadStatistics
+
+
+# pylint: disable=too-many-instance-attributes
+class LargeFileDownloadTask:
+    """
+    Downloads a file with concurrent HTTP Range requests.
+
+    Every range is written straight to its offset in a preallocated destination file,
+    so memory use is bounded by max_chunk_size times max_concurrency whatever the size
+    of the file. The ranges written so far are recorded in a progress file next to the
+    destination, and a download that was interrupted resumes with the missing ranges.
+    Every range request is conditioned on the ETag of the content, so a file that
+    changes while it is downloaded, or between two attempts, is never mixed with its
+    previous version.
+    """
+
+    PROGRESS_SUFFIX = '.progress'
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        request_adapter: RequestAdapter,
+        url: str,
+        destination: Union[str, os.PathLike],
+        file_size: Optional[int] = None,
+        max_chunk_size: int = 5 * 1024 * 1024,
+        *,
+        max_concurrency: int = 4,
+        retry_policy: Optional[ChunkRetryPolicy] = None,
+        etag: Optional[str] = None,
+    ) -> None:
+        """
+        Initializes a task that downloads a file in ranges.
+        Args:
+            request_adapter (RequestAdapter): The adapter used to send the requests. It
+                must honour the ResponseHandlerOption, as the HttpxRequestAdapter does.
+                With an adapter providing stream_response, like the
+                BaseGraphRequestAdapter, a response that is not a 206 is rejected before
+                its body is read.
+            url (str): The URL of the content, such as the content URL of a driveItem or
+                its pre-authenticated download URL.
+            destination (Union[str, os.PathLike]): The path of the file to write.
+            file_size (Optional[int]): The size of the content.
+            max_chunk_size (int): The maximum size of each range in bytes.
+            max_concurrency (int): The number of range requests kept in flight at once.
+            retry_policy (Optional[ChunkRetryPolicy]): How failed ranges are retried.
+            etag (Optional[str]): The ETag of the content. The size and the ETag are
+                requested from the service with a single byte range unless both are
+                given.
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1.')
+        if max_chunk_size < 1:
+            raise ValueError('max_chunk_size must be at least 1.')
+        self.request_adapter = request_adapter
+        self.url = url
+        self.destination = os.fspath(destination)
+        self.file_size = file_size
+        self.max_chunk_size = max_chunk_size
+        self.max_concurrency = max_concurrency
+        self.retry_policy = retry_policy or ChunkRetryPolicy()
+        self.statistics = UploadStatistics()
+        self.etag = etag
+        self.on_chunk_download_complete: Optional[Callable[[list[int]], None]] = None
+        self._completed: list[ByteRange] = []
+        self._progress_writer = CheckpointWriter()
+        self._write_lock = threading.Lock()
+
+    @property
+    def progress_path(self) -> str:
+        """
+        The path of the file recording the ranges downloaded so far.
+        """
+        return self.destination + self.PROGRESS_SUFFIX
+
+    async def download(self, after_chunk_download: Optional[Callable] = None) -> str:
+        """
+        Downloads the file, resuming a previous download of the same content.
+        Args:
+            after_chunk_download (Optional[Callable]): Called with the [start, end]
+                range of every chunk written.
+        Returns:
+            str: The path of the downloaded file.
+        """
+        self.on_chunk_download_complete = after_chunk_download or self.on_chunk_download_complete
+        if self.file_size is None or self.etag is None:
+            file_size, self.etag = await self._get_content_size()
+            if self.file_size is not None and self.file_size != file_size:
+                raise RuntimeError(
+                    f'The content holds {file_size} bytes but {self.file_size} were expected.'
+                )
+            self.file_size = file_size
+        self._completed = self._load_progress()
+        pending = [(0, self.file_size - 1)] if self.file_size else []
+        for start, end in self._completed:
+            pending = subtract_range(pending, start, end)
+
+        loop = asyncio.get_running_loop()
+        descriptor = await loop.run_in_executor(None, self._open_destination)
+        try:
+            await self._download_ranges(descriptor, pending)
+        finally:
+            os.close(descriptor)
+            await self._progress_writer.flush()
+        # The destination is preallocated, so its size says nothing about the bytes written.
+        expected = [(0, self.file_size - 1)] if self.file_size else []
+        if self._completed != expected:
+            raise RuntimeError(
+                f"Only bytes {', '.join(format_ranges(self._completed)) or 'none'} of "
+                f'{self.file_size} were downloaded.'
+            )
+        try:
+            os.remove(self.progress_path)
+        except FileNotFoundError:
+            pass
+        return self.destination
+
+    async def _download_ranges(self, descriptor: int, pending: list[ByteRange]) -> None:
+        chunks = [
+            (start, min(end, start + self.max_chunk_size - 1)) for range_start, end in pending
+            for start in range(range_start, end + 1, self.max_chunk_size)
+        ]
+
+        async def run_download(chunk: ByteRange) -> None:
+            start, end = chunk
+            data = await self._get_range(start, end)
+            await asyncio.get_running_loop().run_in_executor(
+                None, self._write, descriptor, start, data
+            )
+            self._acknowledge_range(start, end)
+
+        await run_workers(chunks, run_download, self.max_concurrency)
+
+    def _acknowledge_range(self, start: int, end: int) -> None:
+        self._completed = merge_ranges(self._completed + [(start, end)])
+        self._progress_writer.submit(
+            functools.partial(
+                write_json_file, self.progress_path, {
+                    'url': self.url,
+                    'file_size': self.file_size,
+                    'etag': self.etag,
+                    'completed_ranges': format_ranges(self._completed),
+                }
+            )
+        )
+        if self.on_chunk_download_complete is not None:
+            self.on_chunk_download_complete([start, end])
+
+    def _load_progress(self) -> list[ByteRange]:
+        """
+        Reads the ranges written by a previous attempt. They are only trusted if the
+        destination exists and the content has the same size and ETag.
+        """
+        try:
+            with open(self.progress_path, encoding='utf-8') as file:
+                progress = json.load(file)
+        except (FileNotFoundError, ValueError):
+            return []
+        if not os.path.exists(self.destination) or progress.get('file_size') != self.file_size:
+            return []
+        if progress.get('etag') != self.etag:
+            return []
+        return parse_ranges(progress.get('completed_ranges', []), self.file_size or 0)
+
+    def _open_destination(self) -> int:
+        descriptor = os.open(self.destination, os.O_RDWR | os.O_CREAT | getattr(os, 'O_BINARY', 0))
+        try:
+            if not self._completed:
+                os.ftruncate(descriptor, 0)
+            if os.fstat(descriptor).st_size != self.file_size:
+                os.ftruncate(descriptor, self.file_size or 0)
+            if self.file_size and hasattr(os, 'posix_fallocate'):
+                try:
+                    os.posix_fallocate(descriptor, 0, self.file_size)
+                except OSError:
+                    # Not supported by every filesystem, the file stays sparse.
+                    pass
+        except BaseException:
+            os.close(descriptor)
+            raise
+        return descriptor
+
+    def _write(self, descriptor: int, offset: int, data: bytes) -> None:
+        view = memoryview(data)
+        if hasattr(os, 'pwrite'):
+            while view:
+                written = os.pwrite(descriptor, view, offset)
+                view, offset = view[written:], offset + written
+            return
+        with self._write_lock:
+            os.lseek(descriptor, offset, os.SEEK_SET)
+            while view:
+                view = view[os.write(descriptor, view):]
+
+    async def _get_range(self, start: int, end: int) -> bytes:
+        attempt = 0
+        while True:
+            try:
+                content = await self._read_range(start, end)
+                if len(content) != end - start + 1:
+                    raise RuntimeError(
+                        f'Requested bytes {start}-{end} but the service sent {len(content)} '
+                        'bytes.'
+                    )
+            except Exception as error:  #pylint: disable=broad-except
+                self.statistics.failed_requests += 1
+                attempt += 1
+                if not self.retry_policy.should_retry(error, attempt):
+                    if attempt > 1:
+                        self.statistics.retries_exhausted += 1
+                    raise
+                delay = self.retry_policy.get_delay(error, attempt)
+                logging.warning(
+                    "Downloading bytes %s-%s failed (%s), retrying in %.1f seconds.", start, end,
+                    error, delay
+                )
+                await asyncio.sleep(delay)
+                self.statistics.retries += 1
+                continue
+            self.statistics.chunks_sent += 1
+            self.statistics.bytes_sent += len(content)
+            return content
+
+    async def _read_range(self, start: int, end: int) -> bytes:
+        """
+        Reads a range, streaming the body when the request adapter supports it so that a
+        response ignoring the range is rejected before the whole content is read.
+        """
+        stream_response = getattr(self.request_adapter, 'stream_response', None)
+        if stream_response is None:
+            # The adapter has read the body before handing over the response.
+            response = await self._send_range_request(start, end)
+            self._check_partial_content(response, start, end)
+            return response.content
+        chunks: list[bytes] = []
+        size = 0
+        try:
+            async with stream_response(self._create_range_request(start, end), {}) as response:
+                self._check_partial_content(response, start, end)
+                async for data in response.aiter_bytes():
+                    chunks.append(data)
+                    size += len(data)
+                    if size > end - start + 1:
+                        break
+        except APIError as error:
+            if error.response_status_code == 412:
+                raise self._get_content_changed_error(error.response_headers or {}) from error
+            raise
+        return b''.join(chunks)
+
+    @staticmethod
+    def _check_partial_content(response: httpx.Response, start: int, end: int) -> None:
+        if response.status_code != 206:
+            raise RuntimeError(
+                f'Requested bytes {start}-{end} but the service answered '
+                f'{response.status_code}, it must support range requests for the content '
+                'to be downloaded in ranges.'
+            )
+
+    async def _get_content_size(self) -> tuple[int, Optional[str]]:
+        """
+        Requests the first byte of the content to learn its size from Content-Range.
+        """
+        response = await self._send_range_request(0, 0)
+        content_range = response.headers.get('Content-Range', '')
+        if response.status_code in (206, 416) and '/' in content_range:
+            total = content_range.rsplit('/', 1)[1]
+            if total.isdigit():
+                return int(total), response.headers.get('ETag')
+        raise RuntimeError(
+            f'The service answered {response.status_code} to a range request, '
+            'it must support range requests for the content to be downloaded in ranges.'
+        )
+
+    def _create_range_request(self, start: int, end: int) -> RequestInformation:
+        info = RequestInformation()
+        info.url = self.url
+        info.http_method = Method.GET
+        info.headers = HeadersCollection()
+        info.headers.try_add('Range', f'bytes={start}-{end}')
+        if self.etag:
+            info.headers.try_add('If-Match', self.etag)
+        return info
+
+    def _get_content_changed_error(self, response_headers: dict[str, str]) -> APIError:
+        return APIError(
+            f'The content changed from ETag {self.etag} while it was downloaded, '
+            'download it again.',
+            response_status_code=412,
+            response_headers=response_headers
+        )
+
+    async def _send_range_request(self, start: int, end: int) -> httpx.Response:
+        info = self._create_range_request(start, end)
+        info.add_request_options([ResponseHandlerOption(NativeResponseHandler())])
+        # The native response exposes the status code and Content-Range header.
+        response: httpx.Response = await self.request_adapter.send_primitive_async(
+            info, "bytes", {}
+        )  # type: ignore[assignment]
+        if response.status_code == 412:
+            raise self._get_content_changed_error(dict(response.headers))
+        if response.status_code >= 400 and response.status_code != 416:
+            raise APIError(
+                f'Range request for bytes {start}-{end} failed.',
+                response_status_code=response.status_code,
+                response_headers=dict(response.headers)
+            )
+        return response
@@ -1,7 +1,10 @@
+import asyncio
+import contextlib
+import functools
 import logging
-import os
+import time
 from asyncio import Future
-from collections.abc import Callable
+from collections.abc import AsyncIterator, Awaitable, Callable, Iterable
 from datetime import datetime, timedelta, timezone
 from io import BytesIO
 from typing import Any, Optional, Tuple, TypeVar, Union
@@ -14,34 +17,158 @@ from kiota_abstractions.serialization import AdditionalDataHolder, Parsable, Par
 
 from msgraph_core.models import LargeFileUploadSession, UploadResult  # check imports
 
+from ._byte_ranges import (
+    ByteRange,
+    format_ranges,
+    intersect_ranges,
+    parse_ranges,
+    ranges_length,
+    subtract_range,
+)
+from .bandwidth_limiter import BandwidthLimiter
+from .checkpoint_store import CheckpointStore, CheckpointWriter
+from .chunk_sizer import AdaptiveChunkSizer
+from .content_hash import ContentHasher
+from .upload_checkpoint import UploadCheckpoint
+from .upload_progress import UploadEventStream, UploadEventType, UploadObserver, UploadProgressEvent
+from .upload_retry import THROTTLED_STATUS_CODES, ChunkRetryPolicy, UploadStatistics
+from .upload_source import ReadAheadBuffer, StreamUploadSource, UploadSource
+
 T = TypeVar('T', bound=Parsable)
 
 
+class _MemoryViewContent:
+    """
+    Request content that hands a memoryview to httpx as a single stream part.
+    httpx only accepts bytes or (async) iterables of bytes, so the view is wrapped
+    to avoid materialising a copy of the chunk.
+    """
+
+    def __init__(self, view: memoryview) -> None:
+        self._view = view
+
+    def __len__(self) -> int:
+        return self._view.nbytes
+
+    async def __aiter__(self) -> AsyncIterator[memoryview]:
+        yield self._view
+
+
 # pylint: disable=too-many-instance-attributes
 class LargeFileUploadTask:
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments,too-many-locals
         self,
         upload_session: Parsable,
         request_adapter: RequestAdapter,
-        stream: BytesIO,
+        stream: Union[BytesIO, UploadSource],
         parsable_factory: Optional[ParsableFactory] = None,
-        max_chunk_size: int = 5 * 1024 * 1024
+        max_chunk_size: int = 5 * 1024 * 1024,
+        *,
+        max_concurrency: int = 1,
+        chunk_sizer: Optional[AdaptiveChunkSizer] = None,
+        read_ahead: int = 0,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        checkpoint_key: Optional[str] = None,
+        retry_policy: Optional[ChunkRetryPolicy] = None,
+        chunk_limiter: Optional[asyncio.Semaphore] = None,
+        bandwidth_limiter: Optional[BandwidthLimiter] = None,
+        hash_algorithms: Optional[Iterable[str]] = None,
+        session_refresher: Optional[Callable[['LargeFileUploadTask'], Awaitable[Parsable]]] = None,
+        renewal_margin: float = 300.0,
     ):
+        """
+        Initializes a task that uploads a stream to an upload session in chunks.
+        Args:
+            upload_session (Parsable): The upload session created for the file.
+            request_adapter (RequestAdapter): The adapter used to send the chunks.
+            stream (Union[BytesIO, UploadSource]): The content to upload. Seekable streams
+                are wrapped in a StreamUploadSource; pass an AsyncIteratorUploadSource to
+                upload content that can only be read once.
+            parsable_factory (Optional[ParsableFactory]): Factory for the item returned
+                once the upload completes.
+            max_chunk_size (int): The maximum size of each chunk in bytes.
+            max_concurrency (int): The number of chunks kept in flight at once.
+                Defaults to 1, which uploads the chunks one after the other.
+                Sources that are not seekable only support sequential uploads.
+            chunk_sizer (Optional[AdaptiveChunkSizer]): Enables adaptive chunk sizing. The
+                sizer picks the size of each chunk from the observed throughput and
+                replaces max_chunk_size.
+            read_ahead (int): The number of chunks read ahead of the ones in flight, so
+                reading the next chunk overlaps with sending the current one. Reads from
+                files run in a thread pool executor. Defaults to 0.
+            checkpoint_store (Optional[CheckpointStore]): Where to persist the session URL,
+                expiry, file identity and acknowledged ranges after every chunk, so the
+                upload can be resumed by another process with from_checkpoint(). It is
+                written in the default executor, and chunks acknowledged while a write
+                runs are recorded by the next one.
+            checkpoint_key (Optional[str]): The key of the checkpoint. Defaults to the
+                upload URL.
+            retry_policy (Optional[ChunkRetryPolicy]): How failed chunks are retried.
+                Defaults to three retries with exponential backoff. Counters are kept
+                in the statistics attribute.
+            chunk_limiter (Optional[asyncio.Semaphore]): Limits the chunks read and in
+                flight, shared with other tasks to enforce a global limit. A chunk holds
+                its slot from the time it is read until it is acknowledged, retries
+                included. Chunks read ahead are not counted.
+            bandwidth_limiter (Optional[BandwidthLimiter]): Paces the chunk requests to
+                a number of bytes per second, shared with other tasks.
+            hash_algorithms (Optional[Iterable[str]]): The hashes to compute while the
+                chunks are sent, among quickXorHash, sha1Hash and sha256Hash. They are
+                reported on the UploadResult when the whole content was sent by this task,
+                and not computed when the upload does not start at the first byte.
+            session_refresher (Optional[Callable[[LargeFileUploadTask], Awaitable[Parsable]]]):
+                A coroutine function returning a fresh upload session. It is awaited between
+                chunks once the session expires within renewal_margin, and the upload
+                continues with the byte ranges the new session expects. A session with a new
+                upload URL has received none of the bytes, so the upload starts again from
+                the first byte, which requires a seekable source once any byte was sent.
+            renewal_margin (float): How many seconds before the expiry of the session it
+                is renewed.
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1.')
+        if read_ahead < 0:
+            raise ValueError('read_ahead cannot be negative.')
+        self.source = stream if isinstance(stream, UploadSource) else StreamUploadSource(stream)
+        if max_concurrency > 1 and not self.source.seekable:
+            raise ValueError('Concurrent uploads require a seekable source.')
         self._upload_session = upload_session
         self._request_adapter = request_adapter
         self.stream = stream
-        try:
-            self.file_size = stream.getbuffer().nbytes
-        except AttributeError:
-            self.file_size = os.stat(stream.name).st_size
-        self.max_chunk_size = max_chunk_size
+        self.file_size = self.source.size
+        self.chunk_sizer = chunk_sizer
+        self.max_chunk_size = chunk_sizer.chunk_size if chunk_sizer else max_chunk_size
+        self.max_concurrency = max_concurrency
+        self.read_ahead = read_ahead
+        self.checkpoint_store = checkpoint_store
+        self.checkpoint_key = checkpoint_key
+        self._checkpoint_writer = CheckpointWriter()
+        self.retry_policy = retry_policy or ChunkRetryPolicy()
+        self.statistics = UploadStatistics()
+        self.chunk_limiter = chunk_limiter
+        self.bandwidth_limiter = bandwidth_limiter
+        self.hasher: Optional[ContentHasher] = None
+        if hash_algorithms:
+            # Chunks sent ahead of a gap are kept until it is filled, at most those in flight.
+            largest_chunk = chunk_sizer.max_size if chunk_sizer else max_chunk_size
+            self.hasher = ContentHasher(
+                hash_algorithms, max_pending_bytes=max_concurrency * largest_chunk
+            )
+        self.session_refresher = session_refresher
+        self.renewal_margin = renewal_margin
+        self.observers: list[UploadObserver] = []
+        self._started = time.monotonic()
+        self._bytes_acknowledged_before = 0
+        # The bytes the current upload session no longer expects.
+        self.bytes_acknowledged = 0
+        self._in_flight = 0
         self.factory = parsable_factory
         cleaned_value = self.check_value_exists(
             upload_session, 'get_next_expected_range', ['next_expected_range', 'NextExpectedRange']
         )
         self.next_range = cleaned_value[1] if cleaned_value[0] else None
-        self._chunks = int((self.file_size / max_chunk_size) + 0.5)
+        self._chunks = int((self.file_size / self.max_chunk_size) + 0.5)
         self.on_chunk_upload_complete: Optional[Callable[[list[int]], None]] = None
 
     @property
@@ -85,60 +212,495 @@ class LargeFileUploadTask:
             return True
         return False
 
+    def _is_expired(self) -> bool:
+        # A session resumed from a checkpoint saved without an expiry cannot be checked.
+        if getattr(self.upload_session, 'expiration_date_time', None) is None:
+            return False
+        return self.upload_session_expired(self.upload_session)
+
     async def upload(self, after_chunk_upload: Optional[Callable] = None):
-        # Rewind at this point to take care of failures.
-        self.stream.seek(0)
-        if self.upload_session_expired(self.upload_session):
+        if self.session_refresher is None and self._is_expired():
             raise RuntimeError('The upload session is expired.')
 
         self.on_chunk_upload_complete = after_chunk_upload or self.on_chunk_upload_complete
-        session: LargeFileUploadSession = await self.next_chunk(
-            self.stream, 0, max(0, min(self.max_chunk_size - 1, self.file_size - 1))
-        )
-        process_next = session
-        # determine the range  to be uploaded
+        # determine the ranges to be uploaded
         # even when resuming existing upload sessions.
-        range_parts = self.next_range[0].split("-") if self.next_range else ['0', '0']
-        end = min(int(range_parts[0]) + self.max_chunk_size - 1, self.file_size)
-        uploaded_range = [range_parts[0], end]
-        response = None
-
-        while self.chunks >= 0:
-            session = process_next
-            if self.chunks == 0:
-                # last chunk
-                response = await self.last_chunk(self.stream)
-
-            try:
-                lfu_session = session
-                if lfu_session is None:
-                    continue
-                next_range = None
-                if hasattr(lfu_session, 'next_expected_ranges'):
-                    next_range = lfu_session.next_expected_ranges
-                old_url = self.get_validated_upload_url(self.upload_session)
-                if hasattr(lfu_session, 'upload_url'):
-                    lfu_session.upload_url = old_url
-                if self.on_chunk_upload_complete is not None:
-                    self.on_chunk_upload_complete(uploaded_range)
-                if not next_range:
-                    continue
-                range_parts = str(next_range[0]).split("-")
-                end = min(int(range_parts[0]) + self.max_chunk_size, self.file_size)
-                uploaded_range = [range_parts[0], end]
-                self.next_range = next_range[0] + "-"
-                process_next = await self.next_chunk(self.stream)
-
-            except Exception as error:  #pylint: disable=broad-except
-                logging.error("Error uploading chunk  %s", error)
-            finally:
-                self.chunks -= 1
+        pending = self._get_pending_ranges()
+        if self.hasher is not None and pending and pending[0][0] > self.hasher.offset:
+            # The bytes before the first pending range are not sent, e.g. on a resumed
+            # upload, so the content cannot be hashed.
+            self.hasher.stop()
+        self._save_checkpoint(pending)
+        self._started = time.monotonic()
+        self._bytes_acknowledged_before = self.file_size - ranges_length(pending)
+        self.bytes_acknowledged = self._bytes_acknowledged_before
+        try:
+            response = await self._upload_pending_ranges(pending)
+        except BaseException as error:
+            self._notify_observers(UploadEventType.FAILED, error=error)
+            raise
+        finally:
+            self.source.close()
+            # Leave the latest checkpoint in the store whether the upload completed or not.
+            await self._checkpoint_writer.flush()
         upload_result: UploadResult[Any] = UploadResult()
         upload_result.item_response = response
+        if self.hasher is not None:
+            upload_result.hashes = self.hasher.get_hashes(self.file_size)
         if hasattr(self.upload_session, 'upload_url'):
             upload_result.location = self.upload_session.upload_url
+        self._notify_observers(UploadEventType.COMPLETED)
         return upload_result
 
+    def _get_pending_ranges(self) -> list[ByteRange]:
+        next_ranges = getattr(self.upload_session, 'next_expected_ranges', None)
+        if not isinstance(next_ranges, list) or not next_ranges:
+            next_ranges = [self.next_range] if self.next_range else ['0-']
+        return parse_ranges(next_ranges, self.file_size)
+
+    async def _upload_pending_ranges(
+        self, missing: list[ByteRange]
+    ) -> Optional[Union[T, bytes, Parsable]]:
+        """
+        Uploads the pending byte ranges keeping up to max_concurrency chunks in flight.
+        The chunk holding the end of the file is only sent once every other range
+        has been acknowledged by the service, since that request completes the upload.
+        Args:
+            missing (list[ByteRange]): The byte ranges the service still expects.
+        Returns:
+            Optional[Union[T, bytes, Parsable]]: The response to the final chunk.
+        """
+        in_flight: dict[asyncio.Future, ByteRange] = {}
+        read_ahead = ReadAheadBuffer(self.source, self.read_ahead)
+        try:
+            while True:
+                renewing = self.session_refresher is not None and self._session_expires_soon()
+                if renewing and not in_flight:
+                    # Chunks in flight are acknowledged on the old session first.
+                    missing = await self._renew_session(missing)
+                    renewing = False
+                final_range = self._get_final_range(missing)
+                if final_range is None:
+                    return None
+                available = subtract_range(missing, *final_range)
+                for in_flight_range in in_flight.values():
+                    available = subtract_range(available, *in_flight_range)
+                for start, end in self._plan_ranges(
+                    available, 0 if renewing else self.max_concurrency - len(in_flight)
+                ):
+                    request = self._send_range(start, end, chunk_data=read_ahead.pop(start, end))
+                    in_flight[asyncio.ensure_future(request)] = (start, end)
+                    available = subtract_range(available, start, end)
+                upcoming = self._plan_ranges(available, self.read_ahead)
+                if len(upcoming) < self.read_ahead and final_range not in upcoming:
+                    upcoming.append(final_range)
+                read_ahead.schedule(upcoming)
+
+                if not in_flight:
+                    response = await self._send_range(
+                        *final_range, is_last=True, chunk_data=read_ahead.pop(*final_range)
+                    )
+                    self._acknowledge_range(missing, *final_range, response)
+                    return response
+
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    start, end = in_flight.pop(future)
+                    missing = self._acknowledge_range(missing, start, end, future.result())
+        finally:
+            read_ahead.clear()
+            for future in in_flight:
+                future.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+
+    def _plan_ranges(self, available: list[ByteRange], count: int) -> list[ByteRange]:
+        planned: list[ByteRange] = []
+        for start, end in available:
+            while start <= end and len(planned) < count:
+                chunk_end = min(end, start + self.max_chunk_size - 1)
+                planned.append((start, chunk_end))
+                start = chunk_end + 1
+        return planned
+
+    def _get_final_range(self, missing: list[ByteRange]) -> Optional[ByteRange]:
+        if not missing:
+            return None
+        start, end = missing[-1]
+        start += ((end - start) // self.max_chunk_size) * self.max_chunk_size
+        return start, end
+
+    def _session_expires_soon(self, upload_session: Optional[Any] = None) -> bool:
+        expiry = self._get_expiry(upload_session or self.upload_session)
+        return expiry is not None and (expiry - datetime.now(timezone.utc)
+                                       ).total_seconds() <= self.renewal_margin
+
+    @staticmethod
+    def _get_expiry(upload_session: Any) -> Optional[datetime]:
+        expiry = getattr(upload_session, 'expiration_date_time', None)
+        if isinstance(expiry, str):
+            try:
+                expiry = datetime.fromisoformat(expiry.replace('Z', '+00:00'))
+            except ValueError:
+                return None
+        if not isinstance(expiry, datetime):
+            return None
+        return expiry if expiry.tzinfo else expiry.replace(tzinfo=timezone.utc)
+
+    async def _renew_session(self, missing: list[ByteRange]) -> list[ByteRange]:
+        """
+        Replaces the upload session with the one returned by the session refresher.
+
+        A refresher returning the same upload URL continues from the acknowledged
+        offset. A new upload URL is a new session, which expects the whole content
+        again: the upload restarts from the first byte. A source that is not seekable
+        has released the bytes already sent, so it cannot restart.
+        Args:
+            missing (list[ByteRange]): The ranges the current session still expects.
+        Returns:
+            list[ByteRange]: The ranges the new session expects.
+        """
+        if self.session_refresher is None:
+            raise RuntimeError('The upload session cannot be renewed without a session refresher.')
+        previous_url = self.get_validated_upload_url(self.upload_session)
+        session = await self.session_refresher(self)
+        upload_url = self.get_validated_upload_url(session)
+        if self._session_expires_soon(session):
+            raise RuntimeError('The session refresher returned an expiring upload session.')
+        next_ranges = getattr(session, 'next_expected_ranges', None)
+        expected = parse_ranges(next_ranges or ['0-'], self.file_size)
+        if upload_url == previous_url:
+            # The same session, the service may only have caught up with our view.
+            expected = intersect_ranges(missing, expected)
+        elif not self.source.seekable and expected and expected[0][0] < missing[0][0]:
+            raise RuntimeError(
+                f'The renewed upload session expects bytes from offset {expected[0][0]}, '
+                f'but the source is not seekable and has released the bytes before '
+                f'offset {missing[0][0]}. Renew the session with the same upload URL or '
+                'upload from a seekable source.'
+            )
+        elif self.checkpoint_store is not None and self.checkpoint_key is None:
+            self._checkpoint_writer.submit(
+                functools.partial(self.checkpoint_store.delete, previous_url)
+            )
+        logging.info("Renewed the upload session, %s bytes left.", ranges_length(expected))
+        self.upload_session = session
+        self.bytes_acknowledged = self.file_size - ranges_length(expected)
+        if hasattr(session, 'next_expected_ranges'):
+            session.next_expected_ranges = format_ranges(expected)
+        self._save_checkpoint(expected)
+        return expected
+
+    def _acknowledge_range(self, missing: list[ByteRange], start: int, end: int,
+                           session: Any) -> list[ByteRange]:
+        missing = subtract_range(missing, start, end)
+        expiry = getattr(session, 'expiration_date_time', None)
+        if expiry is not None and hasattr(self.upload_session, 'expiration_date_time'):
+            # Every acknowledged chunk extends the session.
+            self.upload_session.expiration_date_time = expiry
+        next_ranges = getattr(session, 'next_expected_ranges', None)
+        if isinstance(next_ranges, list):
+            # Ranges only ever shrink on the service, so intersecting every
+            # snapshot keeps the view consistent regardless of response order.
+            missing = intersect_ranges(missing, parse_ranges(next_ranges, self.file_size))
+        if missing:
+            self.next_range = format_ranges(missing[:1])[0]
+        self.source.release(missing[0][0] if missing else self.file_size)
+        if hasattr(self.upload_session, 'next_expected_ranges'):
+            self.upload_session.next_expected_ranges = format_ranges(missing)
+        self.bytes_acknowledged = self.file_size - ranges_length(missing)
+        self._save_checkpoint(missing)
+        self._notify_chunk_complete(start, end)
+        return missing
+
+    def get_checkpoint(self, missing: Optional[list[ByteRange]] = None) -> UploadCheckpoint:
+        """
+        Captures the state needed to resume the upload from another process.
+        Args:
+            missing (Optional[list[ByteRange]]): The ranges still expected. Defaults to
+                the ranges recorded on the upload session.
+        Returns:
+            UploadCheckpoint: The checkpoint.
+        """
+        if missing is None:
+            missing = self._get_pending_ranges()
+        acknowledged: list[ByteRange] = [(0, self.file_size - 1)] if self.file_size else []
+        for start, end in missing:
+            acknowledged = subtract_range(acknowledged, start, end)
+        # Saved with its offset, so it can be parsed back on every supported version.
+        expiry = self._get_expiry(self.upload_session)
+        return UploadCheckpoint(
+            upload_url=self.get_validated_upload_url(self.upload_session),
+            file_size=self.file_size,
+            expiration_date_time=expiry.isoformat() if expiry else None,
+            acknowledged_ranges=format_ranges(acknowledged),
+            file_identity=UploadCheckpoint.get_file_identity(self.source),
+        )
+
+    def _save_checkpoint(self, missing: list[ByteRange]) -> None:
+        if self.checkpoint_store is None:
+            return
+        key = self.checkpoint_key or self.get_validated_upload_url(self.upload_session)
+        if missing:
+            write = functools.partial(
+                self.checkpoint_store.save, key,
+                self.get_checkpoint(missing).to_dict()
+            )
+        else:
+            write = functools.partial(self.checkpoint_store.delete, key)
+        self._checkpoint_writer.submit(write)
+
+    @classmethod
+    def from_checkpoint(
+        cls,
+        checkpoint_store: CheckpointStore,
+        checkpoint_key: str,
+        request_adapter: RequestAdapter,
+        stream: Union[BytesIO, UploadSource],
+        parsable_factory: Optional[ParsableFactory] = None,
+        **kwargs: Any
+    ) -> Optional['LargeFileUploadTask']:
+        """
+        Rebuilds a task from a saved checkpoint. Call resume() on the task to continue
+        the upload from the first byte the service has not acknowledged.
+        Args:
+            checkpoint_store (CheckpointStore): The store the checkpoint was saved to.
+            checkpoint_key (str): The key the checkpoint was saved under.
+            request_adapter (RequestAdapter): The adapter used to send the chunks.
+            stream (Union[BytesIO, UploadSource]): The same content that was being uploaded.
+            parsable_factory (Optional[ParsableFactory]): Factory for the uploaded item.
+            kwargs: Any other keyword arguments accepted by the constructor.
+        Returns:
+            Optional[LargeFileUploadTask]: The task, or None if there is no checkpoint.
+        """
+        value = checkpoint_store.load(checkpoint_key)
+        if value is None:
+            return None
+        checkpoint = UploadCheckpoint.from_dict(value)
+        source = stream if isinstance(stream, UploadSource) else StreamUploadSource(stream)
+        identity = UploadCheckpoint.get_file_identity(source)
+        if identity != checkpoint.file_identity:
+            raise ValueError(
+                f'The checkpoint was saved for {checkpoint.file_identity}, '
+                f'which does not match the content to upload {identity}.'
+            )
+        upload_session = LargeFileUploadSession(
+            upload_url=checkpoint.upload_url,
+            expiration_date_time=cls._get_expiry(checkpoint),
+            next_expected_ranges=checkpoint.get_next_expected_ranges(),
+        )
+        return cls(
+            upload_session,
+            request_adapter,
+            source,
+            parsable_factory,
+            checkpoint_store=checkpoint_store,
+            checkpoint_key=checkpoint_key,
+            **kwargs
+        )
+
+    def _notify_chunk_complete(self, start: int, end: int) -> None:
+        if self.on_chunk_upload_complete is not None:
+            self.on_chunk_upload_complete([start, end])
+
+    async def _send_range(
+        self,
+        start: int,
+        end: int,
+        is_last: bool = False,
+        chunk_data: Optional[Awaitable[Union[bytes, memoryview]]] = None
+    ) -> Optional[Union[T, bytes, Parsable]]:
+        """
+        Sends a chunk, retrying it according to the retry policy. Before a retry the
+        session is queried so only the bytes the service is still missing are resent.
+        """
+        self._in_flight += 1
+        try:
+            # The chunk is only read once the limiter lets it through, so a shared limiter
+            # bounds the chunks held in memory as well as the requests in flight.
+            async with self.chunk_limiter or contextlib.nullcontext():
+                data = await (chunk_data or self._read_chunk(self.stream, start, end - start + 1))
+                if self.hasher is None or self.hasher.stopped:
+                    return await self._send_data(start, end, is_last, data)
+                # Hash the chunk in the executor while it is being sent.
+                hashing = asyncio.get_running_loop().run_in_executor(
+                    None, self.hasher.update, start, data
+                )
+                try:
+                    return await self._send_data(start, end, is_last, data)
+                finally:
+                    await hashing
+        finally:
+            self._in_flight -= 1
+
+    async def _send_data(self, start: int, end: int, is_last: bool,
+                         data: Union[bytes, memoryview]) -> Optional[Union[T, bytes, Parsable]]:
+        ranges = [(start, end)]
+        attempt = 0
+        while True:
+            try:
+                response = None
+                for range_start, range_end in ranges:
+                    response = await self._put_chunk(
+                        range_start, range_end, data[range_start - start:range_end - start + 1],
+                        is_last and range_end == end
+                    )
+                return response
+            except Exception as error:  #pylint: disable=broad-except
+                attempt += 1
+                if not self.retry_policy.should_retry(error, attempt):
+                    if attempt > 1:
+                        self.statistics.retries_exhausted += 1
+                    raise
+                delay = self.retry_policy.get_delay(error, attempt)
+                logging.warning(
+                    "Uploading bytes %s-%s failed (%s), retrying in %.1f seconds.", start, end,
+                    error, delay
+                )
+                self._notify_observers(
+                    UploadEventType.CHUNK_RETRIED,
+                    chunk_range=(start, end),
+                    retry_delay=delay,
+                    error=error
+                )
+                await asyncio.sleep(delay)
+                self.statistics.retries += 1
+                session = await self._get_session_status()
+                next_ranges = getattr(session, 'next_expected_ranges', None)
+                if isinstance(next_ranges, list):
+                    ranges = intersect_ranges(
+                        [(start, end)], parse_ranges(next_ranges, self.file_size)
+                    )
+                    if not ranges:
+                        # The bytes arrived even though the response was lost.
+                        return None if is_last else session
+
+    async def _put_chunk(self, start: int, end: int, data: Union[bytes, memoryview],
+                         is_last: bool) -> Optional[Union[T, bytes, Parsable]]:
+        if self.bandwidth_limiter:
+            await self.bandwidth_limiter.acquire(len(data))
+        return await self._send_chunk(start, end, data, is_last)
+
+    async def _send_chunk(
+        self, start: int, end: int, data: Union[bytes, memoryview], is_last: bool
+    ) -> Optional[Union[T, bytes, Parsable]]:
+        info = self._build_chunk_request(start, end, data)
+        error_map: dict[str, int] = {}
+        started = time.monotonic()
+        try:
+            if not is_last:
+                response = await self.request_adapter.send_async(
+                    info, LargeFileUploadSession, error_map
+                )
+            elif self.factory:
+                response = await self.request_adapter.send_async(info, self.factory, error_map)
+            else:
+                response = await self.request_adapter.send_primitive_async(info, "bytes", error_map)
+        except Exception as error:
+            self.statistics.failed_requests += 1
+            if self.retry_policy.get_status_code(error) in THROTTLED_STATUS_CODES:
+                self.statistics.throttled += 1
+            if self.chunk_sizer:
+                self.max_chunk_size = self.chunk_sizer.record_failure()
+            raise
+        latency = time.monotonic() - started
+        self.statistics.chunks_sent += 1
+        self.statistics.bytes_sent += len(data)
+        if self.chunk_sizer:
+            self.max_chunk_size = self.chunk_sizer.record_success(len(data), latency)
+        self._notify_observers(
+            UploadEventType.CHUNK_ACKNOWLEDGED,
+            chunk_range=(start, end),
+            chunk_latency=latency,
+            chunk_throughput=len(data) / max(latency, 1e-6)
+        )
+        return response
+
+    def add_observer(self, observer: UploadObserver) -> None:
+        """
+        Registers an observer for the progress events of the upload.
+        """
+        self.observers.append(observer)
+
+    def remove_observer(self, observer: UploadObserver) -> None:
+        """
+        Stops delivering progress events to an observer.
+        """
+        self.observers.remove(observer)
+
+    def events(self, max_events: int = 1000) -> UploadEventStream:
+        """
+        Gets an async iterator over the progress events of the upload. Create it before
+        the upload starts to receive every event.
+        Args:
+            max_events (int): The most events kept while waiting to be consumed.
+        Returns:
+            UploadEventStream: The events, ending with the completion or failure.
+        """
+        stream = UploadEventStream(max_events)
+        self.add_observer(stream)
+        return stream
+
+    def _notify_observers(self, event_type: UploadEventType, **details: Any) -> None:
+        if not self.observers:
+            return
+        elapsed = time.monotonic() - self._started
+        event = UploadProgressEvent(
+            event_type=event_type,
+            total_bytes=self.file_size,
+            bytes_acknowledged=min(
+                self._bytes_acknowledged_before + self.statistics.bytes_sent, self.file_size
+            ),
+            elapsed_seconds=elapsed,
+            average_throughput=self.statistics.bytes_sent / max(elapsed, 1e-6),
+            in_flight=self._in_flight,
+            retries=self.statistics.retries,
+            **details
+        )
+        for observer in list(self.observers):
+            try:
+                observer.on_event(event)
+            except Exception as error:  #pylint: disable=broad-except
+                logging.warning("Upload observer %r failed: %s", observer, error)
+
+    async def _get_session_status(self) -> Optional[LargeFileUploadSession]:
+        """
+        Queries the upload session for the byte ranges the service still expects.
+        Returns None if the session could not be read.
+        """
+        info = RequestInformation()
+        info.url = self.get_validated_upload_url(self.upload_session)
+        info.http_method = Method.GET
+        try:
+            return await self.request_adapter.send_async(info, LargeFileUploadSession, {})
+        except Exception as error:  #pylint: disable=broad-except
+            logging.warning("Could not read the upload session status: %s", error)
+            return None
+
+    async def _read_chunk(self, file: Union[BytesIO, UploadSource], start: int,
+                          length: int) -> Union[bytes, memoryview]:
+        if file is self.stream:
+            return await self.source.read(start, length)
+        if isinstance(file, UploadSource):
+            return await file.read(start, length)
+        file.seek(start)
+        return file.read(length)
+
+    def _build_chunk_request(
+        self, start: int, end: int, chunk_data: Union[bytes, memoryview]
+    ) -> RequestInformation:
+        info = RequestInformation()
+        info.url = self.get_validated_upload_url(self.upload_session)
+        info.http_method = Method.PUT
+        info.headers = HeadersCollection()
+        info.headers.try_add('Content-Range', f'bytes {start}-{end}/{self.file_size}')
+        info.headers.try_add('Content-Length', str(len(chunk_data)))
+        info.headers.try_add("Content-Type", "application/octet-stream")
+        if isinstance(chunk_data, memoryview):
+            info.set_stream_content(_MemoryViewContent(chunk_data))  # type: ignore[arg-type]
+        else:
+            info.set_stream_content(chunk_data)
+        return info
+
     @property
     def next_range(self):
         return self._next_range
@@ -148,44 +710,37 @@ class LargeFileUploadTask:
         self._next_range = value
 
     async def next_chunk(
-        self, file: BytesIO, range_start: int = 0, range_end: int = 0
+        self,
+        file: Union[BytesIO, UploadSource],
+        range_start: int = 0,
+        range_end: int = 0
     ) -> LargeFileUploadSession:
         upload_url = self.get_validated_upload_url(self.upload_session)
         if not upload_url:
             raise ValueError('The upload session URL must not be empty.')
-        info = RequestInformation()
-        info.url = upload_url
-        info.http_method = Method.PUT
         if not self.next_range:
             self.next_range = f'{range_start}-{range_end}'
         range_parts = self.next_range.split('-') if self.next_range else ['-']
         start = int(range_parts[0])
         end = int(range_parts[1]) if len(range_parts) > 1 else 0
         if start == 0 and end == 0:
-            chunk_data = file.read(self.max_chunk_size)
+            chunk_data = await self._read_chunk(file, 0, self.max_chunk_size)
             end = min(self.max_chunk_size - 1, self.file_size - 1)
         elif start == 0:
-            chunk_data = file.read(end + 1)
+            chunk_data = await self._read_chunk(file, 0, end + 1)
         elif end == 0:
-            file.seek(start)
-            chunk_data = file.read(self.max_chunk_size)
+            chunk_data = await self._read_chunk(file, start, self.max_chunk_size)
             end = start + len(chunk_data) - 1
         else:
-            file.seek(start)
             end = min(end, self.max_chunk_size + start)
-            chunk_data = file.read(end - start + 1)
-        info.headers = HeadersCollection()
-
-        info.headers.try_add('Content-Range', f'bytes {start}-{end}/{self.file_size}')
-        info.headers.try_add('Content-Length', str(len(chunk_data)))
-        info.headers.try_add("Content-Type", "application/octet-stream")
-        info.set_stream_content(bytes(chunk_data))
+            chunk_data = await self._read_chunk(file, start, end - start + 1)
+        info = self._build_chunk_request(start, end, chunk_data)
         error_map: dict[str, int] = {}
         return await self.request_adapter.send_async(info, LargeFileUploadSession, error_map)
 
     async def last_chunk(
         self,
-        file: BytesIO,
+        file: Union[BytesIO, UploadSource],
         range_start: int = 0,
         range_end: int = 0,
         parsable_factory: Optional[ParsableFactory] = None
@@ -193,40 +748,30 @@ class LargeFileUploadTask:
         upload_url = self.get_validated_upload_url(self.upload_session)
         if not upload_url:
             raise ValueError('The upload session URL must not be empty.')
-        info = RequestInformation()
-        info.url = upload_url
-        info.http_method = Method.PUT
         if not self.next_range:
             self.next_range = f'{range_start}-{range_end}'
         range_parts = self.next_range.split('-') if self.next_range else ['-']
         start = int(range_parts[0])
         end = int(range_parts[1]) if len(range_parts) > 1 else 0
         if start == 0 and end == 0:
-            chunk_data = file.read(self.max_chunk_size)
+            chunk_data = await self._read_chunk(file, 0, self.max_chunk_size)
             end = min(self.max_chunk_size - 1, self.file_size - 1)
         elif start == 0:
-            chunk_data = file.read(end + 1)
+            chunk_data = await self._read_chunk(file, 0, end + 1)
         elif end == 0:
-            file.seek(start)
-            chunk_data = file.read(self.max_chunk_size)
+            chunk_data = await self._read_chunk(file, start, self.max_chunk_size)
             end = start + len(chunk_data) - 1
         else:
-            file.seek(start)
             end = min(end, self.max_chunk_size + start)
-            chunk_data = file.read(end - start + 1)
-        info.headers = HeadersCollection()
-
-        info.headers.try_add('Content-Range', f'bytes {start}-{end}/{self.file_size}')
-        info.headers.try_add('Content-Length', str(len(chunk_data)))
-        info.headers.try_add("Content-Type", "application/octet-stream")
-        info.set_stream_content(bytes(chunk_data))
+            chunk_data = await self._read_chunk(file, start, end - start + 1)
+        info = self._build_chunk_request(start, end, chunk_data)
         error_map: dict[str, int] = {}
         factory = self.factory or parsable_factory
         if factory:
             return await self.request_adapter.send_async(info, factory, error_map)
         return await self.request_adapter.send_primitive_async(info, "bytes", error_map)
 
-    def get_file(self) -> BytesIO:
+    def get_file(self) -> Union[BytesIO, UploadSource]:
         return self.stream
 
     async def cancel(self) -> Parsable:
@@ -276,7 +821,7 @@ class LargeFileUploadTask:
         return False, None
 
     async def resume(self) -> Future:
-        if self.upload_session_expired(self.upload_session):
+        if self.session_refresher is None and self._is_expired():
             raise RuntimeError('The upload session is expired.')
 
         validated_value = self.check_value_exists(
@@ -0,0 +1,154 @@
+"""
+Iterates over many paged collections at once within a global limit.
+"""
+import asyncio
+from collections.abc import AsyncIterator, Hashable, Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any, Optional, Type, Union
+
+from kiota_abstractions.request_adapter import RequestAdapter
+from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import ParsableFactory
+
+from ._worker_pool import run_workers
+from .page_iterator import PageIterator
+
+_DONE = object()
+
+
+@dataclass
+class SourcedItem:
+    """
+    An item of one of the collections iterated by a MultiPageIterator.
+
+    Attributes:
+        source (Hashable): The key of the collection the item belongs to.
+        item (Any): The item.
+    """
+    source: Hashable
+    item: Any
+
+
+@dataclass
+class _Failure:
+    error: BaseException
+
+
+class MultiPageIterator:
+    """
+    Follows the nextLink chains of many collections concurrently and yields their
+    items as they arrive, tagged with the collection they come from.
+
+    The pages of a single collection can only be fetched one after the other, so the
+    throughput comes from iterating up to max_concurrency collections at a time. Items
+    of the same collection are yielded in order, items of different collections are
+    interleaved. Fetching pauses while max_buffered_items items wait to be consumed.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        request_adapter: RequestAdapter,
+        sources: Union[Mapping[Hashable, Any], Iterable[Any]],
+        parsable_factory: Optional[ParsableFactory] = None,
+        *,
+        max_concurrency: int = 8,
+        max_buffered_items: int = 1000,
+        error_mapping: Optional[dict[str, Type[ParsableFactory]]] = None,
+        headers: Optional[dict] = None,
+        request_options: Optional[list] = None,
+        return_exceptions: bool = False,
+    ) -> None:
+        """
+        Args:
+            request_adapter (RequestAdapter): The adapter used to fetch the pages.
+            sources (Union[Mapping[Hashable, Any], Iterable[Any]]): The collections to
+                iterate, each given as its first page or as the RequestInformation
+                fetching it. A mapping keys the items by its keys, otherwise by the
+                position of their collection.
+            parsable_factory (Optional[ParsableFactory]): Factory for the first pages
+                fetched from a RequestInformation. The following pages are parsed with
+                the type of the first page.
+            max_concurrency (int): The collections iterated, and so the page requests in
+                flight, at once.
+            max_buffered_items (int): The items fetched ahead of the consumer.
+            error_mapping (Optional[dict[str, Type[ParsableFactory]]]): The error
+                mapping of the page requests.
+            headers (Optional[dict]): Headers added to the requests for following pages.
+            request_options (Optional[list]): Options of the requests for following pages.
+            return_exceptions (bool): Whether a collection that fails is skipped, with
+                its error recorded in errors. Otherwise the first failure stops the
+                iteration and is raised.
+        """
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1.')
+        if max_buffered_items < 1:
+            raise ValueError('max_buffered_items must be at least 1.')
+        self.request_adapter = request_adapter
+        if isinstance(sources, Mapping):
+            self.sources = list(sources.items())
+        else:
+            self.sources = list(enumerate(sources))
+        self.parsable_factory = parsable_factory
+        self.max_concurrency = max_concurrency
+        self.max_buffered_items = max_buffered_items
+        self.error_mapping = error_mapping
+        self.headers = headers
+        self.request_options = request_options
+        self.return_exceptions = return_exceptions
+        self.errors: dict[Hashable, BaseException] = {}
+
+    def __aiter__(self) -> AsyncIterator[SourcedItem]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[SourcedItem]:
+        self.errors = {}
+        queue: asyncio.Queue = asyncio.Queue(self.max_buffered_items)
+
+        async def run_source(entry: tuple[Hashable, Any]) -> None:
+            key, source = entry
+            try:
+                await self._iterate_source(key, source, queue)
+            except Exception as error:  # pylint: disable=broad-except
+                if not self.return_exceptions:
+                    raise
+                self.errors[key] = error
+
+        async def supervise() -> None:
+            try:
+                await run_workers(self.sources, run_source, self.max_concurrency)
+            except Exception as error:  # pylint: disable=broad-except
+                await queue.put(_Failure(error))
+            else:
+                await queue.put(_DONE)
+
+        supervisor = asyncio.ensure_future(supervise())
+        try:
+            while True:
+                entry = await queue.get()
+                if entry is _DONE:
+                    return
+                if isinstance(entry, _Failure):
+                    raise entry.error
+                yield entry
+        finally:
+            # Cancelling the supervisor stops the workers.
+            supervisor.cancel()
+            await asyncio.gather(supervisor, return_exceptions=True)
+
+    async def _iterate_source(self, key: Hashable, source: Any, queue: asyncio.Queue) -> None:
+        if isinstance(source, RequestInformation):
+            if self.parsable_factory is None:
+                raise ValueError('A parsable_factory is required to fetch the first pages.')
+            source = await self.request_adapter.send_async(
+                source, self.parsable_factory, self.error_mapping
+            )
+            if source is None:
+                return
+        page_iterator = PageIterator(source, self.request_adapter, error_mapping=self.error_mapping)
+        if self.headers:
+            page_iterator.set_headers(self.headers)
+        if self.request_options:
+            page_iterator.set_request_options(self.request_options)
+        async for page in page_iterator.pages():
+            for item in page.value or []:
+                await queue.put(SourcedItem(key, item))
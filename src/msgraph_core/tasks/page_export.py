@@ -0,0 +1,259 @@
+"""
+Export of paged collections as columns.
+
+A PageExporter projects chosen fields of the items of a paged collection into
+columnar batches of a fixed number of rows, and hands each batch to a BatchWriter as
+soon as it is full. Only one page and one batch are held at a time, however large the
+collection. CsvBatchWriter only needs the standard library; ArrowIpcBatchWriter and
+ParquetBatchWriter need pyarrow, which is imported when they are created.
+"""
+import csv
+import os
+from abc import ABC, abstractmethod
+from collections.abc import AsyncGenerator, AsyncIterable, Callable, Mapping, Sequence
+from contextlib import aclosing
+from typing import IO, Any, Optional, Union
+
+# A column is read from a dotted path of properties, e.g. manager.displayName, or
+# computed from the item.
+ColumnSource = Union[str, Callable[[Any], Any]]
+ColumnBatch = dict[str, list[Any]]
+
+
+def get_field(item: Any, path: str) -> Any:
+    """
+    Reads a dotted path of properties from an item.
+
+    Each property is read with a key from mappings, e.g. dictionaries or LazyItem
+    instances, and as an attribute or from additional_data from models.
+    Args:
+        item (Any): The item.
+        path (str): The path, e.g. manager.displayName.
+    Returns:
+        Any: The value, or None if a property along the path is missing.
+    """
+    value = item
+    for name in path.split('.'):
+        if value is None:
+            return None
+        if isinstance(value, Mapping):
+            value = value.get(name)
+            continue
+        attribute = getattr(value, name, None)
+        if attribute is None:
+            additional_data = getattr(value, 'additional_data', None)
+            if isinstance(additional_data, dict):
+                attribute = additional_data.get(name)
+        value = attribute
+    return value
+
+
+class BatchWriter(ABC):
+    """
+    Writes the columnar batches of an export.
+    """
+
+    @abstractmethod
+    def write_batch(self, batch: ColumnBatch) -> None:
+        """
+        Writes a batch.
+        Args:
+            batch (ColumnBatch): The values of each column, all of the same length.
+        """
+
+    def close(self) -> None:
+        """
+        Completes the output. Called once the last batch has been written.
+        """
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class PageExporter:
+    """
+    Projects the items of an async iterable, e.g. a PageIterator, into columnar
+    batches.
+
+    Using a LazyPageResult as the parsable factory of the pages skips deserializing
+    the items into models: the columns are read from their JSON properties.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterable[Any],
+        columns: Union[Sequence[str], Mapping[str, ColumnSource]],
+        *,
+        batch_size: int = 10000,
+    ) -> None:
+        """
+        Args:
+            source (AsyncIterable[Any]): The items, e.g. a PageIterator.
+            columns (Union[Sequence[str], Mapping[str, ColumnSource]]): The paths of the
+                columns, which also name them, or the paths or functions of the columns
+                by name.
+            batch_size (int): The rows per batch.
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1.')
+        if not isinstance(columns, Mapping):
+            columns = {path: path for path in columns}
+        if not columns:
+            raise ValueError('At least one column is required.')
+        self.source = source
+        self.columns: dict[str, ColumnSource] = dict(columns)
+        self.batch_size = batch_size
+        self.rows_exported = 0
+
+    async def batches(self) -> AsyncGenerator[ColumnBatch, None]:
+        """
+        Projects the items into batches. Every batch but the last holds batch_size rows.
+        Returns:
+            AsyncGenerator[ColumnBatch, None]: The batches.
+        """
+        readers = [(name, self._reader(source)) for name, source in self.columns.items()]
+        batch = self._new_batch()
+        rows = 0
+        async for item in self.source:
+            for name, reader in readers:
+                batch[name].append(reader(item))
+            rows += 1
+            if rows == self.batch_size:
+                yield batch
+                batch = self._new_batch()
+                rows = 0
+        if rows:
+            yield batch
+
+    async def export(self, writer: BatchWriter) -> int:
+        """
+        Writes every batch and closes the writer.
+        Args:
+            writer (BatchWriter): The output.
+        Returns:
+            int: The number of rows exported.
+        """
+        self.rows_exported = 0
+        with writer:
+            async with aclosing(self.batches()) as batches:
+                async for batch in batches:
+                    writer.write_batch(batch)
+                    self.rows_exported += len(next(iter(batch.values())))
+        return self.rows_exported
+
+    def _new_batch(self) -> ColumnBatch:
+        return {name: [] for name in self.columns}
+
+    @staticmethod
+    def _reader(source: ColumnSource) -> Callable[[Any], Any]:
+        if callable(source):
+            return source
+        return lambda item: get_field(item, source)
+
+
+class CsvBatchWriter(BatchWriter):
+    """
+    Writes the batches as CSV, with a header row naming the columns. Missing values
+    are written as empty fields.
+    """
+
+    def __init__(self, output: Union[str, os.PathLike, IO[str]], **fmtparams: Any) -> None:
+        """
+        Args:
+            output (Union[str, os.PathLike, IO[str]]): A path or a text file. A path is
+                opened when the writer is created and closed with it.
+            fmtparams (Any): Formatting parameters of csv.writer, e.g. delimiter.
+        """
+        if isinstance(output, (str, os.PathLike)):
+            # pylint: disable=consider-using-with
+            self._file: IO[str] = open(output, 'w', encoding='utf-8', newline='')
+            self._owns_file = True
+        else:
+            self._file = output
+            self._owns_file = False
+        self._writer = csv.writer(self._file, **fmtparams)
+        self._header_written = False
+
+    def write_batch(self, batch: ColumnBatch) -> None:
+        if not self._header_written:
+            self._writer.writerow(batch.keys())
+            self._header_written = True
+        self._writer.writerows(zip(*batch.values()))
+
+    def close(self) -> None:
+        if self._owns_file:
+            self._file.close()
+        else:
+            self._file.flush()
+
+
+def _import_pyarrow() -> Any:
+    # Imported lazily: pyarrow is an optional dependency, only needed by these writers.
+    try:
+        import pyarrow  # pylint: disable=import-outside-toplevel
+    except ImportError as error:
+        raise ImportError('Exporting to Arrow or Parquet requires pyarrow.') from error
+    return pyarrow
+
+
+class ArrowIpcBatchWriter(BatchWriter):
+    """
+    Writes the batches as record batches of an Arrow IPC file. The schema is inferred
+    from the first batch unless it is given.
+    """
+
+    def __init__(self, output: Union[str, os.PathLike, Any], schema: Optional[Any] = None) -> None:
+        """
+        Args:
+            output (Union[str, os.PathLike, Any]): A path or a writable binary file.
+            schema (Optional[Any]): The pyarrow.Schema of the columns. Worth giving when
+                the first batch may only hold missing values for a column.
+        """
+        self.pyarrow = _import_pyarrow()
+        self.output = os.fspath(output) if isinstance(output, os.PathLike) else output
+        self.schema = schema
+        self._writer: Any = None
+
+    def write_batch(self, batch: ColumnBatch) -> None:
+        record_batch = self.pyarrow.RecordBatch.from_pydict(batch, schema=self.schema)
+        if self._writer is None:
+            self.schema = record_batch.schema
+            self._writer = self._open(self.schema)
+        self._writer.write_batch(record_batch)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+
+    def _open(self, schema: Any) -> Any:
+        import pyarrow.ipc  # pylint: disable=import-outside-toplevel
+        return pyarrow.ipc.new_file(self.output, schema)
+
+
+class ParquetBatchWriter(ArrowIpcBatchWriter):
+    """
+    Writes the batches as row groups of a Parquet file. The schema is inferred from
+    the first batch unless it is given.
+    """
+
+    def __init__(
+        self,
+        output: Union[str, os.PathLike, Any],
+        schema: Optional[Any] = None,
+        **options: Any
+    ) -> None:
+        """
+        Args:
+            output (Union[str, os.PathLike, Any]): A path or a writable binary file.
+            schema (Optional[Any]): The pyarrow.Schema of the columns.
+            options (Any): Options of pyarrow.parquet.ParquetWriter, e.g. compression.
+        """
+        super().__init__(output, schema)
+        self.options = options
+
+    def _open(self, schema: Any) -> Any:
+        import pyarrow.parquet  # pylint: disable=import-outside-toplevel
+        return pyarrow.parquet.ParquetWriter(self.output, schema, **self.options)
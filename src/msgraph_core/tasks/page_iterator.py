@@ -17,8 +17,12 @@ kiota_abstractions.request_information, kiota_abstractions.serialization.parsabl
 and models modules.
 """
 
-from collections.abc import Callable
-from typing import Optional, Type, TypeVar, Union
+import asyncio
+import functools
+from collections.abc import AsyncGenerator, AsyncIterator, Callable
+from concurrent.futures import Executor
+from contextlib import aclosing
+from typing import Any, Optional, Type, TypeVar, Union
 
 from kiota_abstractions.headers_collection import HeadersCollection
 from kiota_abstractions.method import Method
@@ -30,9 +34,15 @@ from msgraph_core.models.page_result import (
     PageResult,  # pylint: disable=no-name-in-module, import-error
 )
 
+from .checkpoint_store import CheckpointStore, CheckpointWriter
+from .page_iterator_checkpoint import PageIteratorCheckpoint
+from .page_pipeline import PagePipeline
+from .page_stream_parser import JsonPageStreamParser
+
 T = TypeVar('T', bound=Parsable)
 
 
+# pylint: disable=too-many-instance-attributes
 class PageIterator:
     """
 This class is used to iterate over paged responses from a server.
@@ -48,6 +58,16 @@ Attributes:
     current_page (PageResult): The current page of items.
     object_type (str): The type of the items in the pages.
     has_next (bool): Whether there are more pages to fetch.
+    prefetch_depth (int): The number of pages fetched in the background ahead of the
+     page being processed. The fetches make progress whenever the consumer awaits, e.g.
+     between the items of an async for loop. 0 fetches each page when it is needed.
+    checkpoint_store (Optional[CheckpointStore]): Where the position of the iteration is
+     saved, every checkpoint_interval pages and when the iteration stops, so it can be
+     resumed with from_checkpoint(). Saves run off the event loop and the last one has
+     completed when the iteration returns.
+    checkpoint_key (Optional[str]): The key of the checkpoint.
+    checkpoint_interval (int): The number of pages processed between checkpoints.
+    pages_processed (int): The number of pages processed so far.
 
 Methods:
     __init__(response: Union[T, list, object], request_adapter: RequestAdapter,
@@ -55,14 +75,39 @@ Methods:
      the PageIterator class.
     """
 
-    def __init__(
+    def __init__(  # pylint: disable=too-many-arguments
         self,
         response: Union[T, list, object],
         request_adapter: RequestAdapter,
         constructor_callable: Optional[Callable] = None,
         error_mapping: Optional[dict[str, Type[ParsableFactory]]] = None,
+        *,
+        prefetch_depth: int = 0,
+        checkpoint_store: Optional[CheckpointStore] = None,
+        checkpoint_key: Optional[str] = None,
+        checkpoint_interval: int = 1,
     ):
+        if prefetch_depth < 0:
+            raise ValueError('prefetch_depth cannot be negative.')
+        if checkpoint_store is not None and not checkpoint_key:
+            raise ValueError('A checkpoint_key is required to save checkpoints.')
+        if checkpoint_interval < 1:
+            raise ValueError('checkpoint_interval must be at least 1.')
         self.request_adapter = request_adapter
+        self.prefetch_depth = prefetch_depth
+        self.checkpoint_store = checkpoint_store
+        self.checkpoint_key = checkpoint_key
+        self.checkpoint_interval = checkpoint_interval
+        self.pages_processed = 0
+        self._checkpoint_writer = CheckpointWriter()
+        # The URL of the current page, unless it is the response the iterator was
+        # created with, and of the page being fetched.
+        self._page_link: Optional[str] = None
+        self._fetched_link: Optional[str] = None
+        self._prefetcher: Optional[asyncio.Task] = None
+        self._prefetched: asyncio.Queue = asyncio.Queue()
+        self._prefetch_slots = asyncio.Semaphore(prefetch_depth)
+        self._prefetch_link: Optional[str] = None
 
         if isinstance(response, Parsable) and not constructor_callable:
             parsable_factory: Type[Parsable] = type(response)
@@ -83,9 +128,7 @@ Methods:
         self._next_link = response.get('odata_next_link', '') if isinstance(
             response, dict
         ) else getattr(response, 'odata_next_link', '')
-        self._delta_link = response.get('@odata.deltaLink', '') if isinstance(
-            response, dict
-        ) else getattr(response, '@odata.deltaLink', '')
+        self._delta_link = self.get_delta_link(response)
 
         if page is not None:
             self.current_page = page
@@ -101,12 +144,29 @@ Methods:
             headers (dict): A dictionary of headers to add. The keys are the
             header names and the values are the header values.
         """
-        self.headers.add_all(**headers)
+        for name, value in headers.items():
+            self.headers.add(name, value)
         return self.headers
 
     @property
     def delta_link(self):
-        return self._delta_link
+        """
+        The @odata.deltaLink of a delta query, known once its last page has been reached.
+        """
+        return self.current_page.odata_delta_link or self._delta_link
+
+    @staticmethod
+    def get_delta_link(response: Any) -> Optional[str]:
+        """
+        Gets the @odata.deltaLink of a response, if it has one.
+        Args:
+            response (Any): A page parsed into a model or a dictionary.
+        Returns:
+            Optional[str]: The delta link, or None on pages other than the last one.
+        """
+        if isinstance(response, dict):
+            return response.get('@odata.deltaLink') or response.get('odata_delta_link')
+        return getattr(response, 'odata_delta_link', None)
 
     @property
     def next_link(self):
@@ -129,15 +189,163 @@ Methods:
             callback (Callable): The function to apply to each item.
             It should take one argument (the item) and return a boolean.
         """
-        while True:
-            keep_iterating = self.enumerate(callback)
-            if not keep_iterating:
-                return
-            next_page = await self.next()
-            if not next_page:
-                return
-            self.current_page = next_page
-            self.pause_index = 0
+        try:
+            while True:
+                await self._start_prefetch()
+                keep_iterating = self.enumerate(callback)
+                if not keep_iterating:
+                    return
+                self._page_processed()
+                next_page = await self.next()
+                if not next_page:
+                    return
+                self.current_page = next_page
+                self._page_link = self._fetched_link
+                self.pause_index = 0
+        finally:
+            await self.cancel_prefetch()
+            await self._save_final_checkpoint()
+
+    async def iterate_concurrently(
+        self,
+        handler: Callable[[Any], Any],
+        *,
+        workers: int = 4,
+        max_queued_items: int = 100,
+        executor: Optional[Executor] = None
+    ) -> int:
+        """
+        Iterates over the pages and hands the items to a pool of workers, see PagePipeline.
+        The pages are only fetched while fewer than max_queued_items items wait for a
+        worker.
+        Args:
+            handler (Callable[[Any], Any]): Called with each item. A coroutine function
+                runs on the event loop, any other function in the executor. Returning
+                False stops the iteration.
+            workers (int): The items handled at once.
+            max_queued_items (int): The items fetched ahead of the workers.
+            executor (Optional[Executor]): Where plain functions run, e.g. a
+                ProcessPoolExecutor for CPU bound handlers. Defaults to the thread pool
+                of the event loop.
+        Returns:
+            int: The number of items handled.
+        """
+        pipeline = PagePipeline(
+            self, handler, workers=workers, max_queued_items=max_queued_items, executor=executor
+        )
+        return await pipeline.run()
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        """
+        Iterates over the items of the pages with async for, starting at the pause index
+        of the current page. The next page is only fetched once every item of the
+        current page has been consumed, so a slow consumer applies backpressure.
+        """
+        return self._iterate_items()
+
+    async def _iterate_items(self) -> AsyncIterator[Any]:
+        async with aclosing(self.pages()) as pages:
+            async for page in pages:
+                items = page.value or []
+                while self.pause_index < len(items):
+                    item = items[self.pause_index]
+                    self.pause_index += 1
+                    yield item
+                # Release the consumed page before the next one is fetched.
+                del items, page
+
+    async def pages(self) -> AsyncGenerator[PageResult, None]:
+        """
+        Iterates over the pages with async for, starting with the current page.
+        The next page is fetched when the consumer asks for it, and the items of a page
+        that has been consumed are released before the next page is fetched, so at most
+        one page is held at a time. With a prefetch_depth, up to that many more pages are
+        fetched ahead while the current one is processed.
+        Returns:
+            AsyncIterator[PageResult]: The pages.
+        """
+        try:
+            while True:
+                next_link = self.current_page.odata_next_link
+                await self._start_prefetch()
+                yield self.current_page
+                self.pause_index = max(self.pause_index, len(self.current_page.value or []))
+                self._page_processed()
+                if not next_link:
+                    return
+                self.current_page = PageResult(next_link, [])
+                self.pause_index = 0
+                next_page = await self.next()
+                if not next_page:
+                    return
+                self.current_page = next_page
+                self._page_link = self._fetched_link
+        finally:
+            await self.cancel_prefetch()
+            await self._save_final_checkpoint()
+
+    async def stream_items(self, item_factory: Optional[Callable] = None) -> AsyncIterator[Any]:
+        """
+        Iterates over the items like async for, but the following pages are not
+        deserialized as a whole: their items are decoded one by one from the response
+        body as it arrives, so memory scales with an item rather than with a page.
+        Requires a request adapter providing stream_response, like the
+        BaseGraphRequestAdapter.
+        Args:
+            item_factory (Optional[Callable]): Converts the JSON value of an
+                item of the following pages, e.g. into a model. The JSON values are
+                yielded when omitted.
+        Returns:
+            AsyncIterator[Any]: The items.
+        Raises:
+            TypeError: If the request adapter cannot stream responses.
+        """
+        stream_response = getattr(self.request_adapter, 'stream_response', None)
+        if stream_response is None:
+            raise TypeError('The request adapter does not support streaming responses.')
+        try:
+            items = self.current_page.value or []
+            # A page whose streaming was interrupted is fetched again, skipping the items
+            # yielded before.
+            skip = 0 if items else self.pause_index
+            if self.pause_index < len(items):
+                while self.pause_index < len(items):
+                    self.pause_index += 1
+                    yield items[self.pause_index - 1]
+                self._page_processed()
+            del items
+            while self.current_page.odata_next_link:
+                request_info = self._create_request(self.current_page.odata_next_link)
+                self.current_page = PageResult(self.current_page.odata_next_link, [])
+                self.pause_index = 0
+                parser = JsonPageStreamParser()
+                async with aclosing(
+                    self._stream_page(stream_response, request_info, parser)
+                ) as page_items:
+                    async for item in page_items:
+                        self.pause_index += 1
+                        if self.pause_index > skip:
+                            yield item_factory(item) if item_factory else item
+                skip = 0
+                self.current_page = PageResult(
+                    parser.properties.get('@odata.nextLink'), [],
+                    parser.properties.get('@odata.deltaLink')
+                )
+                self.pause_index = 0
+                self._page_processed()
+        finally:
+            await self._save_final_checkpoint()
+
+    async def _stream_page(
+        self, stream_response: Callable, request_info: RequestInformation,
+        parser: JsonPageStreamParser
+    ) -> AsyncGenerator[Any, None]:
+        async with stream_response(request_info, self.error_mapping) as response:
+            async for data in response.aiter_bytes():
+                for item in parser.feed(data):
+                    yield item
+        for item in parser.close():
+            yield item
 
     async def next(self) -> Optional[PageResult]:
         """
@@ -147,12 +355,69 @@ Methods:
         """
         if self.current_page is not None and not self.current_page.odata_next_link:
             return None
-        response = await self.fetch_next_page()
+        self._fetched_link = self.current_page.odata_next_link
+        if self.prefetch_depth:
+            return await self._next_prefetched()
+        return self._to_page(await self.fetch_next_page())
+
+    @staticmethod
+    def _to_page(response: Optional[Union[T, PageResult]]) -> PageResult:
         next_link = response.odata_next_link if response and hasattr(
             response, 'odata_next_link'
         ) else None
         value = response.value if response and hasattr(response, 'value') else None
-        return PageResult(next_link, value)
+        return PageResult(next_link, value, PageIterator.get_delta_link(response))
+
+    async def _start_prefetch(self) -> None:
+        if not self.prefetch_depth:
+            return
+        next_link = self.current_page.odata_next_link
+        if not next_link:
+            return
+        if self._prefetcher is None or self._prefetch_link != next_link:
+            # Nothing prefetched yet, or the iterator was moved to another page.
+            await self.cancel_prefetch()
+            self._prefetcher = asyncio.ensure_future(self._prefetch_pages(next_link))
+            self._prefetch_link = next_link
+        # Let the prefetcher send its request before the current page is processed: a
+        # synchronous callback would otherwise hold the loop until the page is done.
+        await asyncio.sleep(0)
+
+    async def _next_prefetched(self) -> PageResult:
+        await self._start_prefetch()
+        result = await self._prefetched.get()
+        self._prefetch_slots.release()
+        if isinstance(result, BaseException):
+            self._prefetcher = None
+            raise result
+        self._prefetch_link = result.odata_next_link
+        return result
+
+    async def _prefetch_pages(self, next_link: Optional[str]) -> None:
+        """
+        Fetches the pages following next_link in order, staying at most prefetch_depth
+        pages ahead of the consumer. An error is queued in place of the page.
+        """
+        try:
+            while next_link:
+                await self._prefetch_slots.acquire()
+                page = self._to_page(await self.fetch_next_page(next_link))
+                self._prefetched.put_nowait(page)
+                next_link = page.odata_next_link
+        except Exception as error:  # pylint: disable=broad-except
+            self._prefetched.put_nowait(error)
+
+    async def cancel_prefetch(self) -> None:
+        """
+        Stops fetching pages in the background and drops the pages fetched ahead.
+        """
+        prefetcher, self._prefetcher = self._prefetcher, None
+        if prefetcher is not None:
+            prefetcher.cancel()
+            await asyncio.gather(prefetcher, return_exceptions=True)
+        self._prefetched = asyncio.Queue()
+        self._prefetch_slots = asyncio.Semaphore(self.prefetch_depth)
+        self._prefetch_link = None
 
     @staticmethod
     def convert_to_page(response: Union[T, list, object]) -> PageResult:
@@ -184,11 +449,15 @@ Methods:
             parsable_page, dict
         ) else getattr(parsable_page, 'odata_next_link', '')
 
-        return PageResult(next_link, value)
+        return PageResult(next_link, value, PageIterator.get_delta_link(parsable_page))
 
-    async def fetch_next_page(self) -> Optional[Union[T, PageResult]]:
+    async def fetch_next_page(self,
+                              next_link: Optional[str] = None) -> Optional[Union[T, PageResult]]:
         """
         Fetches the next page of items from the server.
+        Args:
+            next_link (Optional[str]): The URL of the page. Defaults to the next link of
+            the current page.
         Returns:
             dict: The response from the server.
         Raises:
@@ -196,7 +465,14 @@ Methods:
             InvalidURL: If the next link URL could not be parsed.
         """
 
-        next_link = self.current_page.odata_next_link
+        request_info = self._create_request(next_link or self.current_page.odata_next_link)
+        return await self.request_adapter.send_async(
+            request_info,
+            self.parsable_factory,  # type: ignore
+            self.error_mapping
+        )
+
+    def _create_request(self, next_link: Optional[str]) -> RequestInformation:
         if not next_link:
             raise ValueError('The response does not contain a nextLink.')
         if not next_link.startswith('http'):
@@ -210,11 +486,7 @@ Methods:
         request_info.headers = self.headers
         if self.request_options:
             request_info.add_request_options(*self.request_options)
-        return await self.request_adapter.send_async(
-            request_info,
-            self.parsable_factory,  # type: ignore
-            self.error_mapping
-        )
+        return request_info
 
     def enumerate(self, callback: Optional[Callable] = None) -> bool:
         """
@@ -236,4 +508,112 @@ Methods:
             if not keep_iterating:
                 self.pause_index = i + 1
                 break
+        else:
+            self.pause_index = len(page_items)
         return keep_iterating
+
+    def get_checkpoint(self) -> PageIteratorCheckpoint:
+        """
+        Captures the position of the iteration, so it can be resumed from another
+        process with from_checkpoint().
+        Returns:
+            PageIteratorCheckpoint: The checkpoint.
+        Raises:
+            ValueError: If the current page is the response the iterator was created
+                with and some of its items have not been processed: it cannot be
+                fetched again.
+        """
+        items = self.current_page.value or []
+        page_link: Optional[str]
+        if self.pause_index < len(items):
+            if not self._page_link:
+                raise ValueError(
+                    'The items of the first page must be processed before a checkpoint is taken.'
+                )
+            page_link, pause_index = self._page_link, self.pause_index
+        else:
+            # Either the current page has been processed, or it is being streamed or
+            # fetched and pause_index counts the items of it already processed.
+            page_link = self.current_page.odata_next_link
+            pause_index = 0 if items else self.pause_index
+        return PageIteratorCheckpoint(
+            page_link=page_link or None,
+            pause_index=pause_index,
+            delta_link=self.delta_link or None,
+            headers={
+                name: sorted(values)
+                for name, values in self.headers.get_all().items()
+            },
+            pages_processed=self.pages_processed,
+        )
+
+    @classmethod
+    async def from_checkpoint(
+        cls,
+        checkpoint_store: CheckpointStore,
+        checkpoint_key: str,
+        request_adapter: RequestAdapter,
+        parsable_factory: Type[Parsable] = PageResult,
+        request_options: Optional[list] = None,
+        **kwargs: Any
+    ) -> Optional['PageIterator']:
+        """
+        Rebuilds an iterator from a saved checkpoint, fetching the page it stopped on
+        again. Iterating over it continues with the first item that was not processed.
+        Args:
+            checkpoint_store (CheckpointStore): The store the checkpoint was saved to.
+            checkpoint_key (str): The key the checkpoint was saved under.
+            request_adapter (RequestAdapter): The adapter used to fetch the pages.
+            parsable_factory (Type[Parsable]): Factory for the pages.
+            request_options (Optional[list]): The options of the page requests, which are
+                not saved in checkpoints.
+            kwargs: Any other keyword arguments accepted by the constructor.
+        Returns:
+            Optional[PageIterator]: The iterator, or None if there is no checkpoint.
+        """
+        value = checkpoint_store.load(checkpoint_key)
+        if value is None:
+            return None
+        checkpoint = PageIteratorCheckpoint.from_dict(value)
+        page_iterator = cls(
+            PageResult(checkpoint.page_link, [], checkpoint.delta_link),
+            request_adapter,
+            checkpoint_store=checkpoint_store,
+            checkpoint_key=checkpoint_key,
+            **kwargs
+        )
+        page_iterator.parsable_factory = parsable_factory
+        page_iterator.pages_processed = checkpoint.pages_processed
+        for name, values in checkpoint.headers.items():
+            page_iterator.headers.add(name, values)
+        if request_options:
+            page_iterator.set_request_options(request_options)
+        if checkpoint.page_link:
+            page = page_iterator._to_page(await page_iterator.fetch_next_page())
+            page_iterator.current_page = page
+            page_iterator._page_link = checkpoint.page_link
+            page_iterator.pause_index = checkpoint.pause_index
+        return page_iterator
+
+    def _page_processed(self) -> None:
+        self.pages_processed += 1
+        if self.pages_processed % self.checkpoint_interval == 0:
+            self._save_checkpoint()
+
+    def _save_checkpoint(self) -> None:
+        if self.checkpoint_store is None or self.checkpoint_key is None:
+            return
+        if not self._page_link and self.pause_index < len(self.current_page.value or []):
+            # The first page cannot be fetched again.
+            return
+        self._checkpoint_writer.submit(
+            functools.partial(
+                self.checkpoint_store.save, self.checkpoint_key,
+                self.get_checkpoint().to_dict()
+            )
+        )
+
+    async def _save_final_checkpoint(self) -> None:
+        # Leave the position the iteration stopped at in the store before returning.
+        self._save_checkpoint()
+        await self._checkpoint_writer.flush()
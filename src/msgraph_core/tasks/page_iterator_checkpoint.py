@@ -0,0 +1,43 @@
+"""
+The persisted state of a resumable page iteration.
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+
+@dataclass
+class PageIteratorCheckpoint:
+    """
+    Everything needed to continue iterating over a paged collection from another
+    process.
+
+    Attributes:
+        page_link (Optional[str]): The URL of the page to continue from, or None once
+            the last page has been processed.
+        pause_index (int): The number of items of that page already processed.
+        delta_link (Optional[str]): The @odata.deltaLink of a delta query, once its
+            last page has been reached.
+        headers (dict[str, list[str]]): The headers sent with the page requests.
+        pages_processed (int): The number of pages processed before the checkpoint.
+    """
+    page_link: Optional[str]
+    pause_index: int = 0
+    delta_link: Optional[str] = None
+    headers: dict[str, list[str]] = field(default_factory=dict)
+    pages_processed: int = 0
+
+    @property
+    def is_complete(self) -> bool:
+        """
+        Whether every page has been processed.
+        """
+        return not self.page_link
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(value: dict[str, Any]) -> PageIteratorCheckpoint:
+        return PageIteratorCheckpoint(**value)
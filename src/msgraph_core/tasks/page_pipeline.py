@@ -0,0 +1,122 @@
+"""
+Processing of the items of a paged collection by a pool of workers.
+
+PageIterator.iterate calls its callback on the event loop, between the page fetches,
+so CPU heavy processing of the items holds up the listing. A PagePipeline passes the
+items through a bounded queue to several workers instead: async handlers run
+concurrently on the event loop and plain functions run in an executor, e.g. a
+ProcessPoolExecutor to use several cores. The listing pauses while the queue is full.
+"""
+import asyncio
+import inspect
+from collections.abc import AsyncIterable, Callable
+from concurrent.futures import Executor
+from typing import Any, Optional
+
+_DONE = object()
+
+
+class PagePipeline:
+    """
+    Applies a handler to every item of an async iterable, e.g. a PageIterator, with a
+    pool of workers fed through a bounded queue.
+
+    Items are handled in no particular order. A handler returning False stops the
+    pipeline: no more items are fetched and the queued ones are dropped, while the
+    items being handled complete. The first exception raised by the handler stops the
+    pipeline the same way and is raised by run.
+
+    The items are taken from the source when they are queued, so a checkpointed
+    PageIterator counts the queued items as processed.
+    """
+
+    def __init__(
+        self,
+        source: AsyncIterable[Any],
+        handler: Callable[[Any], Any],
+        *,
+        workers: int = 4,
+        max_queued_items: int = 100,
+        executor: Optional[Executor] = None,
+    ) -> None:
+        """
+        Args:
+            source (AsyncIterable[Any]): The items, e.g. a PageIterator.
+            handler (Callable[[Any], Any]): Called with each item. A coroutine function
+                runs on the event loop, any other function in the executor. It must be
+                picklable, e.g. a module level function, for a ProcessPoolExecutor.
+            workers (int): The items handled at once.
+            max_queued_items (int): The items fetched ahead of the workers.
+            executor (Optional[Executor]): Where plain functions run. Defaults to the
+                thread pool of the event loop.
+        """
+        if workers < 1:
+            raise ValueError('workers must be at least 1.')
+        if max_queued_items < 1:
+            raise ValueError('max_queued_items must be at least 1.')
+        self.source = source
+        self.handler = handler
+        self.workers = workers
+        self.max_queued_items = max_queued_items
+        self.executor = executor
+        self.processed = 0
+        self._is_coroutine = inspect.iscoroutinefunction(handler)
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._stopped = False
+        self._error: Optional[BaseException] = None
+
+    async def run(self) -> int:
+        """
+        Handles the items until the source is exhausted or the pipeline stops.
+        Returns:
+            int: The number of items handled.
+        """
+        self.processed = 0
+        self._queue = asyncio.Queue(maxsize=self.max_queued_items)
+        self._stopped = False
+        self._error = None
+        workers = [asyncio.ensure_future(self._work()) for _ in range(self.workers)]
+        items = aiter(self.source)
+        try:
+            async for item in items:
+                if self._stopped:
+                    break
+                await self._queue.put(item)
+            for _ in workers:
+                await self._queue.put(_DONE)
+            await asyncio.gather(*workers)
+        finally:
+            for worker in workers:
+                worker.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            aclose = getattr(items, 'aclose', None)
+            if aclose is not None:
+                await aclose()
+        if self._error is not None:
+            raise self._error
+        return self.processed
+
+    async def _work(self) -> None:
+        while True:
+            item = await self._queue.get()
+            if item is _DONE:
+                return
+            # Once stopped, the queue is drained so the source is never blocked on it.
+            if self._stopped:
+                continue
+            try:
+                result = await self._handle(item)
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                if self._error is None:
+                    self._error = error
+                self._stopped = True
+                continue
+            self.processed += 1
+            if result is False:
+                self._stopped = True
+
+    async def _handle(self, item: Any) -> Any:
+        if self._is_coroutine:
+            return await self.handler(item)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self.handler, item)
@@ -0,0 +1,169 @@
+"""
+Incremental parsing of the JSON document of a page of a collection.
+
+The items of the collection are decoded one by one as the bytes of the response
+arrive, so the memory needed to process a page scales with its largest item rather
+than with the whole page.
+"""
+import codecs
+import json
+import re
+from typing import Any, Optional
+
+_WHITESPACE = re.compile(r'[ \t\n\r]*')
+# The size under which an incomplete value is decoded again whenever data arrives.
+RETRY_THRESHOLD = 64 * 1024
+
+_OBJECT_START = 'object_start'
+_FIRST_KEY = 'first_key'
+_KEY = 'key'
+_COLON = 'colon'
+_VALUE = 'value'
+_AFTER_VALUE = 'after_value'
+_FIRST_ITEM = 'first_item'
+_ITEM = 'item'
+_AFTER_ITEM = 'after_item'
+_DONE = 'done'
+
+
+class JsonPageStreamParser:
+    """
+    Parses a page such as {"@odata.nextLink": "...", "value": [...]} fed in chunks of
+    bytes.
+
+    The items of the collection property are returned as soon as each of them is
+    complete. The other top level properties, e.g. @odata.nextLink or @odata.deltaLink,
+    are collected in properties, which is complete once the parser has been closed.
+    """
+
+    def __init__(self, collection_property: str = 'value') -> None:
+        """
+        Args:
+            collection_property (str): The name of the array holding the items.
+        """
+        self.collection_property = collection_property
+        self.properties: dict[str, Any] = {}
+        self.item_count = 0
+        self._decoder = json.JSONDecoder()
+        self._text_decoder = codecs.getincrementaldecoder('utf-8')()
+        self._buffer = ''
+        self._state = _OBJECT_START
+        self._key: Optional[str] = None
+        # The buffered length of an incomplete value when it last failed to decode.
+        self._incomplete_length = 0
+
+    def feed(self, data: bytes) -> list[Any]:
+        """
+        Adds the next bytes of the document.
+        Args:
+            data (bytes): The bytes.
+        Returns:
+            list[Any]: The items completed by these bytes.
+        """
+        self._buffer += self._text_decoder.decode(data)
+        return self._parse(final=False)
+
+    def close(self) -> list[Any]:
+        """
+        Ends the document.
+        Returns:
+            list[Any]: The items not returned yet.
+        Raises:
+            ValueError: If the document is not a complete JSON object.
+        """
+        self._buffer += self._text_decoder.decode(b'', final=True)
+        items = self._parse(final=True)
+        if self._state != _DONE:
+            raise ValueError('The page ended before its JSON document was complete.')
+        return items
+
+    def _parse(self, final: bool) -> list[Any]:  # pylint: disable=too-many-branches,too-many-statements
+        items: list[Any] = []
+        buffer = self._buffer
+        position = 0
+        while True:
+            position = _WHITESPACE.match(buffer, position).end()  # type: ignore[union-attr]
+            if position == len(buffer):
+                break
+            char = buffer[position]
+            state = self._state
+            if state == _DONE:
+                raise ValueError('Unexpected data after the JSON document of the page.')
+            if state == _OBJECT_START:
+                self._expect(char, '{')
+                position += 1
+                self._state = _FIRST_KEY
+            elif state == _FIRST_KEY and char == '}':
+                position += 1
+                self._state = _DONE
+            elif state in (_FIRST_KEY, _KEY):
+                self._expect(char, '"')
+                decoded = self._decode(buffer, position, final)
+                if decoded is None:
+                    break
+                self._key, position = decoded
+                self._state = _COLON
+            elif state == _COLON:
+                self._expect(char, ':')
+                position += 1
+                self._state = _VALUE
+            elif state == _VALUE and self._key == self.collection_property and char == '[':
+                position += 1
+                self._state = _FIRST_ITEM
+            elif state == _VALUE:
+                decoded = self._decode(buffer, position, final)
+                if decoded is None:
+                    break
+                self.properties[self._key], position = decoded  # type: ignore[index]
+                self._state = _AFTER_VALUE
+            elif state == _AFTER_VALUE:
+                self._expect(char, ',}')
+                position += 1
+                self._state = _KEY if char == ',' else _DONE
+            elif state == _FIRST_ITEM and char == ']':
+                position += 1
+                self._state = _AFTER_VALUE
+            elif state in (_FIRST_ITEM, _ITEM):
+                decoded = self._decode(buffer, position, final)
+                if decoded is None:
+                    break
+                item, position = decoded
+                items.append(item)
+                self.item_count += 1
+                self._state = _AFTER_ITEM
+            else:
+                self._expect(char, ',]')
+                position += 1
+                self._state = _ITEM if char == ',' else _AFTER_VALUE
+        self._buffer = buffer[position:]
+        return items
+
+    def _decode(self, buffer: str, position: int, final: bool) -> Optional[tuple[Any, int]]:
+        """
+        Decodes the value starting at position, or returns None if more data is needed.
+        """
+        available = len(buffer) - position
+        # Retrying a large value on every chunk would be quadratic: wait until the
+        # buffered data has doubled since the last attempt.
+        if (
+            not final and self._incomplete_length > RETRY_THRESHOLD
+            and available < 2 * self._incomplete_length
+        ):
+            return None
+        try:
+            value, end = self._decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as error:
+            if final:
+                raise ValueError('The page is not a valid JSON document.') from error
+            self._incomplete_length = available
+            return None
+        if end == len(buffer) and not final:
+            # A number at the end of the buffer may continue in the next chunk.
+            return None
+        self._incomplete_length = 0
+        return value, end
+
+    @staticmethod
+    def _expect(char: str, expected: str) -> None:
+        if char not in expected:
+            raise ValueError(f"Unexpected character {char!r} in the JSON document of the page.")
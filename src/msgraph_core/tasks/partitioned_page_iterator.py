@@ -0,0 +1,201 @@
+"""
+Iterates over a collection by fetching windows of it concurrently.
+
+Following @odata.nextLink fetches one page per round trip. Collections that honour
+$top and $skip, such as messages or the children of a drive item, can instead be split
+into windows that are fetched in parallel, so a listing of N pages takes about
+N / max_concurrency round trips.
+"""
+import asyncio
+from collections import deque
+from collections.abc import AsyncIterator
+from typing import Any, Optional, Type
+from urllib.parse import urlsplit, urlunsplit
+
+from kiota_abstractions.headers_collection import HeadersCollection
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_adapter import RequestAdapter
+from kiota_abstractions.request_information import RequestInformation
+from kiota_abstractions.serialization import ParsableFactory
+
+from .page_iterator import PageIterator
+
+# The query options kept when the collection is counted.
+COUNT_QUERY_OPTIONS = ('$filter', '$search')
+
+
+class PartitionedPageIterator:
+    """
+    Lists a collection that supports $top and $skip as windows of page_size items
+    fetched concurrently.
+
+    The number of windows is planned from the size of the collection, given or read
+    from its $count segment. Items are yielded in the order of the collection, or
+    as their windows arrive when ordered is False. If the last planned window is
+    full, because items were added since the collection was counted, the following
+    windows are fetched one after the other until a window is not full.
+
+    Windows only line up with the collection when it has a stable order, e.g. with
+    $orderby. Directory resources such as users and groups do not support $skip, and
+    like any collection that ignores it must be listed with a PageIterator.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        request_adapter: RequestAdapter,
+        url: str,
+        parsable_factory: ParsableFactory,
+        *,
+        page_size: int = 100,
+        total_count: Optional[int] = None,
+        max_concurrency: int = 8,
+        ordered: bool = True,
+        error_mapping: Optional[dict[str, Type[ParsableFactory]]] = None,
+    ) -> None:
+        """
+        Args:
+            request_adapter (RequestAdapter): The adapter used to fetch the windows.
+            url (str): The URL of the collection, with any query options but $top and
+                $skip, e.g.
+                https://graph.microsoft.com/v1.0/me/messages?$orderby=receivedDateTime.
+            parsable_factory (ParsableFactory): Factory for the pages of the collection.
+            page_size (int): The items per window. Windows larger than the page size of
+                the service are completed by following their nextLink.
+            total_count (Optional[int]): The size of the collection. Read from its
+                $count segment when omitted, so it is required for collections without
+                one, such as the children of a drive item.
+            max_concurrency (int): The windows fetched at once.
+            ordered (bool): Whether items are yielded in the order of the collection
+                rather than as their windows arrive.
+            error_mapping (Optional[dict[str, Type[ParsableFactory]]]): The error
+                mapping of the requests.
+        """
+        if page_size < 1:
+            raise ValueError('page_size must be at least 1.')
+        if max_concurrency < 1:
+            raise ValueError('max_concurrency must be at least 1.')
+        if total_count is not None and total_count < 0:
+            raise ValueError('total_count cannot be negative.')
+        self.request_adapter = request_adapter
+        self.url = url
+        self.parsable_factory = parsable_factory
+        self.page_size = page_size
+        self.total_count = total_count
+        self.max_concurrency = max_concurrency
+        self.ordered = ordered
+        self.error_mapping = error_mapping if error_mapping else {}
+        self.headers: HeadersCollection = HeadersCollection()
+
+    def get_window_url(self, index: int) -> str:
+        """
+        Gets the URL of a window of the collection.
+        Args:
+            index (int): The position of the window.
+        Returns:
+            str: The URL, with $top and $skip set.
+        """
+        return self._with_query(
+            self.url,
+            exclude=('$top', '$skip'),
+            extra=[f'$top={self.page_size}', f'$skip={index * self.page_size}']
+        )
+
+    async def get_count(self) -> int:
+        """
+        Reads the size of the collection from its $count segment, e.g.
+        /me/messages/$count.
+        Returns:
+            int: The number of items.
+        """
+        parts = urlsplit(self.url)
+        url = urlunsplit(parts._replace(path=parts.path.rstrip('/') + '/$count', query=''))
+        request_info = self._create_request(
+            self._with_query(url, include=COUNT_QUERY_OPTIONS, query=parts.query)
+        )
+        count: Optional[int] = await self.request_adapter.send_primitive_async(
+            request_info, 'int', self.error_mapping
+        )
+        return count or 0
+
+    def __aiter__(self) -> AsyncIterator[Any]:
+        return self._iterate()
+
+    async def _iterate(self) -> AsyncIterator[Any]:
+        total_count = self.total_count
+        if total_count is None:
+            total_count = await self.get_count()
+        planned = -(-total_count // self.page_size)
+        pending: deque[asyncio.Task] = deque()
+        next_index = 0
+        last_full = planned == 0
+        try:
+            while True:
+                while len(pending) < self.max_concurrency and next_index < planned:
+                    pending.append(asyncio.ensure_future(self._fetch_window(next_index)))
+                    next_index += 1
+                if not pending:
+                    if not last_full:
+                        return
+                    # The collection grew since it was counted.
+                    planned += 1
+                    continue
+                if self.ordered:
+                    task = pending.popleft()
+                    index, items = await task
+                else:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    task = done.pop()
+                    pending.remove(task)
+                    index, items = task.result()
+                if index == planned - 1:
+                    last_full = len(items) == self.page_size
+                for item in items:
+                    yield item
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _fetch_window(self, index: int) -> tuple[int, list[Any]]:
+        response = await self.request_adapter.send_async(
+            self._create_request(self.get_window_url(index)), self.parsable_factory,
+            self.error_mapping
+        )
+        if response is None:
+            return index, []
+        page_iterator = PageIterator(
+            response, self.request_adapter, error_mapping=self.error_mapping
+        )
+        page_iterator.headers = self.headers
+        items: list[Any] = []
+        async for page in page_iterator.pages():
+            items.extend(page.value or [])
+            if len(items) >= self.page_size:
+                break
+        return index, items[:self.page_size]
+
+    def _create_request(self, url: str) -> RequestInformation:
+        request_info = RequestInformation()
+        request_info.http_method = Method.GET
+        request_info.url = url
+        request_info.headers.add_all(self.headers)
+        return request_info
+
+    @staticmethod
+    def _with_query(
+        url: str,
+        *,
+        query: Optional[str] = None,
+        include: Optional[tuple[str, ...]] = None,
+        exclude: tuple[str, ...] = (),
+        extra: Optional[list[str]] = None
+    ) -> str:
+        parts = urlsplit(url)
+        options = []
+        for option in (parts.query if query is None else query).split('&'):
+            name = option.split('=', 1)[0]
+            if not option or name in exclude or (include is not None and name not in include):
+                continue
+            options.append(option)
+        options.extend(extra or [])
+        return urlunsplit(parts._replace(query='&'.join(options)))
@@ -0,0 +1,64 @@
+"""
+The persisted state of a resumable large file upload.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import asdict, dataclass, field
+from typing import Any, Optional
+
+from ._byte_ranges import ByteRange, format_ranges, parse_ranges, subtract_range
+from .upload_source import StreamUploadSource, UploadSource
+
+
+@dataclass
+class UploadCheckpoint:
+    """
+    Everything needed to continue an upload session from another process.
+
+    Attributes:
+        upload_url (str): The URL of the upload session.
+        file_size (int): The total size of the file being uploaded.
+        expiration_date_time (Optional[str]): When the session expires, in ISO 8601.
+        acknowledged_ranges (list[str]): The byte ranges the service has acknowledged.
+        file_identity (dict[str, Any]): Properties identifying the file, used to make
+            sure a checkpoint is only resumed with the same content.
+    """
+    upload_url: str
+    file_size: int
+    expiration_date_time: Optional[str] = None
+    acknowledged_ranges: list[str] = field(default_factory=list)
+    file_identity: dict[str, Any] = field(default_factory=dict)
+
+    @staticmethod
+    def get_file_identity(source: UploadSource) -> dict[str, Any]:
+        """
+        Gets the properties identifying the content of an upload source: its size and,
+        for files, their path and modification time.
+        """
+        identity: dict[str, Any] = {'size': source.size}
+        stream = source.stream if isinstance(source, StreamUploadSource) else None
+        name = getattr(stream, 'name', None)
+        if isinstance(name, str):
+            identity['name'] = os.path.abspath(name)
+        try:
+            identity['mtime_ns'] = os.fstat(stream.fileno()).st_mtime_ns  # type: ignore
+        except (AttributeError, OSError, ValueError):
+            pass
+        return identity
+
+    def get_next_expected_ranges(self) -> list[str]:
+        """
+        Gets the byte ranges that still have to be uploaded.
+        """
+        missing: list[ByteRange] = [(0, self.file_size - 1)] if self.file_size else []
+        for start, end in parse_ranges(self.acknowledged_ranges, self.file_size):
+            missing = subtract_range(missing, start, end)
+        return format_ranges(missing)
+
+    def to_dict(self) -> dict[str, Any]:
+        return asdict(self)
+
+    @staticmethod
+    def from_dict(value: dict[str, Any]) -> UploadCheckpoint:
+        return UploadCheckpoint(**value)
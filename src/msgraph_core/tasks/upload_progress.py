@@ -0,0 +1,113 @@
+"""
+Structured progress events for the LargeFileUploadTask.
+
+Events are delivered to UploadObserver instances registered on a task. The
+UploadEventStream observer exposes them as an async iterator.
+"""
+import asyncio
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+from enum import Enum
+from typing import Optional
+
+
+class UploadEventType(str, Enum):
+    """Enumerated list of the events raised during an upload"""
+    CHUNK_ACKNOWLEDGED = 'chunk_acknowledged'
+    CHUNK_RETRIED = 'chunk_retried'
+    COMPLETED = 'completed'
+    FAILED = 'failed'
+
+    def __str__(self):
+        return self.value
+
+
+@dataclass
+class UploadProgressEvent:
+    """
+    A snapshot of the progress of an upload.
+
+    Attributes:
+        event_type (UploadEventType): What happened.
+        total_bytes (int): The size of the file.
+        bytes_acknowledged (int): The bytes the service has acknowledged, including
+            the ones acknowledged before a resumed upload started.
+        elapsed_seconds (float): The time since the upload started.
+        average_throughput (float): The bytes sent per second since the upload started.
+        in_flight (int): The chunks being read, waiting for a limiter or being sent.
+        retries (int): The chunk requests retried so far.
+        chunk_range (Optional[tuple[int, int]]): The first and last byte of the chunk
+            the event is about.
+        chunk_latency (Optional[float]): How long the chunk request took, in seconds.
+        chunk_throughput (Optional[float]): The bytes per second of the chunk request.
+        retry_delay (Optional[float]): The seconds waited before a retry.
+        error (Optional[BaseException]): The error that caused a retry or a failure.
+    """
+    event_type: UploadEventType
+    total_bytes: int
+    bytes_acknowledged: int
+    elapsed_seconds: float
+    average_throughput: float
+    in_flight: int
+    retries: int
+    chunk_range: Optional[tuple[int, int]] = None
+    chunk_latency: Optional[float] = None
+    chunk_throughput: Optional[float] = None
+    retry_delay: Optional[float] = None
+    error: Optional[BaseException] = None
+
+    @property
+    def is_final(self) -> bool:
+        """
+        Whether the upload has ended with this event.
+        """
+        return self.event_type in (UploadEventType.COMPLETED, UploadEventType.FAILED)
+
+
+class UploadObserver:
+    """
+    Receives the progress events of the uploads it is registered with.
+    """
+
+    def on_event(self, event: UploadProgressEvent) -> None:
+        """
+        Called for every event. It runs on the event loop, so it must not block.
+        Args:
+            event (UploadProgressEvent): The event.
+        """
+
+
+class UploadEventStream(UploadObserver):
+    """
+    Queues the events of an upload so they can be consumed with async for.
+
+    Iteration ends after the event that completes or fails the upload. When the
+    consumer falls more than max_events behind, the oldest events are dropped.
+    """
+
+    def __init__(self, max_events: int = 1000) -> None:
+        """
+        Args:
+            max_events (int): The most events kept while waiting to be consumed.
+        """
+        if max_events < 1:
+            raise ValueError('max_events must be at least 1.')
+        self._queue: asyncio.Queue[UploadProgressEvent] = asyncio.Queue(max_events)
+        self.dropped_events = 0
+        self._finished = False
+
+    def on_event(self, event: UploadProgressEvent) -> None:
+        if self._queue.full():
+            self._queue.get_nowait()
+            self.dropped_events += 1
+        self._queue.put_nowait(event)
+
+    def __aiter__(self) -> AsyncIterator[UploadProgressEvent]:
+        return self
+
+    async def __anext__(self) -> UploadProgressEvent:
+        if self._finished:
+            raise StopAsyncIteration
+        event = await self._queue.get()
+        self._finished = event.is_final
+        return event
@@ -0,0 +1,125 @@
+"""
+Chunk level retries for the LargeFileUploadTask.
+"""
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Optional
+
+import httpx
+
+RETRY_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+THROTTLED_STATUS_CODES = frozenset({429, 503})
+
+
+@dataclass
+class UploadStatistics:
+    """
+    Counters describing the requests made by an upload.
+
+    Attributes:
+        chunks_sent (int): Chunk requests that were acknowledged.
+        bytes_sent (int): Bytes in acknowledged chunk requests.
+        failed_requests (int): Chunk requests that failed, including retried ones.
+        retries (int): Chunk requests that were retried.
+        throttled (int): Failed requests the service answered with 429 or 503.
+        retries_exhausted (int): Chunks that failed after the last allowed retry.
+    """
+    chunks_sent: int = 0
+    bytes_sent: int = 0
+    failed_requests: int = 0
+    retries: int = 0
+    throttled: int = 0
+    retries_exhausted: int = 0
+
+    @property
+    def retry_rate(self) -> float:
+        """
+        The share of chunk requests that were retries.
+        """
+        attempts = self.chunks_sent + self.failed_requests
+        return self.retries / attempts if attempts else 0.0
+
+
+class ChunkRetryPolicy:
+    """
+    Decides whether a failed chunk request is retried and how long to wait first.
+
+    Transport errors and responses with a transient status code are retried with an
+    exponential backoff. A Retry-After header sent by the service takes precedence over
+    the backoff.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_delay: float = 180.0,
+        retry_status_codes: frozenset[int] = RETRY_STATUS_CODES,
+    ) -> None:
+        """
+        Args:
+            max_retries (int): The number of times a chunk is retried.
+            backoff_factor (float): The delay before the first retry, in seconds. It
+                doubles with every attempt.
+            max_delay (float): The longest delay between two attempts, in seconds.
+            retry_status_codes (frozenset[int]): The status codes that are retried.
+        """
+        if max_retries < 0 or backoff_factor < 0 or max_delay < 0:
+            raise ValueError("max_retries, backoff_factor and max_delay cannot be negative.")
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_delay = max_delay
+        self.retry_status_codes = retry_status_codes
+
+    @staticmethod
+    def get_status_code(error: BaseException) -> Optional[int]:
+        return getattr(error, 'response_status_code', None)
+
+    def should_retry(self, error: BaseException, attempt: int) -> bool:
+        """
+        Checks whether a chunk is sent again.
+        Args:
+            error (BaseException): The error raised by the last attempt.
+            attempt (int): The number of the retry that would be made, starting at 1.
+        """
+        if attempt > self.max_retries:
+            return False
+        status_code = self.get_status_code(error)
+        if status_code is not None:
+            return status_code in self.retry_status_codes
+        return isinstance(error, (httpx.TransportError, ConnectionError, asyncio.TimeoutError))
+
+    def get_delay(self, error: BaseException, attempt: int) -> float:
+        """
+        Gets the number of seconds to wait before a retry.
+        Args:
+            error (BaseException): The error raised by the last attempt.
+            attempt (int): The number of the retry, starting at 1.
+        """
+        retry_after = self.get_retry_after(error)
+        if retry_after is None:
+            retry_after = self.backoff_factor * 2**(attempt - 1)
+        return min(max(retry_after, 0.0), self.max_delay)
+
+    @staticmethod
+    def get_retry_after(error: BaseException) -> Optional[float]:
+        """
+        Reads the Retry-After header of a failed response, in seconds.
+        """
+        headers = getattr(error, 'response_headers', None) or {}
+        value = next(
+            (value for name, value in headers.items() if name.lower() == 'retry-after'), None
+        )
+        if value is None:
+            return None
+        try:
+            return float(value)
+        except ValueError:
+            pass
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        return (retry_at - datetime.now(timezone.utc)).total_seconds()
@@ -0,0 +1,178 @@
+"""
+Uploads many files at once within global limits.
+"""
+import asyncio
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from io import BytesIO
+from typing import Any, Optional, Union
+
+from kiota_abstractions.request_adapter import RequestAdapter
+from kiota_abstractions.serialization import Parsable, ParsableFactory
+
+from msgraph_core.models import UploadResult
+
+from ._worker_pool import run_workers
+from .bandwidth_limiter import BandwidthLimiter
+from .large_file_upload import LargeFileUploadTask
+from .upload_source import UploadSource
+
+
+@dataclass
+class UploadSchedulerProgress:
+    """
+    The aggregate progress of the files handled by an UploadScheduler.
+
+    Attributes:
+        total_files (int): The number of files to upload.
+        completed_files (int): The files whose upload succeeded.
+        failed_files (int): The files whose upload failed.
+        total_bytes (int): The size of all the files.
+        uploaded_bytes (int): The bytes acknowledged by the service so far.
+    """
+    total_files: int = 0
+    completed_files: int = 0
+    failed_files: int = 0
+    total_bytes: int = 0
+    uploaded_bytes: int = 0
+
+
+class UploadScheduler:
+    """
+    Runs a LargeFileUploadTask for each of many files, sharing a limit on the chunk
+    requests in flight and on the bytes sent per second across all of them.
+
+    Files are started smallest first, so small files are not held up behind large
+    ones, and every task keeps several chunks in flight so a fast link stays busy
+    even when only a few large files remain.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        request_adapter: RequestAdapter,
+        parsable_factory: Optional[ParsableFactory] = None,
+        *,
+        max_concurrent_chunks: int = 8,
+        max_concurrent_files: Optional[int] = None,
+        max_bytes_per_second: Optional[float] = None,
+        on_progress: Optional[Callable[[UploadSchedulerProgress], None]] = None,
+        **task_options: Any
+    ) -> None:
+        """
+        Args:
+            request_adapter (RequestAdapter): The adapter used to send the chunks.
+            parsable_factory (Optional[ParsableFactory]): Factory for the uploaded items.
+            max_concurrent_chunks (int): The chunk requests in flight across all files.
+            max_concurrent_files (Optional[int]): The files uploaded at once. Defaults to
+                max_concurrent_chunks.
+            max_bytes_per_second (Optional[float]): The combined upload rate. Unlimited
+                when omitted.
+            on_progress (Optional[Callable[[UploadSchedulerProgress], None]]): Called
+                whenever a chunk is acknowledged or a file completes.
+            task_options: Keyword arguments passed to every LargeFileUploadTask, such as
+                max_chunk_size or retry_policy. max_concurrency defaults to
+                max_concurrent_chunks for seekable sources.
+        """
+        if max_concurrent_chunks < 1:
+            raise ValueError('max_concurrent_chunks must be at least 1.')
+        if max_concurrent_files is not None and max_concurrent_files < 1:
+            raise ValueError('max_concurrent_files must be at least 1.')
+        self.request_adapter = request_adapter
+        self.factory = parsable_factory
+        self.max_concurrent_chunks = max_concurrent_chunks
+        self.max_concurrent_files = max_concurrent_files or max_concurrent_chunks
+        self.bandwidth_limiter = BandwidthLimiter(
+            max_bytes_per_second
+        ) if max_bytes_per_second else None
+        self.on_progress = on_progress
+        self.task_options = task_options
+        self.progress = UploadSchedulerProgress()
+
+    def create_task(
+        self, upload_session: Parsable, stream: Union[BytesIO, UploadSource],
+        chunk_limiter: asyncio.Semaphore
+    ) -> LargeFileUploadTask:
+        """
+        Creates the task uploading a single file within the scheduler's limits.
+        """
+        options = dict(self.task_options)
+        if 'max_concurrency' not in options and (
+            not isinstance(stream, UploadSource) or stream.seekable
+        ):
+            options['max_concurrency'] = self.max_concurrent_chunks
+        return LargeFileUploadTask(
+            upload_session,
+            self.request_adapter,
+            stream,
+            self.factory,
+            chunk_limiter=chunk_limiter,
+            bandwidth_limiter=self.bandwidth_limiter,
+            **options
+        )
+
+    async def upload(
+        self,
+        uploads: Iterable[tuple[Parsable, Union[BytesIO, UploadSource]]],
+        return_exceptions: bool = False
+    ) -> list[Union[UploadResult, BaseException]]:
+        """
+        Uploads the files.
+        Args:
+            uploads (Iterable[tuple[Parsable, Union[BytesIO, UploadSource]]]): The upload
+                session and content of each file.
+            return_exceptions (bool): Whether a failed upload is returned in place of its
+                result. Otherwise the first failure cancels the remaining uploads and
+                is raised.
+        Returns:
+            list[Union[UploadResult, BaseException]]: The result of each upload, in the
+                order the files were given.
+        """
+        chunk_limiter = asyncio.Semaphore(self.max_concurrent_chunks)
+        tasks = [
+            self.create_task(upload_session, stream, chunk_limiter)
+            for upload_session, stream in uploads
+        ]
+        self.progress = UploadSchedulerProgress(
+            total_files=len(tasks), total_bytes=sum(task.file_size for task in tasks)
+        )
+        results: list[Any] = [None] * len(tasks)
+
+        async def run_upload(index: int) -> None:
+            try:
+                results[index] = await self._upload_file(tasks[index])
+            except Exception as error:  # pylint: disable=broad-except
+                if not return_exceptions:
+                    raise
+                results[index] = error
+
+        await run_workers(
+            sorted(range(len(tasks)), key=lambda index: tasks[index].file_size), run_upload,
+            self.max_concurrent_files
+        )
+        return results
+
+    async def _upload_file(self, task: LargeFileUploadTask) -> UploadResult:
+        # The acknowledged bytes of the task already counted. A session renewed with a new
+        # upload URL starts over, so they can go down as well as up.
+        counted = 0
+
+        def on_chunk_upload_complete(chunk_range: list[int]) -> None:
+            nonlocal counted
+            self.progress.uploaded_bytes += task.bytes_acknowledged - counted
+            counted = task.bytes_acknowledged
+            self._notify_progress()
+
+        try:
+            result = await task.upload(on_chunk_upload_complete)
+        except Exception:
+            self.progress.failed_files += 1
+            self._notify_progress()
+            raise
+        self.progress.uploaded_bytes += task.file_size - counted
+        self.progress.completed_files += 1
+        self._notify_progress()
+        return result
+
+    def _notify_progress(self) -> None:
+        if self.on_progress is not None:
+            self.on_progress(self.progress)
@@ -0,0 +1,286 @@
+"""
+An in-process emulator of the Microsoft Graph upload session protocol.
+
+The emulator serves upload sessions through an httpx MockTransport, so the
+LargeFileUploadTask and the UploadScheduler can be exercised and benchmarked offline
+through the regular HttpxRequestAdapter. It validates Content-Range headers, reports
+nextExpectedRanges, extends and enforces session expiry, and can inject throttling
+and server errors as well as latency and a bandwidth limit.
+"""
+import asyncio
+import json
+import random
+import uuid
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Optional
+
+import httpx
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from kiota_abstractions.serialization import ParseNodeFactory, ParseNodeFactoryRegistry
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+
+from msgraph_core.models import LargeFileUploadSession
+
+from ._byte_ranges import ByteRange, format_ranges, intersect_ranges, subtract_range
+from .bandwidth_limiter import BandwidthLimiter
+from .chunk_sizer import CHUNK_SIZE_MULTIPLE, MAX_CHUNK_SIZE
+from .content_hash import HASH_ALGORITHMS, ContentHasher
+
+EMULATOR_BASE_URL = 'https://upload.emulator.local/sessions/'
+
+
+@dataclass
+class EmulatedUploadSession:
+    """
+    The state the emulator keeps for an upload session.
+
+    Attributes:
+        name (str): The name of the file being uploaded.
+        file_size (int): The declared size of the file.
+        expiration_date_time (datetime): When the session expires.
+        missing (list[ByteRange]): The byte ranges not received yet.
+        content (Optional[bytearray]): The bytes received, if content is stored.
+        requests (list[ByteRange]): The ranges of every chunk received.
+        item (Optional[dict[str, Any]]): The driveItem created once the upload completed.
+    """
+    name: str
+    file_size: int
+    expiration_date_time: datetime
+    missing: list[ByteRange]
+    content: Optional[bytearray] = None
+    requests: list[ByteRange] = field(default_factory=list)
+    item: Optional[dict[str, Any]] = None
+
+
+class UploadSessionEmulator:
+    """
+    Emulates upload sessions created with createUploadSession.
+
+    Chunks are PUT to the session URL with a Content-Range header. Every chunk but the
+    last must be a multiple of 320 KiB unless enforce_chunk_alignment is False, chunks
+    that overlap bytes already received are rejected with 416, and the response lists
+    the nextExpectedRanges until the last byte arrives, when the driveItem is returned.
+    A GET on the session URL returns its status and a DELETE cancels it.
+    """
+
+    def __init__(  # pylint: disable=too-many-arguments
+        self,
+        *,
+        latency: float = 0.0,
+        bytes_per_second: Optional[float] = None,
+        session_lifetime: timedelta = timedelta(minutes=15),
+        fault_rate: float = 0.0,
+        fault_status_codes: Iterable[int] = (503, ),
+        retry_after: Optional[float] = None,
+        store_content: bool = True,
+        enforce_chunk_alignment: bool = True,
+        seed: Optional[int] = None,
+    ) -> None:
+        """
+        Args:
+            latency (float): Seconds added to every request.
+            bytes_per_second (Optional[float]): The bandwidth of the emulated link, shared
+                by all requests. Unlimited when omitted.
+            session_lifetime (timedelta): How long a session stays valid after it is
+                created or receives a chunk.
+            fault_rate (float): The probability that a chunk request fails.
+            fault_status_codes (Iterable[int]): The status codes of injected failures.
+            retry_after (Optional[float]): The Retry-After value of injected 429 and 503
+                responses, in seconds.
+            store_content (bool): Whether the bytes received are kept, so the content and
+                its hashes can be checked. Disable it to benchmark large files.
+            enforce_chunk_alignment (bool): Whether chunks other than the last must be
+                multiples of 320 KiB.
+            seed (Optional[int]): Seeds the random faults.
+        """
+        self.latency = latency
+        self.link = BandwidthLimiter(bytes_per_second) if bytes_per_second else None
+        self.session_lifetime = session_lifetime
+        self.fault_rate = fault_rate
+        self.fault_status_codes = tuple(fault_status_codes)
+        self.retry_after = retry_after
+        self.store_content = store_content
+        self.enforce_chunk_alignment = enforce_chunk_alignment
+        self.sessions: dict[str, EmulatedUploadSession] = {}
+        self.faults_injected = 0
+        self._scheduled_faults: list[int] = []
+        self._random = random.Random(seed)
+
+    def create_session(self, file_size: int, name: str = 'file.bin') -> LargeFileUploadSession:
+        """
+        Creates an upload session, like a createUploadSession request would.
+        Args:
+            file_size (int): The size of the file to upload.
+            name (str): The name of the file.
+        Returns:
+            LargeFileUploadSession: The session to pass to the LargeFileUploadTask.
+        """
+        upload_url = EMULATOR_BASE_URL + uuid.uuid4().hex
+        expiry = datetime.now(timezone.utc) + self.session_lifetime
+        self.sessions[upload_url] = EmulatedUploadSession(
+            name=name,
+            file_size=file_size,
+            expiration_date_time=expiry,
+            missing=[(0, file_size - 1)] if file_size else [],
+            content=bytearray(file_size) if self.store_content else None,
+        )
+        return LargeFileUploadSession(
+            upload_url=upload_url,
+            expiration_date_time=expiry,
+            next_expected_ranges=['0-'],
+        )
+
+    def inject_faults(self, *status_codes: int) -> None:
+        """
+        Makes the next chunk requests fail with the given status codes, in order.
+        """
+        self._scheduled_faults.extend(status_codes)
+
+    def expire_session(self, upload_url: str) -> None:
+        """
+        Expires a session immediately.
+        """
+        self.sessions[upload_url].expiration_date_time = datetime.now(timezone.utc)
+
+    def get_content(self, upload_url: str) -> bytes:
+        """
+        Gets the bytes received by a session. Requires store_content.
+        """
+        content = self.sessions[upload_url].content
+        if content is None:
+            raise RuntimeError('The emulator does not store the content it receives.')
+        return bytes(content)
+
+    def get_transport(self) -> httpx.MockTransport:
+        """
+        Gets a transport that serves the emulated sessions.
+        """
+        return httpx.MockTransport(self.handle_request)
+
+    def create_request_adapter(
+        self, parse_node_factory: Optional[ParseNodeFactory] = None
+    ) -> HttpxRequestAdapter:
+        """
+        Creates a request adapter sending its requests to the emulator.
+        Args:
+            parse_node_factory (Optional[ParseNodeFactory]): Parses the session responses.
+                Defaults to the JSON parse node factory of microsoft-kiota-serialization-json
+                when it is installed, otherwise to the registered factories.
+        """
+        if parse_node_factory is None:
+            try:
+                # pylint: disable=import-outside-toplevel
+                from kiota_serialization_json.json_parse_node_factory import JsonParseNodeFactory
+                parse_node_factory = JsonParseNodeFactory()
+            except ImportError:
+                parse_node_factory = ParseNodeFactoryRegistry()
+        return HttpxRequestAdapter(
+            AnonymousAuthenticationProvider(),
+            parse_node_factory=parse_node_factory,
+            http_client=httpx.AsyncClient(transport=self.get_transport()),
+        )
+
+    async def handle_request(self, request: httpx.Request) -> httpx.Response:
+        """
+        Answers a request to an upload session URL.
+        """
+        content = await request.aread()
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        if self.link is not None and content:
+            await self.link.acquire(len(content))
+        session = self.sessions.get(str(request.url))
+        if session is None or session.expiration_date_time <= datetime.now(timezone.utc):
+            return self._error(404, 'itemNotFound', 'The upload session was not found.')
+        if request.method == 'GET':
+            return httpx.Response(200, json=self._get_status(session))
+        if request.method == 'DELETE':
+            del self.sessions[str(request.url)]
+            return httpx.Response(204)
+        if request.method != 'PUT':
+            return self._error(405, 'invalidRequest', 'Unsupported method.')
+        fault = self._get_fault()
+        if fault is not None:
+            return fault
+        return self._receive_chunk(session, request, content)
+
+    def _get_fault(self) -> Optional[httpx.Response]:
+        if self._scheduled_faults:
+            status_code = self._scheduled_faults.pop(0)
+        elif self.fault_rate and self._random.random() < self.fault_rate:
+            status_code = self._random.choice(self.fault_status_codes)
+        else:
+            return None
+        self.faults_injected += 1
+        response = self._error(status_code, 'serviceNotAvailable', 'Injected failure.')
+        if self.retry_after is not None and status_code in (429, 503):
+            response.headers['Retry-After'] = str(self.retry_after)
+        return response
+
+    def _receive_chunk(
+        self, session: EmulatedUploadSession, request: httpx.Request, content: bytes
+    ) -> httpx.Response:
+        try:
+            unit, value = request.headers['Content-Range'].split(' ', 1)
+            span, total = value.split('/')
+            start, end = (int(part) for part in span.split('-'))
+        except (KeyError, ValueError):
+            return self._error(400, 'invalidRange', 'The Content-Range header is invalid.')
+        if unit != 'bytes' or int(total) != session.file_size or not 0 <= start <= end:
+            return self._error(400, 'invalidRange', 'The Content-Range header is invalid.')
+        if end >= session.file_size or len(content) != end - start + 1:
+            return self._error(400, 'invalidRange', 'The content does not match its range.')
+        if len(content) > MAX_CHUNK_SIZE:
+            return self._error(413, 'requestTooLarge', 'The chunk is larger than 60 MiB.')
+        if (
+            self.enforce_chunk_alignment and end < session.file_size - 1
+            and len(content) % CHUNK_SIZE_MULTIPLE
+        ):
+            return self._error(400, 'invalidRange', 'Chunks must be a multiple of 320 KiB in size.')
+        if intersect_ranges([(start, end)], session.missing) != [(start, end)]:
+            return self._error(416, 'invalidRange', 'The fragment overlaps bytes already received.')
+        session.requests.append((start, end))
+        session.missing = subtract_range(session.missing, start, end)
+        if session.content is not None:
+            session.content[start:end + 1] = content
+        session.expiration_date_time = datetime.now(timezone.utc) + self.session_lifetime
+        if session.missing:
+            return httpx.Response(202, json=self._get_status(session))
+        session.item = self._create_item(session)
+        return httpx.Response(201, json=session.item)
+
+    @staticmethod
+    def _create_item(session: EmulatedUploadSession) -> dict[str, Any]:
+        item: dict[str, Any] = {
+            'id': uuid.uuid4().hex,
+            'name': session.name,
+            'size': session.file_size,
+            'file': {},
+        }
+        if session.content is not None:
+            hasher = ContentHasher(HASH_ALGORITHMS)
+            hasher.update(0, memoryview(session.content))
+            item['file']['hashes'] = hasher.get_hashes(session.file_size)
+        return item
+
+    @staticmethod
+    def _get_status(session: EmulatedUploadSession) -> dict[str, Any]:
+        ranges = format_ranges(session.missing)
+        if ranges and session.missing[-1][1] == session.file_size - 1:
+            # The service leaves the end of a range open.
+            ranges[-1] = f'{session.missing[-1][0]}-'
+        return {
+            'expirationDateTime': session.expiration_date_time.isoformat(),
+            'nextExpectedRanges': ranges,
+        }
+
+    @staticmethod
+    def _error(status_code: int, code: str, message: str) -> httpx.Response:
+        return httpx.Response(
+            status_code, content=json.dumps({'error': {
+                'code': code,
+                'message': message
+            }})
+        )
@@ -0,0 +1,288 @@
+"""
+Sources of content for the LargeFileUploadTask.
+
+An UploadSource hands out the bytes of a chunk given its offset and length, so the
+upload task does not need to know whether the content lives in memory, in a file or
+arrives from an iterator that can only be consumed once.
+"""
+import asyncio
+import mmap
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections.abc import AsyncIterable, AsyncIterator, Iterable
+from concurrent.futures import Executor
+from io import BytesIO
+from typing import Any, Optional, Union
+
+from ._byte_ranges import ByteRange
+
+
+class UploadSource(ABC):
+    """
+    Provides the content of a file being uploaded, one chunk at a time.
+
+    Attributes:
+        size (int): The total number of bytes the source provides.
+    """
+
+    size: int
+
+    @property
+    def seekable(self) -> bool:
+        """
+        Whether chunks can be read in any order and read more than once.
+        """
+        return True
+
+    @abstractmethod
+    async def read(self, start: int, length: int) -> Union[bytes, memoryview]:
+        """
+        Reads a chunk of the content.
+        Args:
+            start (int): The offset of the first byte of the chunk.
+            length (int): The maximum number of bytes to read.
+        Returns:
+            Union[bytes, memoryview]: The chunk, shorter than length only at the end.
+        """
+
+    def release(self, offset: int) -> None:
+        """
+        Signals that the bytes before offset have been acknowledged by the service
+        and will not be read again.
+        Args:
+            offset (int): The offset of the first byte still needed.
+        """
+
+    def close(self) -> None:
+        """
+        Releases the buffers held by the source. The underlying stream is left open.
+        """
+
+
+class StreamUploadSource(UploadSource):
+    """
+    Reads chunks from a seekable stream.
+
+    In-memory streams are sliced through getbuffer() and regular files are memory
+    mapped, so chunks are returned as memoryview slices rather than copies. Any other
+    seekable stream falls back to seeking and reading.
+
+    Disk access runs in an executor so slow or network filesystems do not stall the
+    event loop: mapped pages are faulted in and plain reads are made off the loop.
+    """
+
+    def __init__(
+        self,
+        stream: BytesIO,
+        size: Optional[int] = None,
+        executor: Optional[Executor] = None
+    ) -> None:
+        """
+        Args:
+            stream (BytesIO): The seekable stream to upload.
+            size (Optional[int]): The number of bytes to upload. Detected from the
+                stream when omitted.
+            executor (Optional[Executor]): The executor used for disk access. Defaults
+                to the event loop's default thread pool executor.
+        """
+        self.stream = stream
+        self.size = self._get_size(stream) if size is None else size
+        self.executor = executor
+        self._buffer: Optional[memoryview] = None
+        self._mapped_file: Optional[mmap.mmap] = None
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _get_size(stream: BytesIO) -> int:
+        try:
+            return stream.getbuffer().nbytes
+        except AttributeError:
+            try:
+                return os.stat(stream.name).st_size
+            except (AttributeError, TypeError, OSError):
+                return os.fstat(stream.fileno()).st_size
+
+    async def read(self, start: int, length: int) -> Union[bytes, memoryview]:
+        buffer = self._get_buffer()
+        loop = asyncio.get_running_loop()
+        if buffer is None:
+            return await loop.run_in_executor(self.executor, self._read_blocking, start, length)
+        chunk = buffer[start:start + length]
+        if self._mapped_file is not None:
+            await loop.run_in_executor(self.executor, self._fault_in, chunk)
+        return chunk
+
+    def _read_blocking(self, start: int, length: int) -> bytes:
+        with self._lock:
+            self.stream.seek(start)
+            return self.stream.read(length)
+
+    @staticmethod
+    def _fault_in(chunk: memoryview) -> None:
+        # Touching one byte per page loads the chunk from disk.
+        chunk[::mmap.PAGESIZE].tobytes()
+
+    def _get_buffer(self) -> Optional[memoryview]:
+        if self._buffer is None and self.size > 0:
+            try:
+                self._buffer = self.stream.getbuffer()
+            except AttributeError:
+                try:
+                    self._mapped_file = mmap.mmap(self.stream.fileno(), 0, access=mmap.ACCESS_READ)
+                    self._buffer = memoryview(self._mapped_file)
+                except (AttributeError, OSError, ValueError):
+                    # Not backed by a regular readable file, fall back to reads.
+                    return None
+        return self._buffer
+
+    def close(self) -> None:
+        buffer, mapped_file = self._buffer, self._mapped_file
+        self._buffer, self._mapped_file = None, None
+        try:
+            if buffer is not None:
+                buffer.release()
+            if mapped_file is not None:
+                mapped_file.close()
+        except BufferError:
+            # Chunks still referenced by in-flight requests keep the mapping
+            # alive; it is closed once they are garbage collected.
+            pass
+
+
+class AsyncIteratorUploadSource(UploadSource):
+    """
+    Reads chunks on demand from content that can only be consumed once, such as an
+    async generator, a generator or a pipe.
+
+    The source never seeks. It only buffers the bytes between the first byte that has
+    not been acknowledged and the end of the last chunk read, which amounts to one or
+    two chunks while an upload is running.
+    """
+
+    READ_SIZE = 64 * 1024
+
+    def __init__(
+        self, content: Union[AsyncIterable[bytes], Iterable[bytes], Any], size: int
+    ) -> None:
+        """
+        Args:
+            content (Union[AsyncIterable[bytes], Iterable[bytes], Any]): An async iterable
+                or iterable of bytes, or a readable binary stream.
+            size (int): The declared total number of bytes the content provides.
+        """
+        if size is None or size < 0:
+            raise ValueError("The size of the content must be declared.")
+        self.size = size
+        self._iterator = self._iterate(content)
+        self._buffer = bytearray()
+        self._buffer_start = 0
+        self._lock = asyncio.Lock()
+
+    @property
+    def seekable(self) -> bool:
+        return False
+
+    @classmethod
+    async def _iterate(cls, content: Any) -> AsyncIterator[bytes]:
+        if isinstance(content, AsyncIterable):
+            async for part in content:
+                yield part
+        elif hasattr(content, 'read'):
+            loop = asyncio.get_running_loop()
+            while part := await loop.run_in_executor(None, content.read, cls.READ_SIZE):
+                yield part
+        else:
+            for part in content:
+                yield part
+
+    async def read(self, start: int, length: int) -> bytes:
+        if start < self._buffer_start:
+            raise ValueError(
+                f"Bytes from offset {start} have already been released and the content "
+                "cannot be rewound."
+            )
+        async with self._lock:
+            return await self._read_locked(start, length)
+
+    async def _read_locked(self, start: int, length: int) -> bytes:
+        end = min(start + length, self.size)
+        while self._buffer_start + len(self._buffer) < end:
+            try:
+                part = await anext(self._iterator)
+            except StopAsyncIteration as error:
+                raise ValueError(
+                    f"The content ended after {self._buffer_start + len(self._buffer)} bytes "
+                    f"but {self.size} bytes were declared."
+                ) from error
+            buffer_end = self._buffer_start + len(self._buffer)
+            if not self._buffer and buffer_end < start:
+                # Bytes the service already holds, e.g. when resuming a session.
+                skipped = min(len(part), start - buffer_end)
+                self._buffer_start += skipped
+                part = part[skipped:]
+            self._buffer += part
+        offset = start - self._buffer_start
+        return bytes(self._buffer[offset:offset + end - start])
+
+    def release(self, offset: int) -> None:
+        offset = min(offset, self._buffer_start + len(self._buffer))
+        if offset > self._buffer_start:
+            del self._buffer[:offset - self._buffer_start]
+            self._buffer_start = offset
+
+
+class ReadAheadBuffer:
+    """
+    Reads upcoming chunks of an UploadSource while earlier chunks are being sent.
+
+    At most depth reads are buffered at a time. Reads that are no longer expected, for
+    example after the chunk size changed, are dropped rather than cancelled, since
+    cancelling a read could leave a source that can only be read once in an unknown
+    position.
+    """
+
+    def __init__(self, source: UploadSource, depth: int) -> None:
+        self.source = source
+        self.depth = depth
+        self._reads: dict[ByteRange, asyncio.Future] = {}
+
+    def pop(self, start: int, end: int) -> Optional[asyncio.Future]:
+        """
+        Returns the read for a chunk if it was read ahead.
+        """
+        return self._reads.pop((start, end), None)
+
+    def take(self, start: int, end: int) -> asyncio.Future:
+        """
+        Returns the read for a chunk, starting it if it was not read ahead.
+        """
+        read = self.pop(start, end)
+        if read is None:
+            read = asyncio.ensure_future(self.source.read(start, end - start + 1))
+        return read
+
+    def schedule(self, upcoming: list[ByteRange]) -> None:
+        """
+        Starts reading the next chunks expected to be sent.
+        Args:
+            upcoming (list[ByteRange]): The next chunks in the order they will be sent.
+        """
+        upcoming = upcoming[:self.depth]
+        for key in [key for key in self._reads if key not in upcoming]:
+            self._reads.pop(key).add_done_callback(_discard_result)
+        for start, end in upcoming:
+            if (start, end) not in self._reads:
+                self._reads[(start, end)
+                            ] = asyncio.ensure_future(self.source.read(start, end - start + 1))
+
+    def clear(self) -> None:
+        """
+        Drops every read that has not been taken.
+        """
+        self.schedule([])
+
+
+def _discard_result(future: asyncio.Future) -> None:
+    if not future.cancelled():
+        future.exception()
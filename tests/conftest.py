@@ -1,3 +1,5 @@
+import asyncio
+
 import httpx
 import pytest
 from kiota_abstractions.authentication import AnonymousAuthenticationProvider
@@ -5,8 +7,10 @@ from kiota_abstractions.authentication import AnonymousAuthenticationProvider
 from msgraph_core import APIVersion, NationalClouds
 from msgraph_core.graph_client_factory import GraphClientFactory
 from msgraph_core.middleware import GraphRequestContext
+from msgraph_core.models.page_result import PageResult
 
 BASE_URL = NationalClouds.Global + '/' + APIVersion.v1
+USERS_URL = BASE_URL + '/users?page='
 
 
 class MockAuthenticationProvider(AnonymousAuthenticationProvider):
@@ -20,6 +24,54 @@ class MockAuthenticationProvider(AnonymousAuthenticationProvider):
         return
 
 
+class PagesAdapter:
+    """
+    A request adapter serving pages keyed by URL, after some latency. A URL listed in
+    failures fails once and a page that is an exception is raised. Records the URL and
+    headers of every request and the most requests in flight at once.
+    """
+
+    def __init__(self, pages, failures=(), latency=0.0):
+        self.pages = pages
+        self.failures = set(failures)
+        self.latency = latency
+        self.requests = []
+        self.request_headers = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def send_async(self, request_info, parsable_factory, error_mapping):
+        self.requests.append(request_info.url)
+        self.request_headers.append(request_info.headers.get_all())
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            if self.latency:
+                await asyncio.sleep(self.latency)
+            if request_info.url in self.failures:
+                self.failures.discard(request_info.url)
+                raise RuntimeError('The connection was reset.')
+            page = self.pages[request_info.url]
+            if isinstance(page, Exception):
+                raise page
+            return page
+        finally:
+            self.in_flight -= 1
+
+
+def make_pages(count=3, size=3, url=USERS_URL, make_item=lambda index: index):
+    """
+    Creates the pages of a collection, linked as url followed by the page number from 1.
+    Returns the first page and the following pages keyed by URL.
+    """
+    pages = {}
+    for number in range(1, count + 1):
+        next_link = f'{url}{number + 1}' if number < count else None
+        items = [make_item(index) for index in range((number - 1) * size, number * size)]
+        pages[f'{url}{number}'] = PageResult(next_link, items)
+    return pages.pop(f'{url}1'), pages
+
+
 @pytest.fixture
 def mock_auth_provider():
     return MockAuthenticationProvider()
@@ -0,0 +1,99 @@
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+from kiota_abstractions.api_error import APIError
+from kiota_abstractions.request_information import RequestInformation
+
+from msgraph_core.requests.batch_request_builder import BatchRequestBuilder
+from msgraph_core.requests.batch_request_content import BatchRequestContent
+from msgraph_core.requests.batch_request_content_collection import BatchRequestContentCollection
+from msgraph_core.requests.batch_response_content import SlottedBatchResponseContent
+from msgraph_core.requests.batch_response_content_collection import BatchResponseContentCollection
+
+
+class BatchAdapter:
+    """Answers each batch with a response naming it. Later batches answer sooner."""
+
+    base_url = 'https://graph.microsoft.com/v1.0/'
+
+    def __init__(self, batch_count, failing_batch=None):
+        self.batch_count = batch_count
+        self.failing_batch = failing_batch
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.sent = []
+
+    async def send_async(self, request_info, response_type, error_map):
+        batch = request_info.batch
+        self.sent.append(batch)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(0.001 * (self.batch_count - batch))
+        finally:
+            self.in_flight -= 1
+        if batch == self.failing_batch:
+            raise APIError('The batch failed.')
+        response = response_type()
+        response.batch = batch
+        return response
+
+
+def make_builder(batch_count, **kwargs):
+    adapter = BatchAdapter(batch_count, kwargs.pop('failing_batch', None))
+    builder = BatchRequestBuilder(adapter, **kwargs)
+    collection = BatchRequestContentCollection()
+    collection.batches = []
+    for batch in range(batch_count):
+        content = BatchRequestContent()
+        content.batch = batch
+        collection.batches.append(content)
+
+    async def to_post_request_information(batch_request_content):
+        request_info = RequestInformation()
+        request_info.batch = batch_request_content.batch
+        return request_info
+
+    builder.to_post_request_information = to_post_request_information
+    return builder, adapter, collection
+
+
+@pytest.mark.asyncio
+async def test_batches_are_posted_one_at_a_time_by_default():
+    builder, adapter, collection = make_builder(5)
+    responses = await builder.post(collection)
+    assert isinstance(responses, BatchResponseContentCollection)
+    assert [response.batch for response in responses.get_responses()] == [0, 1, 2, 3, 4]
+    assert adapter.max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_batches_are_posted_concurrently_and_returned_in_order():
+    builder, adapter, collection = make_builder(10, max_concurrency=4)
+    responses = await builder.post(collection)
+    assert [response.batch for response in responses.get_responses()] == list(range(10))
+    assert adapter.max_in_flight == 4
+
+
+@pytest.mark.asyncio
+async def test_a_failed_batch_cancels_the_batches_not_sent_yet():
+    builder, adapter, collection = make_builder(10, max_concurrency=2, failing_batch=1)
+    with pytest.raises(APIError):
+        await builder.post(collection)
+    await asyncio.sleep(0.02)
+    assert len(adapter.sent) < 10
+    assert adapter.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_batch_responses_are_read_into_the_response_type():
+    builder, _, collection = make_builder(3, response_type=SlottedBatchResponseContent)
+    responses = await builder.post(collection)
+    assert [type(response)
+            for response in responses.get_responses()] == [SlottedBatchResponseContent] * 3
+
+
+def test_max_concurrency_must_be_positive():
+    with pytest.raises(ValueError):
+        BatchRequestBuilder(Mock(base_url='https://graph.microsoft.com/v1.0/'), max_concurrency=0)
@@ -110,3 +110,15 @@ def test_serialize(batch_request_content):
     writer.write_collection_of_object_values.assert_called_once_with(
         "requests", list(batch_request_content.requests.values())
     )
+
+
+def test_request_informations_can_be_added_as_slotted_items(request_info1):
+    from msgraph_core.requests.batch_request_item import SlottedBatchRequestItem
+    batch_request_content = BatchRequestContent(
+        {"1": request_info1}, request_item_type=SlottedBatchRequestItem
+    )
+    batch_request_content.add_urllib_request(Request("https://graph.microsoft.com/v1.0/me"), "2")
+    assert all(
+        isinstance(request, SlottedBatchRequestItem)
+        for request in batch_request_content.requests.values()
+    )
@@ -142,3 +142,36 @@ def test_serialize_json(batch_request_item):
     assert content["headers"] == {"content-type": "application/json"}
     assert content["body"] == {"key": "value"}
 
+
+
+def test_slotted_batch_request_item(request_info):
+    from kiota_abstractions.serialization import Parsable
+
+    from msgraph_core.requests.batch_request_item import SlottedBatchRequestItem
+    item = SlottedBatchRequestItem(request_information=request_info, id="123", depends_on=["1"])
+    assert not hasattr(item, '__dict__')
+    assert isinstance(item, Parsable)
+    assert isinstance(item, BatchRequestItem)
+    assert item.id == "123"
+    assert item.method == "GET"
+    assert item.headers == {"content-type": "application/json"}
+    assert item.depends_on == ["1"]
+    original = BatchRequestItem(request_information=request_info)
+    for request_item in (item, original):
+        request_item.set_url("https://graph.microsoft.com/v1.0/me/events?$top=5")
+    assert item.url == original.url
+    writer = JsonSerializationWriterFactory().get_serialization_writer("application/json")
+    item.serialize(writer)
+    content = json.loads(writer.get_serialized_content())
+    assert content["id"] == "123"
+    assert content["body"] == {"key": "value"}
+
+
+def test_slotted_batch_request_item_has_every_member_of_the_original():
+    from msgraph_core.requests.batch_request_item import SlottedBatchRequestItem
+    members = {name for name in dir(BatchRequestItem) if not name.startswith('__')}
+    assert members - {'_abc_impl'} <= set(dir(SlottedBatchRequestItem))
+    urllib_request = Request(base_url, method="GET")
+    item = SlottedBatchRequestItem.create_with_urllib_request(urllib_request, id="1")
+    assert isinstance(item, SlottedBatchRequestItem)
+    assert not hasattr(item, '__dict__')
@@ -112,3 +112,22 @@ def test_create_from_discriminator_value():
     parse_node = Mock(spec=ParseNode)
     batch_response_content = BatchResponseContent.create_from_discriminator_value(parse_node)
     assert isinstance(batch_response_content, BatchResponseContent)
+
+
+def test_slotted_batch_response_content_reads_slotted_items():
+    from kiota_serialization_json.json_parse_node import JsonParseNode
+
+    from msgraph_core.requests.batch_response_content import SlottedBatchResponseContent
+    from msgraph_core.requests.batch_response_item import SlottedBatchResponseItem
+    content = JsonParseNode({
+        "responses": [{
+            "id": "1",
+            "status": 200
+        }, {
+            "id": "2",
+            "status": 404
+        }]
+    }).get_object_value(SlottedBatchResponseContent)
+    assert isinstance(content, SlottedBatchResponseContent)
+    assert [type(item) for item in content.responses.values()] == [SlottedBatchResponseItem] * 2
+    assert content.responses["2"].status == 404
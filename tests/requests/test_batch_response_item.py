@@ -82,3 +82,26 @@ def test_serialize(batch_response_item):
     writer.write_collection_of_primitive_values.assert_any_call(
         'headers', {"Content-Type": "application/json"}
     )
+
+
+def test_slotted_batch_response_item():
+    from kiota_abstractions.serialization import Parsable
+    from kiota_serialization_json.json_parse_node import JsonParseNode
+
+    from msgraph_core.requests.batch_response_item import SlottedBatchResponseItem
+    item = JsonParseNode({
+        "id": "1",
+        "status": 200,
+        "headers": {
+            "Content-Type": "application/json"
+        }
+    }).get_object_value(SlottedBatchResponseItem)
+    assert isinstance(item, SlottedBatchResponseItem)
+    assert isinstance(item, BatchResponseItem)
+    assert isinstance(item, Parsable)
+    assert not hasattr(item, '__dict__')
+    assert item.id == "1"
+    assert item.status == 200
+    assert item.content_type == "application/json"
+    with pytest.raises(AttributeError):
+        item.unknown = True
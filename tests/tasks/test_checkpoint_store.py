@@ -0,0 +1,86 @@
+import asyncio
+import os
+import threading
+import time
+
+import pytest
+
+from msgraph_core.tasks.checkpoint_store import (
+    CheckpointWriter,
+    InMemoryCheckpointStore,
+    JsonFileCheckpointStore,
+    SqliteCheckpointStore,
+)
+
+
+@pytest.fixture(params=['memory', 'json', 'sqlite'])
+def store(request, tmp_path):
+    if request.param == 'json':
+        return JsonFileCheckpointStore(tmp_path / 'checkpoints')
+    if request.param == 'sqlite':
+        return SqliteCheckpointStore(tmp_path / 'checkpoints.db')
+    return InMemoryCheckpointStore()
+
+
+def test_save_load_and_delete(store):  # pylint: disable=redefined-outer-name
+    assert store.load('upload') is None
+
+    store.save('upload', {'upload_url': 'https://example.org', 'ranges': ['0-9']})
+    store.save('upload', {'upload_url': 'https://example.org', 'ranges': ['10-19']})
+
+    assert store.load('upload') == {'upload_url': 'https://example.org', 'ranges': ['10-19']}
+    store.delete('upload')
+    store.delete('upload')
+    assert store.load('upload') is None
+
+
+def test_json_store_replaces_files_atomically(tmp_path):
+    key = 'https://example.org/upload?token=a/b'
+    store = JsonFileCheckpointStore(tmp_path)
+    store.save(key, {'value': 1})
+    store.save(key, {'value': 2})
+
+    assert os.listdir(tmp_path) == [os.path.basename(store.get_path(key))]
+
+
+def test_sqlite_store_is_shared_between_instances(tmp_path):
+    SqliteCheckpointStore(tmp_path / 'state.db').save('key', {'value': 1})
+
+    assert SqliteCheckpointStore(tmp_path / 'state.db').load('key') == {'value': 1}
+
+
+def test_sqlite_store_rejects_invalid_table_names(tmp_path):
+    with pytest.raises(ValueError):
+        SqliteCheckpointStore(tmp_path / 'state.db', table='checkpoints; DROP TABLE x')
+
+
+@pytest.mark.asyncio
+async def test_writer_runs_writes_off_the_loop_and_keeps_the_latest():
+    writes = []
+
+    def write(value):
+        time.sleep(0.01)
+        writes.append((value, threading.current_thread()))
+
+    writer = CheckpointWriter()
+    for value in range(5):
+        writer.submit(lambda value=value: write(value))
+        await asyncio.sleep(0)
+    await writer.flush()
+
+    assert [value for value, _ in writes] == [0, 4]
+    assert all(thread is not threading.current_thread() for _, thread in writes)
+
+
+@pytest.mark.asyncio
+async def test_writer_raises_the_error_of_a_failed_write():
+
+    def fail():
+        raise OSError('The disk is full.')
+
+    writer = CheckpointWriter()
+    writer.submit(fail)
+    with pytest.raises(OSError):
+        await writer.flush()
+    writer.submit(lambda: None)
+    await writer.flush()
@@ -0,0 +1,60 @@
+import pytest
+
+from msgraph_core.tasks.chunk_sizer import (
+    CHUNK_SIZE_MULTIPLE,
+    MAX_CHUNK_SIZE,
+    AdaptiveChunkSizer,
+)
+
+
+def test_initial_size_is_aligned_to_multiple():
+    sizer = AdaptiveChunkSizer(initial_size=1_000_000)
+    assert sizer.chunk_size == 3 * CHUNK_SIZE_MULTIPLE
+
+
+def test_grows_on_fast_links_up_to_the_maximum():
+    sizer = AdaptiveChunkSizer(initial_size=CHUNK_SIZE_MULTIPLE)
+    sizes = [sizer.record_success(sizer.chunk_size, 0.01) for _ in range(12)]
+
+    assert sizes[0] == 2 * CHUNK_SIZE_MULTIPLE
+    assert sizes == sorted(sizes)
+    assert sizes[-1] == MAX_CHUNK_SIZE
+    assert all(size % CHUNK_SIZE_MULTIPLE == 0 for size in sizes)
+
+
+def test_shrinks_on_slow_links_and_failures():
+    sizer = AdaptiveChunkSizer(initial_size=10 * 1024 * 1024, target_seconds=1)
+    size = sizer.record_success(sizer.chunk_size, 60)
+    assert size == 5 * 1024 * 1024
+
+    size = sizer.record_failure()
+    assert size == int(2.5 * 1024 * 1024 // CHUNK_SIZE_MULTIPLE) * CHUNK_SIZE_MULTIPLE
+    for _ in range(10):
+        size = sizer.record_failure()
+    assert size == CHUNK_SIZE_MULTIPLE
+
+
+def test_targets_request_duration_from_throughput():
+    size = 25 * CHUNK_SIZE_MULTIPLE
+    sizer = AdaptiveChunkSizer(initial_size=size, target_seconds=2)
+    # a chunk that took exactly the target duration keeps its size
+    assert sizer.record_success(size, 2) == size
+    assert sizer.throughput == size / 2
+
+
+@pytest.mark.parametrize(
+    'kwargs', [
+        {
+            'min_size': 1000
+        }, {
+            'max_size': MAX_CHUNK_SIZE + CHUNK_SIZE_MULTIPLE
+        }, {
+            'target_seconds': 0
+        }, {
+            'growth_factor': 1
+        }
+    ]
+)
+def test_rejects_invalid_bounds(kwargs):
+    with pytest.raises(ValueError):
+        AdaptiveChunkSizer(**kwargs)
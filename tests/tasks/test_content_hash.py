@@ -0,0 +1,85 @@
+import base64
+import hashlib
+import os
+
+import pytest
+
+from msgraph_core.tasks.content_hash import ContentHasher, QuickXorHash
+
+
+def reference_quick_xor_hash(data):
+    """A byte by byte port of the published quickXorHash reference implementation."""
+    cells = [0, 0, 0]
+    index, offset = 0, 0
+    for i in range(min(len(data), 160)):
+        is_last = index == 2
+        bits = 32 if is_last else 64
+        xored = 0
+        for j in range(i, len(data), 160):
+            xored ^= data[j]
+        cells[index] ^= (xored << offset) & (2**64 - 1)
+        if offset > bits - 8:
+            cells[0 if is_last else index + 1] ^= xored >> (bits - offset)
+        offset += 11
+        while offset >= bits:
+            index = 0 if is_last else index + 1
+            offset -= bits
+    digest = bytearray(
+        cells[0].to_bytes(8, 'little') + cells[1].to_bytes(8, 'little') +
+        (cells[2] & 0xFFFFFFFF).to_bytes(4, 'little')
+    )
+    for i, value in enumerate(len(data).to_bytes(8, 'little')):
+        digest[12 + i] ^= value
+    return base64.b64encode(bytes(digest)).decode('ascii')
+
+
+@pytest.mark.parametrize('size', [0, 1, 19, 160, 161, 1000, 4097])
+def test_quick_xor_hash_matches_reference(size):
+    data = os.urandom(size)
+    quick_xor = QuickXorHash()
+    for start in range(0, size, 333):
+        quick_xor.update(memoryview(data)[start:start + 333])
+
+    assert quick_xor.get_value() == reference_quick_xor_hash(data)
+
+
+def test_quick_xor_hash_of_empty_content():
+    assert QuickXorHash().get_value() == 'AAAAAAAAAAAAAAAAAAAAAAAAAAA='
+
+
+def test_content_hasher_hashes_out_of_order_chunks_in_offset_order():
+    data = os.urandom(3000)
+    hasher = ContentHasher()
+    hasher.update(2000, data[2000:])
+    hasher.update(1000, data[1000:2000])
+    assert hasher.get_hashes(len(data)) is None
+
+    hasher = ContentHasher()
+    for start in (1000, 2000, 0):
+        hasher.update(start, data[start:start + 1000])
+
+    assert hasher.get_hashes(len(data)) == {
+        'quickXorHash': reference_quick_xor_hash(data),
+        'sha1Hash': hashlib.sha1(data).hexdigest().upper(),
+        'sha256Hash': hashlib.sha256(data).hexdigest().upper(),
+    }
+
+
+def test_content_hasher_stops_when_too_many_bytes_wait_for_a_gap():
+    data = os.urandom(4000)
+    hasher = ContentHasher(max_pending_bytes=2000)
+    hasher.update(1000, data[1000:2000])
+    hasher.update(2000, data[2000:3000])
+    assert not hasher.stopped
+
+    hasher.update(3000, data[3000:])
+    hasher.update(0, data[:1000])
+
+    assert hasher.stopped
+    assert not hasher._pending
+    assert hasher.get_hashes(len(data)) is None
+
+
+def test_unknown_algorithm_is_rejected():
+    with pytest.raises(ValueError):
+        ContentHasher(['md5Hash'])
@@ -0,0 +1,186 @@
+from unittest.mock import Mock
+
+import pytest
+from kiota_abstractions.api_error import APIError
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from msgraph_core.models.page_result import PageResult
+from msgraph_core.tasks.checkpoint_store import InMemoryCheckpointStore, SqliteCheckpointStore
+from msgraph_core.tasks.delta_sync import DeltaChangeType, DeltaSyncEngine
+from msgraph_core.tasks.page_iterator import PageIterator
+
+DELTA_URL = 'https://graph.microsoft.com/v1.0/users/delta'
+
+
+class DeltaAdapter:
+    """Answers requests with the responses registered for their URL."""
+
+    def __init__(self, responses):
+        self.responses = responses
+        self.requests = []
+
+    async def send_async(self, request_info, parsable_factory, error_mapping):
+        self.requests.append(request_info.url)
+        response = self.responses[request_info.url]
+        if isinstance(response, Exception):
+            raise response
+        return response
+
+
+def make_request():
+    request_info = RequestInformation()
+    request_info.http_method = Method.GET
+    request_info.url = DELTA_URL
+    return request_info
+
+
+def make_engine(responses, **kwargs):
+    adapter = DeltaAdapter(responses)
+    return adapter, DeltaSyncEngine(adapter, make_request(), PageResult, **kwargs)
+
+
+async def collect(engine):
+    return [(change.change_type, change.item_id) async for change in engine.sync()]
+
+
+def test_page_iterator_captures_the_delta_link():
+    page = PageResult(value=[{'id': '1'}], odata_delta_link=f'{DELTA_URL}?token=1')
+    assert PageIterator(page, Mock()).delta_link == f'{DELTA_URL}?token=1'
+    page_dict = {'value': [{'id': '1'}], '@odata.deltaLink': f'{DELTA_URL}?token=1'}
+    assert PageIterator(page_dict, Mock()).delta_link == f'{DELTA_URL}?token=1'
+
+
+@pytest.mark.asyncio
+async def test_rounds_resume_from_the_saved_delta_link():
+    responses = {
+        DELTA_URL:
+        PageResult(f'{DELTA_URL}?skip=1', [{
+            'id': '1'
+        }, {
+            'id': '2'
+        }]),
+        f'{DELTA_URL}?skip=1':
+        PageResult(value=[{
+            'id': '3'
+        }], odata_delta_link=f'{DELTA_URL}?token=1'),
+        f'{DELTA_URL}?token=1':
+        PageResult(
+            value=[
+                {
+                    'id': '2',
+                    'displayName': 'Renamed'
+                }, {
+                    'id': '3',
+                    '@removed': {
+                        'reason': 'deleted'
+                    }
+                }
+            ],
+            odata_delta_link=f'{DELTA_URL}?token=2'
+        ),
+    }
+    adapter, engine = make_engine(responses)
+
+    assert await collect(engine) == [
+        (DeltaChangeType.ADDED, '1'),
+        (DeltaChangeType.ADDED, '2'),
+        (DeltaChangeType.ADDED, '3'),
+    ]
+    assert engine.delta_link == f'{DELTA_URL}?token=1'
+    assert await collect(engine) == [
+        (DeltaChangeType.CHANGED, '2'),
+        (DeltaChangeType.REMOVED, '3'),
+    ]
+    assert engine.delta_link == f'{DELTA_URL}?token=2'
+    assert adapter.requests == [DELTA_URL, f'{DELTA_URL}?skip=1', f'{DELTA_URL}?token=1']
+
+
+@pytest.mark.asyncio
+async def test_tracked_ids_tell_added_items_from_changed_ones(tmp_path):
+    responses = {
+        DELTA_URL:
+        PageResult(value=[{
+            'id': '1'
+        }], odata_delta_link=f'{DELTA_URL}?token=1'),
+        f'{DELTA_URL}?token=1':
+        PageResult(
+            value=[{
+                'id': '1'
+            }, {
+                'id': '2'
+            }, {
+                'id': '1',
+                'deleted': {}
+            }],
+            odata_delta_link=f'{DELTA_URL}?token=2'
+        ),
+    }
+    store = SqliteCheckpointStore(tmp_path / 'tokens.db')
+    _, engine = make_engine(responses, token_store=store, track_item_ids=True)
+    await collect(engine)
+
+    # Another engine sharing the store carries on from the saved state.
+    _, engine = make_engine(responses, token_store=store, track_item_ids=True)
+    assert await collect(engine) == [
+        (DeltaChangeType.CHANGED, '1'),
+        (DeltaChangeType.ADDED, '2'),
+        (DeltaChangeType.REMOVED, '1'),
+    ]
+    assert store.load(DELTA_URL) == {'delta_link': f'{DELTA_URL}?token=2', 'item_ids': ['2']}
+
+
+@pytest.mark.asyncio
+async def test_an_interrupted_round_keeps_the_previous_delta_link():
+    responses = {
+        DELTA_URL: PageResult(f'{DELTA_URL}?skip=1', [{
+            'id': '1'
+        }]),
+        f'{DELTA_URL}?skip=1':
+        PageResult(value=[{
+            'id': '2'
+        }], odata_delta_link=f'{DELTA_URL}?token=1'),
+    }
+    _, engine = make_engine(responses)
+
+    async for _ in engine.sync():
+        break
+
+    assert engine.delta_link is None
+
+
+@pytest.mark.asyncio
+async def test_an_expired_delta_link_starts_a_full_enumeration():
+    store = InMemoryCheckpointStore()
+    store.save('users', {'delta_link': f'{DELTA_URL}?token=old'})
+    responses = {
+        f'{DELTA_URL}?token=old': APIError('Resync required.', response_status_code=410),
+        DELTA_URL: PageResult(value=[{
+            'id': '1'
+        }], odata_delta_link=f'{DELTA_URL}?token=1'),
+    }
+    _, engine = make_engine(responses, token_store=store, key='users')
+
+    assert await collect(engine) == [(DeltaChangeType.ADDED, '1')]
+    assert engine.delta_link == f'{DELTA_URL}?token=1'
+
+
+@pytest.mark.asyncio
+async def test_other_errors_are_raised():
+    store = InMemoryCheckpointStore()
+    store.save(DELTA_URL, {'delta_link': f'{DELTA_URL}?token=1'})
+    responses = {f'{DELTA_URL}?token=1': APIError('Throttled.', response_status_code=429)}
+    _, engine = make_engine(responses, token_store=store)
+
+    with pytest.raises(APIError):
+        await collect(engine)
+    assert engine.delta_link == f'{DELTA_URL}?token=1'
+
+
+@pytest.mark.asyncio
+async def test_a_round_without_a_delta_link_is_not_saved():
+    _, engine = make_engine({DELTA_URL: PageResult(value=[{'id': '1'}])})
+
+    with pytest.raises(ValueError):
+        await collect(engine)
+    assert engine.delta_link is None
@@ -0,0 +1,244 @@
+import json
+
+import httpx
+import pytest
+from kiota_abstractions.api_error import APIError
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+
+from msgraph_core.base_graph_request_adapter import BaseGraphRequestAdapter
+from msgraph_core.tasks.large_file_download import LargeFileDownloadTask
+from msgraph_core.tasks.upload_retry import ChunkRetryPolicy
+
+CONTENT_URL = "https://graph.microsoft.com/v1.0/me/drive/items/item-id/content"
+DATA = bytes(range(256)) * 40
+
+
+class RangeServer:
+    """Serves DATA to Range requests and records the ranges asked for."""
+
+    def __init__(self, data=DATA, fail_after=None, etag='"v1"'):
+        self.data = data
+        self.fail_after = fail_after
+        self.etag = etag
+        self.ranges = []
+        self.conditions = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        start, end = map(int, request.headers['Range'].split('=')[1].split('-'))
+        if self.fail_after is not None and len(self.ranges) >= self.fail_after:
+            return httpx.Response(404)
+        self.conditions.append(request.headers.get('If-Match'))
+        if request.headers.get('If-Match', self.etag) != self.etag:
+            return httpx.Response(412)
+        self.ranges.append((start, end))
+        if start >= len(self.data):
+            return httpx.Response(416, headers={'Content-Range': f'bytes */{len(self.data)}'})
+        end = min(end, len(self.data) - 1)
+        return httpx.Response(
+            206,
+            content=self.data[start:end + 1],
+            headers={
+                'Content-Range': f'bytes {start}-{end}/{len(self.data)}',
+                'ETag': self.etag
+            }
+        )
+
+
+def make_adapter(handler):
+    return HttpxRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+
+@pytest.mark.asyncio
+async def test_download_requests_ranges_concurrently_and_writes_at_offsets(tmp_path):
+    server = RangeServer()
+    destination = tmp_path / 'file.bin'
+    task = LargeFileDownloadTask(
+        make_adapter(server), CONTENT_URL, destination, max_chunk_size=1024, max_concurrency=3
+    )
+    completed = []
+
+    path = await task.download(completed.append)
+
+    assert path == str(destination)
+    assert destination.read_bytes() == DATA
+    assert server.ranges[0] == (0, 0)
+    assert sorted(server.ranges[1:]) == [(start, min(start + 1023, len(DATA) - 1))
+                                         for start in range(0, len(DATA), 1024)]
+    assert len(completed) == 10
+    assert task.etag == '"v1"'
+    assert not (tmp_path / 'file.bin.progress').exists()
+
+
+@pytest.mark.asyncio
+async def test_download_resumes_from_partial_file(tmp_path):
+    destination = tmp_path / 'file.bin'
+    failing = RangeServer(fail_after=4)
+    task = LargeFileDownloadTask(
+        make_adapter(failing),
+        CONTENT_URL,
+        destination,
+        max_chunk_size=1024,
+        max_concurrency=1,
+        retry_policy=ChunkRetryPolicy(max_retries=0)
+    )
+    with pytest.raises(APIError):
+        await task.download()
+
+    progress = json.loads((tmp_path / 'file.bin.progress').read_text())
+    assert progress['completed_ranges'] == ['0-3071']
+    assert destination.stat().st_size == len(DATA)
+
+    server = RangeServer()
+    resumed = LargeFileDownloadTask(
+        make_adapter(server), CONTENT_URL, destination, max_chunk_size=1024
+    )
+    await resumed.download()
+
+    assert destination.read_bytes() == DATA
+    assert min(server.ranges[1:]) == (3072, 4095)
+    assert len(server.ranges) == 1 + 7
+
+
+@pytest.mark.asyncio
+async def test_download_with_known_size_and_etag_skips_probe_and_handles_empty_files(tmp_path):
+    server = RangeServer(data=b'')
+    destination = tmp_path / 'empty.bin'
+    destination.write_bytes(b'stale')
+    await LargeFileDownloadTask(make_adapter(server), CONTENT_URL, destination).download()
+
+    assert destination.read_bytes() == b''
+
+    server = RangeServer(data=b'0123456789')
+    await LargeFileDownloadTask(
+        make_adapter(server), CONTENT_URL, destination, file_size=10, max_chunk_size=4, etag='"v1"'
+    ).download()
+
+    assert destination.read_bytes() == b'0123456789'
+    assert sorted(server.ranges) == [(0, 3), (4, 7), (8, 9)]
+
+
+@pytest.mark.asyncio
+async def test_download_rejects_responses_that_ignore_the_range(tmp_path):
+
+    def handler(request):
+        return httpx.Response(200, content=DATA)
+
+    task = LargeFileDownloadTask(
+        make_adapter(handler), CONTENT_URL, tmp_path / 'file.bin', file_size=len(DATA), etag='"v1"'
+    )
+    with pytest.raises(RuntimeError):
+        await task.download()
+
+
+@pytest.mark.asyncio
+async def test_streamed_ranges_are_rejected_before_the_whole_content_is_read(tmp_path):
+    sent = []
+
+    async def body():
+        for start in range(0, len(DATA), 1024):
+            sent.append(start)
+            yield DATA[start:start + 1024]
+
+    def handler(request):
+        return httpx.Response(200, content=body())
+
+    adapter = BaseGraphRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    task = LargeFileDownloadTask(
+        adapter,
+        CONTENT_URL,
+        tmp_path / 'file.bin',
+        file_size=len(DATA),
+        etag='"v1"',
+        max_chunk_size=len(DATA)
+    )
+    with pytest.raises(RuntimeError, match='answered 200'):
+        await task.download()
+    assert not sent
+
+
+@pytest.mark.asyncio
+async def test_download_streams_ranges_with_a_graph_request_adapter(tmp_path):
+    server = RangeServer()
+    adapter = BaseGraphRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(server))
+    )
+    destination = tmp_path / 'file.bin'
+    task = LargeFileDownloadTask(adapter, CONTENT_URL, destination, max_chunk_size=1024)
+    task.on_chunk_download_complete = lambda chunk: setattr(server, 'etag', '"v2"')
+
+    with pytest.raises(APIError, match='changed from ETag'):
+        await task.download()
+    server.etag = '"v1"'
+    await LargeFileDownloadTask(adapter, CONTENT_URL, destination, max_chunk_size=1024).download()
+
+    assert destination.read_bytes() == DATA
+
+
+@pytest.mark.asyncio
+async def test_download_fails_when_a_range_was_not_recorded(tmp_path):
+    task = LargeFileDownloadTask(
+        make_adapter(RangeServer()), CONTENT_URL, tmp_path / 'file.bin', max_chunk_size=1024
+    )
+    acknowledge_range = task._acknowledge_range
+    task._acknowledge_range = lambda start, end: start and acknowledge_range(start, end)
+
+    with pytest.raises(RuntimeError, match='1024-10239'):
+        await task.download()
+    assert (tmp_path / 'file.bin.progress').exists()
+
+
+@pytest.mark.asyncio
+async def test_download_sends_the_etag_with_every_range(tmp_path):
+    server = RangeServer()
+    await LargeFileDownloadTask(
+        make_adapter(server), CONTENT_URL, tmp_path / 'file.bin', file_size=len(DATA)
+    ).download()
+
+    assert server.ranges[0] == (0, 0)
+    assert server.conditions == [None, '"v1"']
+
+
+@pytest.mark.asyncio
+async def test_download_fails_when_the_content_changes(tmp_path):
+    server = RangeServer()
+    task = LargeFileDownloadTask(
+        make_adapter(server), CONTENT_URL, tmp_path / 'file.bin', max_chunk_size=1024
+    )
+    task.on_chunk_download_complete = lambda chunk: setattr(server, 'etag', '"v2"')
+
+    with pytest.raises(APIError) as error:
+        await task.download()
+    assert error.value.response_status_code == 412
+
+
+@pytest.mark.asyncio
+async def test_download_restarts_when_the_content_changed_since_the_last_attempt(tmp_path):
+    destination = tmp_path / 'file.bin'
+    task = LargeFileDownloadTask(
+        make_adapter(RangeServer(fail_after=4)),
+        CONTENT_URL,
+        destination,
+        file_size=len(DATA),
+        max_chunk_size=1024,
+        max_concurrency=1,
+        retry_policy=ChunkRetryPolicy(max_retries=0)
+    )
+    with pytest.raises(APIError):
+        await task.download()
+
+    changed = bytes(reversed(DATA))
+    server = RangeServer(data=changed, etag='"v2"')
+    await LargeFileDownloadTask(
+        make_adapter(server), CONTENT_URL, destination, file_size=len(DATA), max_chunk_size=1024
+    ).download()
+
+    assert destination.read_bytes() == changed
+    assert min(server.ranges[1:]) == (0, 1023)
@@ -0,0 +1,690 @@
+import asyncio
+import hashlib
+import json
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+
+import httpx
+import pytest
+from kiota_abstractions.api_error import APIError
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
+from kiota_abstractions.method import Method
+from kiota_http.httpx_request_adapter import HttpxRequestAdapter
+from kiota_serialization_json.json_parse_node_factory import JsonParseNodeFactory
+
+from msgraph_core.models import LargeFileUploadSession
+from msgraph_core.tasks.checkpoint_store import InMemoryCheckpointStore, JsonFileCheckpointStore
+from msgraph_core.tasks.chunk_sizer import CHUNK_SIZE_MULTIPLE, AdaptiveChunkSizer
+from msgraph_core.tasks.large_file_upload import LargeFileUploadTask
+from msgraph_core.tasks.upload_progress import UploadEventType, UploadObserver
+from msgraph_core.tasks.upload_retry import ChunkRetryPolicy
+from msgraph_core.tasks.upload_source import AsyncIteratorUploadSource, StreamUploadSource
+from msgraph_core.tasks._byte_ranges import (
+    format_ranges,
+    intersect_ranges,
+    parse_ranges,
+    subtract_range,
+)
+
+UPLOAD_URL = "https://example.sharepoint.com/upload/session"
+
+
+async def read_content(content):
+    if isinstance(content, bytes):
+        return content
+    return b''.join([bytes(part) async for part in content])
+
+
+class FakeUploadAdapter:
+    """Records chunk PUTs and answers them like an upload session would."""
+
+    def __init__(self, file_size, delay=0.0):
+        self.file_size = file_size
+        self.delay = delay
+        self.received = {}
+        self.requests = []
+        self.contents = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _receive(self, info):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+            content_range = next(iter(info.headers.get('Content-Range')))
+            start, end = map(int, content_range.split(' ')[1].split('/')[0].split('-'))
+            self.contents.append(info.content)
+            self.requests.append((start, end))
+            self.received[start] = await read_content(info.content)
+            assert len(self.received[start]) == end - start + 1
+        finally:
+            self.in_flight -= 1
+
+    def missing_ranges(self):
+        missing = [(0, self.file_size - 1)]
+        for start, data in self.received.items():
+            missing = subtract_range(missing, start, start + len(data) - 1)
+        return format_ranges(missing)
+
+    def assembled(self):
+        return b''.join(self.received[start] for start in sorted(self.received))
+
+    async def send_async(self, info, factory, error_map):
+        if info.http_method != Method.GET:
+            await self._receive(info)
+        return LargeFileUploadSession(next_expected_ranges=self.missing_ranges())
+
+    async def send_primitive_async(self, info, response_type, error_map):
+        await self._receive(info)
+        assert not self.missing_ranges()
+        return b'{"id": "item"}'
+
+
+class ExpiringUploadAdapter(FakeUploadAdapter):
+    """Answers with a session about to expire from the third chunk until it is renewed."""
+
+    renewed = False
+
+    async def send_async(self, info, factory, error_map):
+        session = await super().send_async(info, factory, error_map)
+        expires_in = timedelta(hours=1) if self.renewed or len(self.received) < 3 else timedelta(
+            seconds=30
+        )
+        session.expiration_date_time = datetime.now(timezone.utc) + expires_in
+        return session
+
+
+def make_session(next_expected_ranges=None):
+    return LargeFileUploadSession(
+        upload_url=UPLOAD_URL,
+        expiration_date_time=datetime.now(timezone.utc) + timedelta(hours=1),
+        next_expected_ranges=next_expected_ranges or ['0-'],
+    )
+
+
+def test_parse_and_subtract_ranges():
+    ranges = parse_ranges(['0-9', '20-'], 30)
+    assert ranges == [(0, 9), (20, 29)]
+    assert subtract_range(ranges, 5, 24) == [(0, 4), (25, 29)]
+    assert intersect_ranges(ranges, [(8, 21)]) == [(8, 9), (20, 21)]
+    assert format_ranges([(0, 4)]) == ['0-4']
+
+
+@pytest.mark.asyncio
+async def test_upload_sends_chunks_sequentially_by_default():
+    data = bytes(range(256)) * 40
+    adapter = FakeUploadAdapter(len(data), delay=0.001)
+    task = LargeFileUploadTask(make_session(), adapter, BytesIO(data), max_chunk_size=1024)
+
+    result = await task.upload()
+
+    assert result.upload_succeeded
+    assert result.item_response == b'{"id": "item"}'
+    assert adapter.max_in_flight == 1
+    expected = [(start, min(start + 1023, len(data) - 1)) for start in range(0, len(data), 1024)]
+    assert adapter.requests == expected
+    assert adapter.assembled() == data
+
+
+@pytest.mark.asyncio
+async def test_concurrent_upload_keeps_chunks_in_flight_and_sends_last_chunk_alone():
+    data = bytes(range(256)) * 40
+    adapter = FakeUploadAdapter(len(data), delay=0.01)
+    completed = []
+    task = LargeFileUploadTask(
+        make_session(), adapter, BytesIO(data), max_chunk_size=1024, max_concurrency=4
+    )
+
+    result = await task.upload(completed.append)
+
+    assert result.item_response == b'{"id": "item"}'
+    assert adapter.max_in_flight == 4
+    assert adapter.requests[-1] == (9216, len(data) - 1)
+    assert adapter.assembled() == data
+    assert len(completed) == 10
+    assert task.upload_session.next_expected_ranges == []
+
+
+@pytest.mark.asyncio
+async def test_concurrent_upload_only_sends_expected_ranges_on_resume():
+    data = bytes(range(256)) * 40
+    adapter = FakeUploadAdapter(len(data))
+    adapter.received[0] = data[:4096]
+    task = LargeFileUploadTask(
+        make_session(['4096-']), adapter, BytesIO(data), max_chunk_size=1024, max_concurrency=3
+    )
+
+    await task.resume()
+
+    assert min(start for start, _ in adapter.requests) == 4096
+    assert adapter.assembled() == data
+
+
+def test_invalid_concurrency_is_rejected():
+    with pytest.raises(ValueError):
+        LargeFileUploadTask(make_session(), FakeUploadAdapter(1), BytesIO(b'a'), max_concurrency=0)
+
+
+@pytest.mark.asyncio
+async def test_upload_slices_in_memory_streams_without_copying():
+    data = bytes(range(256)) * 8
+    stream = BytesIO(data)
+    adapter = FakeUploadAdapter(len(data))
+    task = LargeFileUploadTask(make_session(), adapter, stream, max_chunk_size=512)
+
+    await task.upload()
+
+    assert all(not isinstance(content, bytes) for content in adapter.contents)
+    assert adapter.assembled() == data
+    # the exported buffer is released once the chunks are dropped
+    adapter.contents.clear()
+    stream.write(b'more')
+
+
+@pytest.mark.asyncio
+async def test_upload_memory_maps_file_streams(tmp_path):
+    data = bytes(range(256)) * 8
+    path = tmp_path / 'upload.bin'
+    path.write_bytes(data)
+    adapter = FakeUploadAdapter(len(data))
+    with open(path, 'rb') as stream:
+        task = LargeFileUploadTask(make_session(), adapter, stream, max_chunk_size=512)
+        await task.upload()
+
+    assert all(not isinstance(content, bytes) for content in adapter.contents)
+    assert adapter.assembled() == data
+
+
+@pytest.mark.asyncio
+async def test_memoryview_chunks_are_sent_through_httpx():
+    data = bytes(range(256)) * 8
+    received = {}
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        start = int(request.headers['Content-Range'].split(' ')[1].split('-')[0])
+        received[start] = request.content
+        assert int(request.headers['Content-Length']) == len(request.content)
+        if sum(len(chunk) for chunk in received.values()) < len(data):
+            return httpx.Response(202, json={'nextExpectedRanges': [f'{start + 512}-']})
+        return httpx.Response(201, content=json.dumps({'id': 'item'}).encode())
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    adapter = HttpxRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        parse_node_factory=JsonParseNodeFactory(),
+        http_client=client,
+    )
+    task = LargeFileUploadTask(make_session(), adapter, BytesIO(data), max_chunk_size=512)
+
+    result = await task.upload()
+
+    assert b''.join(received[start] for start in sorted(received)) == data
+    assert json.loads(result.item_response) == {'id': 'item'}
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_async_iterator_content_with_bounded_buffer():
+    data = bytes(range(256)) * 40
+    adapter = FakeUploadAdapter(len(data))
+    buffered = []
+
+    async def produce():
+        for offset in range(0, len(data), 300):
+            yield data[offset:offset + 300]
+
+    source = AsyncIteratorUploadSource(produce(), len(data))
+    task = LargeFileUploadTask(make_session(), adapter, source, max_chunk_size=1024)
+
+    await task.upload(lambda _: buffered.append(len(source._buffer)))
+
+    assert adapter.assembled() == data
+    assert max(buffered) < 2 * 1024
+
+
+def test_concurrent_upload_requires_seekable_source():
+    source = AsyncIteratorUploadSource([b'a'], 1)
+    with pytest.raises(ValueError):
+        LargeFileUploadTask(make_session(), FakeUploadAdapter(1), source, max_concurrency=2)
+
+
+@pytest.mark.asyncio
+async def test_adaptive_upload_grows_chunks_in_allowed_multiples():
+    data = bytes(range(256)) * 4096 * 3
+    adapter = FakeUploadAdapter(len(data))
+    sizer = AdaptiveChunkSizer(initial_size=CHUNK_SIZE_MULTIPLE)
+    task = LargeFileUploadTask(make_session(), adapter, BytesIO(data), chunk_sizer=sizer)
+
+    await task.upload()
+
+    sizes = [end - start + 1 for start, end in adapter.requests]
+    assert sizes[0] == CHUNK_SIZE_MULTIPLE
+    assert sizes[1] == 2 * CHUNK_SIZE_MULTIPLE
+    assert all(size % CHUNK_SIZE_MULTIPLE == 0 for size in sizes[:-1])
+    assert adapter.assembled() == data
+
+
+@pytest.mark.asyncio
+async def test_read_ahead_overlaps_reads_with_chunk_requests():
+    data = bytes(range(256)) * 16
+    events = []
+
+    class RecordingSource(StreamUploadSource):
+
+        async def read(self, start, length):
+            events.append(('read', start))
+            return await super().read(start, length)
+
+    class RecordingAdapter(FakeUploadAdapter):
+
+        async def _receive(self, info):
+            start = int(next(iter(info.headers.get('Content-Range'))).split(' ')[1].split('-')[0])
+            events.append(('put', start))
+            await super()._receive(info)
+            events.append(('done', start))
+
+    adapter = RecordingAdapter(len(data), delay=0.01)
+    task = LargeFileUploadTask(
+        make_session(),
+        adapter,
+        RecordingSource(BytesIO(data)),
+        max_chunk_size=1024,
+        read_ahead=1,
+    )
+
+    await task.upload()
+
+    assert adapter.assembled() == data
+    # each chunk is read before the previous one has been acknowledged
+    for start in range(1024, 4096, 1024):
+        assert events.index(('read', start)) < events.index(('done', start - 1024))
+    reads = [start for kind, start in events if kind == 'read']
+    assert reads == list(range(0, 4096, 1024))
+
+
+@pytest.mark.asyncio
+async def test_upload_resumes_from_persisted_checkpoint(tmp_path):
+    data = bytes(range(256)) * 40
+    path = tmp_path / 'upload.bin'
+    path.write_bytes(data)
+    store = JsonFileCheckpointStore(tmp_path / 'checkpoints')
+
+    class CrashingAdapter(FakeUploadAdapter):
+
+        async def send_async(self, info, factory, error_map):
+            if len(self.received) == 3:
+                raise ConnectionError('worker killed')
+            return await super().send_async(info, factory, error_map)
+
+    adapter = CrashingAdapter(len(data))
+    with open(path, 'rb') as stream:
+        task = LargeFileUploadTask(
+            make_session(),
+            adapter,
+            stream,
+            max_chunk_size=1024,
+            checkpoint_store=store,
+            checkpoint_key='upload.bin',
+            retry_policy=ChunkRetryPolicy(max_retries=0)
+        )
+        with pytest.raises(ConnectionError):
+            await task.upload()
+
+    checkpoint = store.load('upload.bin')
+    assert checkpoint['upload_url'] == UPLOAD_URL
+    assert checkpoint['acknowledged_ranges'] == ['0-3071']
+
+    resumed_adapter = FakeUploadAdapter(len(data))
+    resumed_adapter.received = dict(adapter.received)
+    with open(path, 'rb') as stream:
+        resumed = LargeFileUploadTask.from_checkpoint(
+            store, 'upload.bin', resumed_adapter, stream, max_chunk_size=1024
+        )
+        result = await resumed.resume()
+
+    assert result.upload_succeeded
+    assert resumed_adapter.requests[0] == (3072, 4095)
+    assert resumed_adapter.assembled() == data
+    assert store.load('upload.bin') is None
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_is_not_resumed_with_different_content(tmp_path):
+    store = JsonFileCheckpointStore(tmp_path)
+    task = LargeFileUploadTask(
+        make_session(), FakeUploadAdapter(10), BytesIO(b'0123456789'), checkpoint_store=store
+    )
+    store.save('key', task.get_checkpoint().to_dict())
+
+    assert LargeFileUploadTask.from_checkpoint(store, 'missing', None, BytesIO(b'')) is None
+    with pytest.raises(ValueError):
+        LargeFileUploadTask.from_checkpoint(store, 'key', None, BytesIO(b'012345678'))
+
+
+FAR_EXPIRY = datetime(2999, 1, 1, tzinfo=timezone.utc)
+
+
+@pytest.mark.parametrize('expiry', [None, '2999-01-01T00:00:00Z', FAR_EXPIRY])
+@pytest.mark.asyncio
+async def test_checkpoint_is_resumed_whatever_the_expiry_of_the_session(expiry):
+    data = b'0123456789' * 300
+    store = InMemoryCheckpointStore()
+    session = make_session(['1024-'])
+    session.expiration_date_time = expiry
+    task = LargeFileUploadTask(
+        session, FakeUploadAdapter(len(data)), BytesIO(data), checkpoint_store=store
+    )
+    store.save('key', task.get_checkpoint().to_dict())
+
+    adapter = FakeUploadAdapter(len(data))
+    adapter.received[0] = data[:1024]
+    resumed = LargeFileUploadTask.from_checkpoint(
+        store, 'key', adapter, BytesIO(data), max_chunk_size=1024
+    )
+    result = await resumed.upload()
+
+    assert result.upload_succeeded
+    expected = None if expiry is None else FAR_EXPIRY
+    assert resumed.upload_session.expiration_date_time == expected
+
+
+@pytest.mark.asyncio
+async def test_throttled_chunk_is_retried_after_retry_after_with_missing_bytes_only(monkeypatch):
+    data = b'0123456789' * 300
+    delays = []
+
+    async def fake_sleep(delay):
+        if delay:
+            delays.append(delay)
+
+    class ThrottlingAdapter(FakeUploadAdapter):
+        throttled = False
+
+        async def send_async(self, info, factory, error_map):
+            if info.http_method != Method.GET and len(self.received) == 1 and not self.throttled:
+                # The service stored the first half of the chunk before answering 503.
+                await self._receive(info)
+                chunk = self.received.pop(1024)
+                self.received[1024] = chunk[:512]
+                self.throttled = True
+                raise APIError(
+                    'throttled', response_status_code=503, response_headers={'retry-after': '7'}
+                )
+            return await super().send_async(info, factory, error_map)
+
+    monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+    adapter = ThrottlingAdapter(len(data))
+    task = LargeFileUploadTask(make_session(), adapter, BytesIO(data), max_chunk_size=1024)
+    result = await task.upload()
+
+    assert result.upload_succeeded
+    assert adapter.assembled() == data
+    assert delays == [7.0]
+    assert adapter.requests[:4] == [(0, 1023), (1024, 2047), (1536, 2047), (2048, 2999)]
+    assert task.statistics.failed_requests == 1
+    assert task.statistics.throttled == 1
+    assert task.statistics.retries == 1
+    assert task.statistics.chunks_sent == 3
+    assert task.statistics.bytes_sent == len(data) - 512
+
+
+@pytest.mark.asyncio
+async def test_chunk_is_not_retried_on_client_errors():
+    class RejectingAdapter(FakeUploadAdapter):
+
+        async def send_async(self, info, factory, error_map):
+            raise APIError('bad request', response_status_code=400)
+
+    task = LargeFileUploadTask(
+        make_session(), RejectingAdapter(2048), BytesIO(bytes(2048)), max_chunk_size=1024
+    )
+    with pytest.raises(APIError):
+        await task.upload()
+    assert task.statistics.failed_requests == 1
+    assert task.statistics.retries == 0
+
+
+@pytest.mark.asyncio
+async def test_chunk_limiter_bounds_the_chunks_read_and_not_yet_acknowledged():
+    data = bytes(range(256)) * 40
+    adapter = FakeUploadAdapter(len(data), delay=0.01)
+    task = LargeFileUploadTask(
+        make_session(),
+        adapter,
+        BytesIO(data),
+        max_chunk_size=1024,
+        max_concurrency=4,
+        chunk_limiter=asyncio.Semaphore(2)
+    )
+    read_chunk = task._read_chunk
+    held = []
+
+    async def counting_read(*args):
+        held.append(len(held) + 1 - len(adapter.requests))
+        return await read_chunk(*args)
+
+    task._read_chunk = counting_read
+    await task.upload()
+
+    assert adapter.assembled() == data
+    assert max(held) == 2
+
+
+@pytest.mark.asyncio
+async def test_upload_reports_hashes_computed_while_sending():
+    data = bytes(range(256)) * 40
+    task = LargeFileUploadTask(
+        make_session(),
+        FakeUploadAdapter(len(data)),
+        BytesIO(data),
+        max_chunk_size=1024,
+        max_concurrency=4,
+        hash_algorithms=['sha1Hash', 'sha256Hash']
+    )
+    result = await task.upload()
+
+    assert result.hashes == {
+        'sha1Hash': hashlib.sha1(data).hexdigest().upper(),
+        'sha256Hash': hashlib.sha256(data).hexdigest().upper(),
+    }
+
+
+@pytest.mark.asyncio
+async def test_resumed_upload_does_not_report_partial_hashes():
+    data = b'0123456789' * 300
+    adapter = FakeUploadAdapter(len(data))
+    adapter.received[0] = data[:1024]
+    task = LargeFileUploadTask(
+        make_session(['1024-']),
+        adapter,
+        BytesIO(data),
+        max_chunk_size=1024,
+        hash_algorithms=['quickXorHash']
+    )
+    result = await task.upload()
+
+    assert result.upload_succeeded
+    assert result.hashes is None
+    assert task.hasher.stopped
+
+
+@pytest.mark.asyncio
+async def test_upload_renews_expiring_session_between_chunks():
+    data = bytes(range(256)) * 40
+
+    adapter = ExpiringUploadAdapter(len(data))
+    renewals = []
+
+    async def refresh_session(task):
+        renewals.append(task.upload_session.next_expected_ranges)
+        adapter.renewed = True
+        return LargeFileUploadSession(
+            upload_url=UPLOAD_URL,
+            expiration_date_time=datetime.now(timezone.utc) + timedelta(hours=1),
+            next_expected_ranges=adapter.missing_ranges(),
+        )
+
+    task = LargeFileUploadTask(
+        make_session(),
+        adapter,
+        BytesIO(data),
+        max_chunk_size=1024,
+        max_concurrency=2,
+        session_refresher=refresh_session
+    )
+    result = await task.upload()
+
+    assert result.upload_succeeded
+    assert len(renewals) == 1
+    assert renewals[0][0].startswith('3072-') or renewals[0][0].startswith('4096-')
+    assert len(adapter.requests) == len(set(adapter.requests)) == 10
+    assert adapter.assembled() == data
+
+
+@pytest.mark.asyncio
+async def test_upload_restarts_from_the_first_byte_on_a_new_session():
+    data = bytes(range(256)) * 40
+    adapter = ExpiringUploadAdapter(len(data))
+
+    async def refresh_session(task):
+        adapter.renewed = True
+        adapter.received.clear()
+        session = make_session()
+        session.upload_url = UPLOAD_URL + '/renewed'
+        return session
+
+    task = LargeFileUploadTask(
+        make_session(),
+        adapter,
+        BytesIO(data),
+        max_chunk_size=1024,
+        session_refresher=refresh_session
+    )
+    result = await task.upload()
+
+    assert result.location == UPLOAD_URL + '/renewed'
+    assert adapter.requests[:4] == [(0, 1023), (1024, 2047), (2048, 3071), (0, 1023)]
+    assert adapter.assembled() == data
+
+
+@pytest.mark.asyncio
+async def test_new_session_cannot_restart_a_source_that_is_not_seekable():
+    data = bytes(range(256)) * 40
+    adapter = ExpiringUploadAdapter(len(data))
+
+    async def refresh_session(task):
+        session = make_session()
+        session.upload_url = UPLOAD_URL + '/renewed'
+        return session
+
+    task = LargeFileUploadTask(
+        make_session(),
+        adapter,
+        AsyncIteratorUploadSource([data], len(data)),
+        max_chunk_size=1024,
+        session_refresher=refresh_session
+    )
+    with pytest.raises(RuntimeError, match='not seekable'):
+        await task.upload()
+    assert len(adapter.requests) == 3
+
+
+@pytest.mark.asyncio
+async def test_expired_session_is_replaced_before_the_first_chunk():
+    data = b'0123456789' * 300
+    adapter = FakeUploadAdapter(len(data))
+    fresh = make_session()
+    fresh.upload_url = UPLOAD_URL + '/renewed'
+    expired = make_session()
+    expired.expiration_date_time = datetime.now(timezone.utc) - timedelta(minutes=1)
+
+    async def refresh_session(task):
+        return fresh
+
+    with pytest.raises(RuntimeError):
+        await LargeFileUploadTask(expired, adapter, BytesIO(data)).upload()
+
+    task = LargeFileUploadTask(
+        expired, adapter, BytesIO(data), max_chunk_size=1024, session_refresher=refresh_session
+    )
+    result = await task.upload()
+
+    assert result.location == UPLOAD_URL + '/renewed'
+    assert adapter.assembled() == data
+
+
+@pytest.mark.asyncio
+async def test_upload_streams_progress_events():
+    data = bytes(range(256)) * 40
+    adapter = FakeUploadAdapter(len(data))
+    adapter.received[0] = data[:1024]
+    task = LargeFileUploadTask(
+        make_session(['1024-']), adapter, BytesIO(data), max_chunk_size=1024, max_concurrency=3
+    )
+    stream = task.events()
+
+    async def consume():
+        return [event async for event in stream]
+
+    consumer = asyncio.ensure_future(consume())
+    await task.upload()
+    events = await consumer
+
+    assert [event.event_type for event in events] == [UploadEventType.CHUNK_ACKNOWLEDGED] * 9 + [
+        UploadEventType.COMPLETED
+    ]
+    assert [event.bytes_acknowledged for event in events
+            ] == [2048 + 1024 * index for index in range(9)] + [len(data)]
+    assert all(event.total_bytes == len(data) for event in events)
+    assert max(event.in_flight for event in events) == 3
+    assert events[0].chunk_latency is not None and events[0].chunk_throughput > 0
+    assert events[-1].average_throughput > 0
+
+
+@pytest.mark.asyncio
+async def test_observers_receive_retries_and_failures(monkeypatch):
+
+    async def fake_sleep(delay):
+        pass
+
+    class FailingAdapter(FakeUploadAdapter):
+
+        async def send_async(self, info, factory, error_map):
+            if info.http_method != Method.GET:
+                raise APIError('unavailable', response_status_code=503)
+            return await super().send_async(info, factory, error_map)
+
+    class Recorder(UploadObserver):
+
+        def __init__(self):
+            self.events = []
+
+        def on_event(self, event):
+            self.events.append(event)
+
+    class BrokenObserver(UploadObserver):
+
+        def on_event(self, event):
+            raise ValueError('dashboard down')
+
+    monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+    recorder = Recorder()
+    task = LargeFileUploadTask(
+        make_session(),
+        FailingAdapter(2048),
+        BytesIO(bytes(2048)),
+        max_chunk_size=1024,
+        retry_policy=ChunkRetryPolicy(max_retries=2)
+    )
+    task.add_observer(BrokenObserver())
+    task.add_observer(recorder)
+    with pytest.raises(APIError):
+        await task.upload()
+
+    assert [event.event_type for event in recorder.events] == [
+        UploadEventType.CHUNK_RETRIED, UploadEventType.CHUNK_RETRIED, UploadEventType.FAILED
+    ]
+    assert recorder.events[1].retries == 1
+    assert recorder.events[0].chunk_range == (0, 1023)
+    assert isinstance(recorder.events[-1].error, APIError)
+    assert recorder.events[-1].is_final
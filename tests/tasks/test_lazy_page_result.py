@@ -0,0 +1,132 @@
+import json
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Optional
+
+import pytest
+from kiota_abstractions.serialization import Parsable, ParseNode
+from kiota_serialization_json.json_parse_node import JsonParseNode
+
+from msgraph_core.models import LazyItem, LazyPageResult
+from msgraph_core.tasks.page_iterator import PageIterator
+
+PAGE = {
+    '@odata.context':
+    'https://graph.microsoft.com/v1.0/$metadata#users',
+    '@odata.nextLink':
+    'https://graph.microsoft.com/v1.0/users?$skiptoken=abc',
+    'value': [
+        {
+            'id': '1',
+            'displayName': 'Adele Vance',
+            'createdDateTime': '2024-05-01T10:00:00Z',
+        },
+        {
+            'id': '2',
+            'displayName': 'Alex Wilber',
+            'manager': {
+                'displayName': 'Megan Bowen'
+            },
+            'businessPhones': ['+1 425 555 0109'],
+            'accountEnabled': True,
+            'mail': None,
+        },
+    ],
+}
+
+
+@dataclass
+class User(Parsable):
+    created = 0
+
+    id: Optional[str] = None
+    display_name: Optional[str] = None
+    additional_data: dict = field(default_factory=dict)
+
+    @staticmethod
+    def create_from_discriminator_value(parse_node: Optional[ParseNode] = None) -> 'User':
+        User.created += 1
+        return User()
+
+    def get_field_deserializers(self):
+        return {
+            'id': lambda node: setattr(self, 'id', node.get_str_value()),
+            'displayName': lambda node: setattr(self, 'display_name', node.get_str_value()),
+        }
+
+    def serialize(self, writer):
+        writer.write_str_value('id', self.id)
+
+
+def parse_page():
+    return JsonParseNode(json.loads(json.dumps(PAGE))).get_object_value(LazyPageResult)
+
+
+def test_items_are_kept_as_json():
+    User.created = 0
+    page = parse_page()
+
+    assert page.odata_next_link == 'https://graph.microsoft.com/v1.0/users?$skiptoken=abc'
+    assert all(isinstance(item, LazyItem) for item in page.value)
+    assert [item['id'] for item in page.value] == ['1', '2']
+    assert dict(page.value[0]) == PAGE['value'][0]
+    assert User.created == 0
+
+
+def test_properties_are_deserialized_on_demand():
+    item = parse_page().value[0]
+
+    created = item.get_value('createdDateTime', lambda node: node.get_datetime_value())
+
+    assert created == datetime(2024, 5, 1, 10, tzinfo=timezone.utc)
+    assert item.get_value('createdDateTime', lambda node: node.get_datetime_value()) is created
+    assert item.get_value('mail', lambda node: node.get_str_value()) is None
+
+
+def test_objects_are_deserialized_once_when_requested():
+    User.created = 0
+    page = parse_page()
+
+    selected = [item.get_object_value(User) for item in page.value if item['id'] == '2']
+    assert User.created == 1
+    assert selected[0].display_name == 'Alex Wilber'
+    assert page.value[1].get_object_value(User) is selected[0]
+    assert User.created == 1
+
+
+def test_page_iterator_keeps_following_pages_lazy():
+    page_iterator = PageIterator(parse_page(), None)
+
+    assert page_iterator.parsable_factory is LazyPageResult
+
+
+def test_json_values_are_read_when_used():
+    item = parse_page().value[1]
+
+    assert item['manager']['displayName'] == 'Megan Bowen'
+    assert isinstance(item['manager'], LazyItem)
+    assert item['businessPhones'] == ['+1 425 555 0109']
+    assert item['accountEnabled'] is True
+    assert 'mail' not in item
+    assert item.get_value('mail', lambda node: node.get_str_value()) is None
+
+
+class PublicParseNode:
+    """Exposes only the public API of a parse node."""
+
+    def __init__(self, parse_node):
+        self.parse_node = parse_node
+
+    def __getattr__(self, name):
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self.parse_node, name)
+
+
+def test_pages_are_read_through_the_public_parse_node_api():
+    page = LazyPageResult()
+    value = JsonParseNode(json.loads(json.dumps(PAGE['value'])))
+
+    page.get_field_deserializers()['value'](PublicParseNode(value))
+
+    assert [item['id'] for item in page.value] == ['1', '2']
@@ -0,0 +1,155 @@
+import asyncio
+from contextlib import aclosing
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
+
+from msgraph_core.models.page_result import PageResult
+from msgraph_core.tasks.multi_page_iterator import MultiPageIterator, SourcedItem
+from tests.conftest import PagesAdapter, make_pages
+
+BASE_URL = 'https://graph.microsoft.com/v1.0/users/'
+
+
+def make_collection(pages, user, size=2, count=3):
+    """Registers the pages following the first one and returns the first page."""
+    first, following = make_pages(
+        count,
+        size,
+        url=f'{BASE_URL}{user}/messages?page=',
+        make_item=lambda index: f'{user}-{index}'
+    )
+    pages.update(following)
+    return first
+
+
+def make_request(url):
+    request_info = RequestInformation()
+    request_info.http_method = Method.GET
+    request_info.url = url
+    return request_info
+
+
+@pytest.mark.asyncio
+async def test_items_are_tagged_with_their_source_and_kept_in_order():
+    pages = {}
+    sources = {user: make_collection(pages, user) for user in ('a', 'b', 'c')}
+    adapter = PagesAdapter(pages, latency=0.01)
+
+    items = [item async for item in MultiPageIterator(adapter, sources)]
+
+    assert all(isinstance(item, SourcedItem) for item in items)
+    for user in sources:
+        assert [item.item for item in items
+                if item.source == user] == [f'{user}-{index}' for index in range(6)]
+    # The collections were iterated concurrently, so their items are interleaved.
+    assert [item.source for item in items[:3]] != ['a', 'a', 'a']
+
+
+@pytest.mark.asyncio
+async def test_headers_are_sent_with_the_requests_for_following_pages():
+    pages = {}
+    sources = {user: make_collection(pages, user) for user in ('a', 'b')}
+    adapter = PagesAdapter(pages, latency=0.01)
+
+    iterator = MultiPageIterator(adapter, sources, headers={'ConsistencyLevel': 'eventual'})
+    items = [item async for item in iterator]
+
+    assert len(items) == 12
+    assert adapter.request_headers == [{'consistencylevel': {'eventual'}}] * 4
+
+
+@pytest.mark.asyncio
+async def test_page_requests_stay_within_the_concurrency_limit():
+    pages = {}
+    sources = [make_collection(pages, f'user{index}') for index in range(10)]
+    adapter = PagesAdapter(pages, latency=0.01)
+
+    items = [item async for item in MultiPageIterator(adapter, sources, max_concurrency=3)]
+
+    assert len(items) == 60
+    assert {item.source for item in items} == set(range(10))
+    assert adapter.max_in_flight == 3
+
+
+@pytest.mark.asyncio
+async def test_first_pages_are_fetched_from_request_information():
+    pages = {}
+    first = make_collection(pages, 'a')
+    pages[f'{BASE_URL}a/messages'] = first
+    adapter = PagesAdapter(pages, latency=0.01)
+
+    iterator = MultiPageIterator(
+        adapter, {'a': make_request(f'{BASE_URL}a/messages')}, parsable_factory=PageResult
+    )
+    items = [item.item async for item in iterator]
+
+    assert items == [f'a-{index}' for index in range(6)]
+    assert adapter.requests[0] == f'{BASE_URL}a/messages'
+
+
+@pytest.mark.asyncio
+async def test_request_information_requires_a_parsable_factory():
+    iterator = MultiPageIterator(Mock(), [make_request(f'{BASE_URL}a/messages')])
+    with pytest.raises(ValueError):
+        _ = [item async for item in iterator]
+
+
+@pytest.mark.asyncio
+async def test_a_failing_source_stops_the_iteration():
+    pages = {}
+    sources = {user: make_collection(pages, user) for user in ('a', 'b')}
+    pages[f'{BASE_URL}b/messages?page=2'] = RuntimeError('throttled')
+    adapter = PagesAdapter(pages, latency=0.01)
+
+    with pytest.raises(RuntimeError):
+        _ = [item async for item in MultiPageIterator(adapter, sources)]
+
+
+@pytest.mark.asyncio
+async def test_failing_sources_are_skipped_when_exceptions_are_returned():
+    pages = {}
+    sources = {user: make_collection(pages, user) for user in ('a', 'b')}
+    error = RuntimeError('throttled')
+    pages[f'{BASE_URL}b/messages?page=2'] = error
+    adapter = PagesAdapter(pages, latency=0.01)
+
+    iterator = MultiPageIterator(adapter, sources, return_exceptions=True)
+    items = [item async for item in iterator]
+
+    assert [item.item for item in items if item.source == 'a'] == [f'a-{i}' for i in range(6)]
+    assert [item.item for item in items if item.source == 'b'] == ['b-0', 'b-1']
+    assert iterator.errors == {'b': error}
+
+
+@pytest.mark.asyncio
+async def test_stopping_early_cancels_the_remaining_requests():
+    pages = {}
+    sources = [make_collection(pages, f'user{index}', count=20) for index in range(4)]
+    adapter = PagesAdapter(pages, latency=0.01)
+
+    iterator = MultiPageIterator(adapter, sources, max_buffered_items=1)
+    async with aclosing(aiter(iterator)) as items:
+        async for _ in items:
+            break
+    requests = len(adapter.requests)
+    await asyncio.sleep(0.05)
+
+    assert len(adapter.requests) == requests
+    assert adapter.in_flight == 0
+
+
+def test_limits_must_be_positive():
+    with pytest.raises(ValueError):
+        MultiPageIterator(Mock(), [], max_concurrency=0)
+    with pytest.raises(ValueError):
+        MultiPageIterator(Mock(), [], max_buffered_items=0)
+
+
+@pytest.mark.asyncio
+async def test_no_sources_yield_no_items():
+    adapter = Mock()
+    adapter.send_async = AsyncMock()
+    assert [item async for item in MultiPageIterator(adapter, [])] == []
@@ -0,0 +1,137 @@
+import csv
+import io
+import sys
+from dataclasses import dataclass, field
+
+import pytest
+
+from msgraph_core.tasks.page_export import (
+    ArrowIpcBatchWriter,
+    BatchWriter,
+    CsvBatchWriter,
+    PageExporter,
+    ParquetBatchWriter,
+    get_field,
+)
+from msgraph_core.tasks.page_iterator import PageIterator
+from tests.conftest import PagesAdapter, make_pages
+
+
+@dataclass
+class User:
+    id: str
+    display_name: str
+    additional_data: dict = field(default_factory=dict)
+
+
+def make_user(index):
+    return {
+        'id': str(index),
+        'displayName': f'User {index}',
+        'manager': {
+            'displayName': f'Manager {index % 2}'
+        } if index % 3 else None,
+    }
+
+
+def make_page_iterator(count=3, size=4):
+    first, pages = make_pages(count, size, make_item=make_user)
+    return PageIterator(first, PagesAdapter(pages))
+
+
+class ListWriter(BatchWriter):
+
+    def __init__(self):
+        self.batches = []
+        self.closed = False
+
+    def write_batch(self, batch):
+        self.batches.append(batch)
+
+    def close(self):
+        self.closed = True
+
+
+def test_get_field_reads_mappings_attributes_and_additional_data():
+    user = User('1', 'Adele', {'manager': {'displayName': 'Alex'}})
+    assert get_field(user, 'display_name') == 'Adele'
+    assert get_field(user, 'manager.displayName') == 'Alex'
+    assert get_field({'manager': None}, 'manager.displayName') is None
+    assert get_field({}, 'missing') is None
+
+
+@pytest.mark.asyncio
+async def test_items_are_projected_into_batches_of_the_batch_size():
+    exporter = PageExporter(make_page_iterator(), ['id', 'manager.displayName'], batch_size=5)
+    batches = [batch async for batch in exporter.batches()]
+    assert [len(batch['id']) for batch in batches] == [5, 5, 2]
+    assert batches[0]['id'] == ['0', '1', '2', '3', '4']
+    assert batches[0]['manager.displayName'] == [None, 'Manager 1', 'Manager 0', None, 'Manager 0']
+
+
+@pytest.mark.asyncio
+async def test_columns_can_be_named_and_computed():
+    exporter = PageExporter(
+        make_page_iterator(count=1), {
+            'user_id': 'id',
+            'name_length': lambda item: len(item['displayName'])
+        }
+    )
+    writer = ListWriter()
+    assert await exporter.export(writer) == 4
+    assert writer.batches == [{'user_id': ['0', '1', '2', '3'], 'name_length': [6, 6, 6, 6]}]
+    assert writer.closed
+
+
+@pytest.mark.asyncio
+async def test_export_to_csv():
+    output = io.StringIO()
+    exporter = PageExporter(
+        make_page_iterator(count=2, size=2), ['id', 'displayName', 'manager.displayName'],
+        batch_size=3
+    )
+    assert await exporter.export(CsvBatchWriter(output)) == 4
+    rows = list(csv.reader(io.StringIO(output.getvalue())))
+    assert rows == [
+        ['id', 'displayName', 'manager.displayName'],
+        ['0', 'User 0', ''],
+        ['1', 'User 1', 'Manager 1'],
+        ['2', 'User 2', 'Manager 0'],
+        ['3', 'User 3', ''],
+    ]
+
+
+@pytest.mark.asyncio
+async def test_export_to_a_csv_path(tmp_path):
+    path = tmp_path / 'users.csv'
+    exporter = PageExporter(make_page_iterator(), ['id'])
+    assert await exporter.export(CsvBatchWriter(path, delimiter=';')) == 12
+    assert path.read_text(encoding='utf-8').splitlines()[:3] == ['id', '0', '1']
+
+
+@pytest.mark.asyncio
+async def test_export_to_arrow_ipc_and_parquet(tmp_path):
+    pyarrow = pytest.importorskip('pyarrow')
+    parquet = pytest.importorskip('pyarrow.parquet')
+    columns = ['id', 'manager.displayName']
+    await PageExporter(make_page_iterator(), columns,
+                       batch_size=5).export(ArrowIpcBatchWriter(tmp_path / 'users.arrow'))
+    await PageExporter(make_page_iterator(), columns,
+                       batch_size=5).export(ParquetBatchWriter(tmp_path / 'users.parquet'))
+    with pyarrow.ipc.open_file(tmp_path / 'users.arrow') as reader:
+        assert reader.num_record_batches == 3
+        assert reader.read_all().column('id').to_pylist() == [str(index) for index in range(12)]
+    assert parquet.read_table(tmp_path / 'users.parquet').num_rows == 12
+
+
+def test_arrow_writers_require_pyarrow(monkeypatch, tmp_path):
+    monkeypatch.setitem(sys.modules, 'pyarrow', None)
+    with pytest.raises(ImportError, match='requires pyarrow'):
+        ArrowIpcBatchWriter(tmp_path / 'users.arrow')
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        PageExporter(make_page_iterator(), ['id'], batch_size=0)
+    with pytest.raises(ValueError):
+        PageExporter(make_page_iterator(), [])
@@ -1,15 +1,22 @@
+import asyncio
+import json
 import os
+from contextlib import aclosing
 from unittest.mock import AsyncMock, patch, Mock
 
+import httpx
 import pytest
 from azure.identity import ClientSecretCredential
+from kiota_abstractions.authentication import AnonymousAuthenticationProvider
 from kiota_authentication_azure.azure_identity_authentication_provider\
      import AzureIdentityAuthenticationProvider
 from kiota_http.httpx_request_adapter import HttpxRequestAdapter
 from dotenv import load_dotenv
 
+from msgraph_core.base_graph_request_adapter import BaseGraphRequestAdapter
 from msgraph_core.tasks.page_iterator import PageIterator  # pylint: disable=import-error, no-name-in-module
 from msgraph_core.models.page_result import PageResult  # pylint: disable=no-name-in-module, import-error
+from tests.conftest import USERS_URL, PagesAdapter, make_pages
 
 
 @pytest.fixture
@@ -111,3 +118,190 @@ async def test_iterate():
             await page_iterator.iterate(lambda _: True)
             assert mock_next.call_count == 2
             assert mock_enumerate.call_count == 2
+
+
+def make_page(items, next_link=None):
+    return PageResult(odata_next_link=next_link, value=items)
+
+
+@pytest.mark.asyncio
+async def test_async_iteration_fetches_pages_lazily():
+    pages = {
+        f'{USERS_URL}2': make_page([3, 4], f'{USERS_URL}3'),
+        f'{USERS_URL}3': make_page([], f'{USERS_URL}4'),
+        f'{USERS_URL}4': make_page([5]),
+    }
+    adapter = PagesAdapter(pages)
+    page_iterator = PageIterator(make_page([1, 2], f'{USERS_URL}2'), adapter)
+
+    items = []
+    async for item in page_iterator:
+        items.append(item)
+        if item == 2:
+            assert not adapter.requests
+
+    assert items == [1, 2, 3, 4, 5]
+    assert adapter.requests == [f'{USERS_URL}2', f'{USERS_URL}3', f'{USERS_URL}4']
+
+
+@pytest.mark.asyncio
+async def test_pages_stop_fetching_when_the_consumer_stops():
+    first, pages = make_pages(size=2)
+    adapter = PagesAdapter(pages)
+    page_iterator = PageIterator(first, adapter)
+
+    async for page in page_iterator.pages():
+        assert page.value == [0, 1]
+        break
+
+    assert not adapter.requests
+
+
+@pytest.mark.asyncio
+async def test_async_iteration_resumes_after_a_paused_callback():
+    first, pages = make_pages(count=2, size=2)
+    page_iterator = PageIterator(first, PagesAdapter(pages))
+    await page_iterator.iterate(lambda item: item != 0)
+
+    assert [item async for item in page_iterator] == [1, 2, 3]
+    assert [page.value async for page in page_iterator.pages()] == [[2, 3]]
+
+
+def test_negative_prefetch_depth_is_rejected():
+    with pytest.raises(ValueError):
+        PageIterator(make_page([1]), Mock(), prefetch_depth=-1)
+
+
+@pytest.mark.asyncio
+async def test_prefetch_fetches_the_next_page_while_the_current_one_is_processed():
+    first, pages = make_pages(size=2)
+    adapter = PagesAdapter(pages, latency=0.01)
+    page_iterator = PageIterator(first, adapter, prefetch_depth=1)
+
+    items = []
+    async for item in page_iterator:
+        items.append(item)
+        if item == 0:
+            await asyncio.sleep(0.05)
+            # Only the page after the current one has been fetched.
+            assert adapter.requests == [f'{USERS_URL}2']
+
+    assert items == [0, 1, 2, 3, 4, 5]
+    assert len(adapter.requests) == 2
+    assert page_iterator._prefetcher is None
+
+
+@pytest.mark.asyncio
+async def test_prefetch_is_cancelled_when_the_consumer_stops():
+    first, pages = make_pages(count=4, size=1)
+    adapter = PagesAdapter(pages, latency=0.01)
+    page_iterator = PageIterator(first, adapter, prefetch_depth=2)
+
+    await page_iterator.iterate(lambda item: item != 1)
+    await asyncio.sleep(0.05)
+
+    assert page_iterator._prefetcher is None
+    assert len(adapter.requests) < 3
+    assert adapter.in_flight == 0
+    assert page_iterator.current_page.value == [1]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_raises_the_errors_of_the_fetched_pages():
+    adapter = PagesAdapter({f'{USERS_URL}2': RuntimeError('boom')})
+    page_iterator = PageIterator(make_page([1], f'{USERS_URL}2'), adapter, prefetch_depth=1)
+
+    with pytest.raises(RuntimeError):
+        await page_iterator.iterate(lambda _: True)
+    assert page_iterator._prefetcher is None
+
+
+def make_streaming_adapter(pages, chunk_size=16):
+    """A BaseGraphRequestAdapter whose transport streams the JSON pages keyed by URL."""
+    requests = []
+
+    async def handler(request):
+        requests.append(str(request.url))
+        body = json.dumps(pages[str(request.url)]).encode('utf-8')
+
+        async def stream():
+            for start in range(0, len(body), chunk_size):
+                yield body[start:start + chunk_size]
+
+        return httpx.Response(200, content=stream())
+
+    adapter = BaseGraphRequestAdapter(
+        AnonymousAuthenticationProvider(),
+        http_client=httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    )
+    return adapter, requests
+
+
+@pytest.mark.asyncio
+async def test_stream_items_decodes_the_items_of_the_following_pages():
+    adapter, requests = make_streaming_adapter({
+        'https://graph.microsoft.com/v1.0/users?page=2': {
+            'value': [{'id': '3'}, {'id': '4'}],
+            '@odata.nextLink': 'https://graph.microsoft.com/v1.0/users?page=3',
+        },
+        'https://graph.microsoft.com/v1.0/users?page=3': {
+            'value': [{'id': '5'}],
+            '@odata.deltaLink': 'https://graph.microsoft.com/v1.0/users/delta?token=1',
+        },
+    })
+    page_iterator = PageIterator(
+        make_page([{'id': '1'}, {'id': '2'}], 'https://graph.microsoft.com/v1.0/users?page=2'),
+        adapter
+    )
+
+    items = [item async for item in page_iterator.stream_items()]
+
+    assert [item['id'] for item in items] == ['1', '2', '3', '4', '5']
+    assert len(requests) == 2
+    assert page_iterator.delta_link == 'https://graph.microsoft.com/v1.0/users/delta?token=1'
+
+
+@pytest.mark.asyncio
+async def test_stream_items_resumes_within_an_interrupted_page():
+    adapter, requests = make_streaming_adapter({
+        'https://graph.microsoft.com/v1.0/users?page=2': {
+            'value': [{'id': '2'}, {'id': '3'}, {'id': '4'}]
+        },
+    })
+    page_iterator = PageIterator(
+        make_page([{'id': '1'}], 'https://graph.microsoft.com/v1.0/users?page=2'), adapter
+    )
+
+    async with aclosing(page_iterator.stream_items(lambda item: item['id'])) as items:
+        async for item in items:
+            if item == '3':
+                break
+
+    assert [item async for item in page_iterator.stream_items(lambda item: item['id'])] == ['4']
+    assert len(requests) == 2
+
+
+@pytest.mark.asyncio
+async def test_stream_items_requires_a_streaming_adapter():
+    page_iterator = PageIterator(
+        make_page([1], 'https://graph.microsoft.com/v1.0/users?page=2'), Mock(spec=[])
+    )
+    with pytest.raises(TypeError):
+        _ = [item async for item in page_iterator.stream_items()]
+
+
+@pytest.mark.asyncio
+async def test_prefetch_overlaps_the_fetches_with_a_synchronous_callback():
+    first, pages = make_pages(count=4, size=1)
+    adapter = PagesAdapter(pages, latency=0.01)
+    page_iterator = PageIterator(first, adapter, prefetch_depth=1)
+    requested_before_callback = []
+
+    def callback(item):
+        requested_before_callback.append(len(adapter.requests))
+        return True
+
+    await page_iterator.iterate(callback)
+
+    # The request for the next page is in flight while each page is processed.
+    assert requested_before_callback == [1, 2, 3, 3]
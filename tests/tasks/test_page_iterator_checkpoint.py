@@ -0,0 +1,149 @@
+import threading
+from contextlib import aclosing
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from msgraph_core.models.page_result import PageResult
+from msgraph_core.tasks.checkpoint_store import InMemoryCheckpointStore, JsonFileCheckpointStore
+from msgraph_core.tasks.page_iterator import PageIterator
+from msgraph_core.tasks.page_iterator_checkpoint import PageIteratorCheckpoint
+from tests.conftest import USERS_URL, PagesAdapter, make_pages
+
+
+def test_checkpoint_round_trips_through_a_dict():
+    checkpoint = PageIteratorCheckpoint(
+        f'{USERS_URL}2', 3, headers={'consistencylevel': ['eventual']}, pages_processed=1
+    )
+    assert PageIteratorCheckpoint.from_dict(checkpoint.to_dict()) == checkpoint
+    assert not checkpoint.is_complete
+    assert PageIteratorCheckpoint(None).is_complete
+
+
+def test_checkpoints_require_a_key():
+    with pytest.raises(ValueError):
+        PageIterator(PageResult(None, [1]), Mock(), checkpoint_store=InMemoryCheckpointStore())
+    with pytest.raises(ValueError):
+        PageIterator(PageResult(None, [1]), Mock(), checkpoint_interval=0)
+
+
+@pytest.mark.asyncio
+async def test_a_failed_iteration_resumes_from_the_page_it_stopped_on(tmp_path):
+    first, pages = make_pages()
+    adapter = PagesAdapter(pages, failures=[f'{USERS_URL}3'])
+    store = JsonFileCheckpointStore(tmp_path)
+    page_iterator = PageIterator(first, adapter, checkpoint_store=store, checkpoint_key='users')
+    page_iterator.set_headers({'ConsistencyLevel': 'eventual'})
+    processed = []
+
+    with pytest.raises(RuntimeError):
+        await page_iterator.iterate(lambda item: processed.append(item) or True)
+
+    assert processed == [0, 1, 2, 3, 4, 5]
+    assert store.load('users') == {
+        'page_link': f'{USERS_URL}3',
+        'pause_index': 0,
+        'delta_link': None,
+        'headers': {
+            'consistencylevel': ['eventual']
+        },
+        'pages_processed': 2,
+    }
+
+    resumed = await PageIterator.from_checkpoint(store, 'users', adapter)
+    await resumed.iterate(lambda item: processed.append(item) or True)
+
+    assert processed == list(range(9))
+    assert resumed.headers.get('consistencylevel') == {'eventual'}
+    assert PageIteratorCheckpoint.from_dict(store.load('users')).is_complete
+
+
+@pytest.mark.asyncio
+async def test_a_paused_callback_resumes_within_the_page():
+    first, pages = make_pages()
+    adapter = PagesAdapter(pages)
+    store = InMemoryCheckpointStore()
+    page_iterator = PageIterator(first, adapter, checkpoint_store=store, checkpoint_key='users')
+
+    await page_iterator.iterate(lambda item: item != 4)
+
+    assert store.load('users')['page_link'] == f'{USERS_URL}2'
+    assert store.load('users')['pause_index'] == 2
+    resumed = await PageIterator.from_checkpoint(store, 'users', adapter)
+    assert [item async for item in resumed] == [5, 6, 7, 8]
+
+
+@pytest.mark.asyncio
+async def test_breaking_out_of_async_for_saves_the_exact_position():
+    first, pages = make_pages()
+    adapter = PagesAdapter(pages)
+    store = InMemoryCheckpointStore()
+    page_iterator = PageIterator(first, adapter, checkpoint_store=store, checkpoint_key='users')
+
+    async with aclosing(aiter(page_iterator)) as items:
+        async for item in items:
+            if item == 6:
+                break
+
+    resumed = await PageIterator.from_checkpoint(store, 'users', adapter)
+    assert [item async for item in resumed] == [7, 8]
+
+
+@pytest.mark.asyncio
+async def test_the_first_page_cannot_be_checkpointed_before_it_is_processed():
+    first, pages = make_pages()
+    store = InMemoryCheckpointStore()
+    page_iterator = PageIterator(
+        first, PagesAdapter(pages), checkpoint_store=store, checkpoint_key='users'
+    )
+
+    await page_iterator.iterate(lambda item: item != 1)
+
+    assert store.load('users') is None
+    with pytest.raises(ValueError):
+        page_iterator.get_checkpoint()
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_are_saved_every_interval():
+    first, pages = make_pages(count=5, size=1)
+    store = Mock(wraps=InMemoryCheckpointStore())
+    page_iterator = PageIterator(
+        first,
+        # Lets each save complete before the next one is submitted.
+        PagesAdapter(pages, latency=0.01),
+        checkpoint_store=store,
+        checkpoint_key='users',
+        checkpoint_interval=2
+    )
+
+    await page_iterator.iterate(lambda item: True)
+
+    saved = [call.args[1]['page_link'] for call in store.save.call_args_list]
+    assert saved == [f'{USERS_URL}3', f'{USERS_URL}5', None]
+    assert page_iterator.pages_processed == 5
+
+
+@pytest.mark.asyncio
+async def test_there_is_nothing_to_resume_without_a_checkpoint():
+    adapter = Mock()
+    adapter.send_async = AsyncMock()
+    assert await PageIterator.from_checkpoint(InMemoryCheckpointStore(), 'users', adapter) is None
+    adapter.send_async.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_checkpoints_are_saved_off_the_event_loop():
+    first, pages = make_pages()
+    store = InMemoryCheckpointStore()
+    page_iterator = PageIterator(
+        first, PagesAdapter(pages), checkpoint_store=store, checkpoint_key='users'
+    )
+    saving_threads = []
+    save = store.save
+    store.save = lambda *args: saving_threads.append(threading.get_ident()) or save(*args)
+
+    await page_iterator.iterate(lambda item: True)
+
+    assert saving_threads and threading.get_ident() not in saving_threads
+    assert PageIteratorCheckpoint.from_dict(store.load('users')).is_complete
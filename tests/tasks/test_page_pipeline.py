@@ -0,0 +1,141 @@
+import asyncio
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import pytest
+
+from msgraph_core.tasks.page_iterator import PageIterator
+from msgraph_core.tasks.page_pipeline import PagePipeline
+from tests.conftest import PagesAdapter, make_pages
+
+
+class CountingSource:
+    """An async iterable of numbers that records how many were taken."""
+
+    def __init__(self, count):
+        self.count = count
+        self.produced = 0
+        self.closed = False
+
+    async def _items(self):
+        try:
+            for number in range(self.count):
+                self.produced += 1
+                yield number
+        finally:
+            self.closed = True
+
+    def __aiter__(self):
+        return self._items()
+
+
+def square(number):
+    return number * number
+
+
+@pytest.mark.asyncio
+async def test_async_handlers_run_concurrently_up_to_the_number_of_workers():
+    handled = []
+    running = 0
+    max_running = 0
+
+    async def handler(item):
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.001)
+        running -= 1
+        handled.append(item)
+
+    processed = await PagePipeline(CountingSource(50), handler, workers=5).run()
+    assert processed == 50
+    assert sorted(handled) == list(range(50))
+    assert max_running == 5
+
+
+@pytest.mark.asyncio
+async def test_plain_functions_run_in_the_executor():
+    threads = set()
+
+    def handler(item):
+        threads.add(threading.get_ident())
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        processed = await PagePipeline(CountingSource(20), handler, workers=2,
+                                       executor=executor).run()
+    assert processed == 20
+    assert threading.get_ident() not in threads
+
+
+@pytest.mark.asyncio
+async def test_plain_functions_can_run_in_a_process_pool():
+    with ProcessPoolExecutor(max_workers=2) as executor:
+        processed = await PagePipeline(CountingSource(5), square, executor=executor).run()
+    assert processed == 5
+
+
+@pytest.mark.asyncio
+async def test_the_source_pauses_while_the_queue_is_full():
+    source = CountingSource(100)
+    release = asyncio.Event()
+
+    async def handler(item):
+        await release.wait()
+
+    pipeline = PagePipeline(source, handler, workers=2, max_queued_items=5)
+    task = asyncio.ensure_future(pipeline.run())
+    await asyncio.sleep(0.01)
+    # Two items being handled, five queued and one waiting to be queued.
+    assert source.produced == 8
+    release.set()
+    assert await task == 100
+
+
+@pytest.mark.asyncio
+async def test_a_handler_returning_false_stops_the_pipeline():
+    source = CountingSource(1000)
+
+    async def handler(item):
+        return item < 10
+
+    processed = await PagePipeline(source, handler, workers=1, max_queued_items=2).run()
+    assert processed == 11
+    assert source.produced < 20
+    assert source.closed
+
+
+@pytest.mark.asyncio
+async def test_the_first_handler_error_is_raised():
+    source = CountingSource(1000)
+
+    async def handler(item):
+        if item == 7:
+            raise ValueError('Cannot handle 7.')
+
+    with pytest.raises(ValueError, match='Cannot handle 7.'):
+        await PagePipeline(source, handler, workers=3, max_queued_items=4).run()
+    assert source.produced < 20
+    assert source.closed
+
+
+@pytest.mark.asyncio
+async def test_page_iterator_iterates_concurrently():
+    first_page, pages = make_pages(count=4, size=5)
+    adapter = PagesAdapter(pages)
+    page_iterator = PageIterator(first_page, adapter)
+    handled = []
+
+    async def handler(item):
+        await asyncio.sleep(0)
+        handled.append(item)
+
+    assert await page_iterator.iterate_concurrently(handler, workers=3) == 20
+    assert sorted(handled) == list(range(20))
+    assert len(adapter.requests) == 3
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        PagePipeline(CountingSource(1), square, workers=0)
+    with pytest.raises(ValueError):
+        PagePipeline(CountingSource(1), square, max_queued_items=0)
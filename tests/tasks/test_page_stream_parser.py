@@ -0,0 +1,92 @@
+import json
+
+import pytest
+
+from msgraph_core.tasks.page_stream_parser import JsonPageStreamParser
+
+PAGE = {
+    '@odata.context':
+    'https://graph.microsoft.com/v1.0/$metadata#users',
+    'value': [
+        {
+            'id': '1',
+            'displayName': 'Zoë "Z" Adams',
+            'businessPhones': ['425-555-0100'],
+            'manager': {
+                'id': '9',
+                'tags': [1, 2.5, None, True]
+            }
+        },
+        12345,
+        'text with ] and } and ,',
+        [],
+        {},
+    ],
+    '@odata.count':
+    1024,
+    '@odata.nextLink':
+    'https://graph.microsoft.com/v1.0/users?$skiptoken=abc',
+}
+
+
+def parse(document, chunk_size):
+    parser = JsonPageStreamParser()
+    items = []
+    for start in range(0, len(document), chunk_size):
+        items.extend(parser.feed(document[start:start + chunk_size]))
+    items.extend(parser.close())
+    return parser, items
+
+
+@pytest.mark.parametrize('chunk_size', [1, 2, 7, 64, 10000])
+def test_items_and_properties_are_parsed_whatever_the_chunk_size(chunk_size):
+    document = json.dumps(PAGE, indent=2, ensure_ascii=False).encode('utf-8')
+
+    parser, items = parse(document, chunk_size)
+
+    assert items == PAGE['value']
+    assert parser.item_count == len(PAGE['value'])
+    assert parser.properties == {key: value for key, value in PAGE.items() if key != 'value'}
+
+
+def test_items_are_returned_as_soon_as_they_are_complete():
+    parser = JsonPageStreamParser()
+
+    assert parser.feed(b'{"value": [{"id": "1"}, {"id": "2"') == [{'id': '1'}]
+    assert parser.feed(b'}, 3') == [{'id': '2'}]
+    # The number may continue in the next chunk.
+    assert parser.feed(b'4') == []
+    assert parser.feed(b']}') == [34]
+    assert parser.close() == []
+
+
+def test_compact_documents_without_items_are_parsed():
+    parser, items = parse(b'{"value":[],"@odata.deltaLink":"https://example.org"}', 5)
+
+    assert items == []
+    assert parser.properties == {'@odata.deltaLink': 'https://example.org'}
+    assert parse(b'{}', 1)[1] == []
+
+
+def test_the_collection_property_can_be_renamed():
+    parser = JsonPageStreamParser(collection_property='items')
+
+    assert parser.feed(b'{"value": [1], "items": [2, 3]}') == [2, 3]
+    assert parser.close() == []
+    assert parser.properties == {'value': [1]}
+
+
+@pytest.mark.parametrize(
+    'document', [
+        b'',
+        b'[1, 2]',
+        b'{"value": [1, 2}',
+        b'{"value": [1, 2]',
+        b'{"value": [1, 2]} {}',
+        b'{"value" [1]}',
+        b'{"value": [tru]}',
+    ]
+)
+def test_invalid_documents_are_rejected(document):
+    with pytest.raises(ValueError):
+        parse(document, 3)
@@ -0,0 +1,143 @@
+import asyncio
+import random
+from contextlib import aclosing
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+from msgraph_core.models.page_result import PageResult
+from msgraph_core.tasks.partitioned_page_iterator import PartitionedPageIterator
+
+MESSAGES_URL = 'https://graph.microsoft.com/v1.0/me/messages'
+URL = f'{MESSAGES_URL}?$orderby=receivedDateTime&$filter=isRead eq false'
+
+
+class SkipAdapter:
+    """Serves a collection addressable with $top and $skip, with random latency."""
+
+    def __init__(self, items, max_page_size=1000, count=None):
+        self.items = items
+        self.max_page_size = max_page_size
+        self.count = len(items) if count is None else count
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.requests = []
+        self.count_requests = []
+
+    async def send_primitive_async(self, request_info, response_type, error_mapping):
+        self.count_requests.append(request_info)
+        return self.count
+
+    async def send_async(self, request_info, parsable_factory, error_mapping):
+        self.requests.append(request_info.url)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(random.uniform(0, 0.01))
+        finally:
+            self.in_flight -= 1
+        query = parse_qs(urlsplit(request_info.url).query)
+        top = int(query['$top'][0])
+        skip = int(query['$skip'][0])
+        size = min(top, self.max_page_size)
+        next_link = None
+        if size < top and skip + size < len(self.items):
+            next_link = f'{MESSAGES_URL}?$top={top - size}&$skip={skip + size}'
+        return PageResult(odata_next_link=next_link, value=self.items[skip:skip + size])
+
+
+async def collect(iterator):
+    return [item async for item in iterator]
+
+
+def test_window_url_replaces_top_and_skip():
+    iterator = PartitionedPageIterator(
+        SkipAdapter([]), URL + '&$top=5&$skip=3', PageResult, page_size=10
+    )
+    url = iterator.get_window_url(2)
+    assert '$orderby=receivedDateTime' in url
+    assert url.endswith('$top=10&$skip=20')
+    assert url.count('$top') == 1 and url.count('$skip') == 1
+
+
+@pytest.mark.asyncio
+async def test_ordered_iteration_returns_every_item_in_order():
+    items = list(range(95))
+    adapter = SkipAdapter(items)
+    iterator = PartitionedPageIterator(
+        adapter, URL, PageResult, page_size=10, total_count=95, max_concurrency=4
+    )
+    assert await collect(iterator) == items
+    assert len(adapter.requests) == 10
+    assert 1 < adapter.max_in_flight <= 4
+    assert not adapter.count_requests
+
+
+@pytest.mark.asyncio
+async def test_unordered_iteration_returns_every_item():
+    items = list(range(95))
+    adapter = SkipAdapter(items)
+    iterator = PartitionedPageIterator(
+        adapter, URL, PageResult, page_size=10, total_count=95, max_concurrency=4, ordered=False
+    )
+    result = await collect(iterator)
+    assert sorted(result) == items
+    assert adapter.max_in_flight <= 4
+
+
+@pytest.mark.asyncio
+async def test_count_is_read_from_the_count_segment():
+    adapter = SkipAdapter(list(range(25)))
+    iterator = PartitionedPageIterator(adapter, URL, PageResult, page_size=10)
+    assert await collect(iterator) == list(range(25))
+    request_info = adapter.count_requests[0]
+    assert request_info.url == f'{MESSAGES_URL}/$count?$filter=isRead eq false'
+    assert not request_info.headers.contains('ConsistencyLevel')
+
+
+@pytest.mark.asyncio
+async def test_windows_beyond_a_stale_count_are_fetched():
+    adapter = SkipAdapter(list(range(47)), count=20)
+    iterator = PartitionedPageIterator(adapter, URL, PageResult, page_size=10)
+    assert await collect(iterator) == list(range(47))
+    assert len(adapter.requests) == 5
+
+
+@pytest.mark.asyncio
+async def test_windows_larger_than_the_service_page_follow_next_links():
+    items = list(range(50))
+    adapter = SkipAdapter(items, max_page_size=7)
+    iterator = PartitionedPageIterator(adapter, URL, PageResult, page_size=20, total_count=50)
+    assert await collect(iterator) == items
+
+
+@pytest.mark.asyncio
+async def test_empty_collection_is_checked_with_a_single_window():
+    adapter = SkipAdapter([])
+    iterator = PartitionedPageIterator(adapter, URL, PageResult, page_size=10)
+    assert await collect(iterator) == []
+    assert len(adapter.requests) == 1
+
+
+@pytest.mark.asyncio
+async def test_closing_early_cancels_pending_windows():
+    adapter = SkipAdapter(list(range(100)))
+    iterator = PartitionedPageIterator(
+        adapter, URL, PageResult, page_size=10, total_count=100, max_concurrency=4
+    )
+    async with aclosing(aiter(iterator)) as items:
+        async for item in items:
+            if item == 3:
+                break
+    await asyncio.sleep(0.02)
+    assert adapter.in_flight == 0
+    assert len(adapter.requests) <= 5
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        PartitionedPageIterator(SkipAdapter([]), URL, PageResult, page_size=0)
+    with pytest.raises(ValueError):
+        PartitionedPageIterator(SkipAdapter([]), URL, PageResult, max_concurrency=0)
+    with pytest.raises(ValueError):
+        PartitionedPageIterator(SkipAdapter([]), URL, PageResult, total_count=-1)
@@ -0,0 +1,38 @@
+import pytest
+
+from msgraph_core.tasks.upload_progress import (
+    UploadEventStream,
+    UploadEventType,
+    UploadProgressEvent,
+)
+
+
+def make_event(event_type, acknowledged):
+    return UploadProgressEvent(
+        event_type=event_type,
+        total_bytes=100,
+        bytes_acknowledged=acknowledged,
+        elapsed_seconds=1.0,
+        average_throughput=float(acknowledged),
+        in_flight=0,
+        retries=0,
+    )
+
+
+@pytest.mark.asyncio
+async def test_event_stream_drops_oldest_events_and_ends_with_final_event():
+    stream = UploadEventStream(max_events=2)
+    for acknowledged in (10, 20, 30):
+        stream.on_event(make_event(UploadEventType.CHUNK_ACKNOWLEDGED, acknowledged))
+    stream.on_event(make_event(UploadEventType.COMPLETED, 100))
+
+    events = [event async for event in stream]
+
+    assert [event.bytes_acknowledged for event in events] == [30, 100]
+    assert stream.dropped_events == 2
+    assert str(UploadEventType.FAILED) == 'failed'
+
+
+def test_event_stream_requires_room_for_an_event():
+    with pytest.raises(ValueError):
+        UploadEventStream(max_events=0)
@@ -0,0 +1,46 @@
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+from kiota_abstractions.api_error import APIError
+
+from msgraph_core.tasks.upload_retry import ChunkRetryPolicy, UploadStatistics
+
+
+def test_transient_errors_are_retried_up_to_max_retries():
+    policy = ChunkRetryPolicy(max_retries=2)
+    assert policy.should_retry(APIError(response_status_code=503), 1)
+    assert policy.should_retry(httpx.ConnectError('reset'), 2)
+    assert not policy.should_retry(APIError(response_status_code=503), 3)
+    assert not policy.should_retry(APIError(response_status_code=404), 1)
+    assert not policy.should_retry(ValueError('bad'), 1)
+
+
+def test_delay_backs_off_exponentially_up_to_max_delay():
+    policy = ChunkRetryPolicy(backoff_factor=1.0, max_delay=5.0)
+    error = ConnectionError()
+    assert [policy.get_delay(error, attempt) for attempt in range(1, 5)] == [1.0, 2.0, 4.0, 5.0]
+
+
+def test_retry_after_takes_precedence_over_backoff():
+    policy = ChunkRetryPolicy()
+    seconds = APIError(response_status_code=429, response_headers={'Retry-After': '12'})
+    assert policy.get_delay(seconds, 1) == 12.0
+
+    retry_at = datetime.now(timezone.utc) + timedelta(seconds=30)
+    date = APIError(
+        response_status_code=503,
+        response_headers=httpx.Headers({'retry-after': format_datetime(retry_at, usegmt=True)})
+    )
+    assert 25 < policy.get_delay(date, 1) <= 30
+
+
+def test_invalid_policy_is_rejected():
+    with pytest.raises(ValueError):
+        ChunkRetryPolicy(max_retries=-1)
+
+
+def test_retry_rate():
+    assert UploadStatistics().retry_rate == 0.0
+    assert UploadStatistics(chunks_sent=3, failed_requests=1, retries=1).retry_rate == 0.25
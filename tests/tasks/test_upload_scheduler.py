@@ -0,0 +1,164 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from io import BytesIO
+
+import pytest
+from kiota_abstractions.api_error import APIError
+
+from msgraph_core.models import LargeFileUploadSession
+from msgraph_core.tasks.bandwidth_limiter import BandwidthLimiter
+from msgraph_core.tasks.upload_retry import ChunkRetryPolicy
+from msgraph_core.tasks.upload_scheduler import UploadScheduler
+
+from .test_large_file_upload import (
+    UPLOAD_URL,
+    ExpiringUploadAdapter,
+    FakeUploadAdapter,
+    make_session,
+)
+
+
+class RoutingAdapter:
+    """Routes the requests of every upload session to its own FakeUploadAdapter."""
+
+    def __init__(self, sizes, delay=0.01):
+        self.files = {f'https://upload/{name}': FakeUploadAdapter(size) for name, size in sizes}
+        self.started = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.delay = delay
+
+    async def _route(self, info, send):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        if info.url not in self.started:
+            self.started.append(info.url)
+        try:
+            await asyncio.sleep(self.delay)
+            return await send(self.files[info.url])
+        finally:
+            self.in_flight -= 1
+
+    async def send_async(self, info, factory, error_map):
+        return await self._route(info, lambda file: file.send_async(info, factory, error_map))
+
+    async def send_primitive_async(self, info, response_type, error_map):
+        return await self._route(
+            info, lambda file: file.send_primitive_async(info, response_type, error_map)
+        )
+
+
+def make_uploads(sizes):
+    return [(
+        LargeFileUploadSession(
+            upload_url=f'https://upload/{name}',
+            expiration_date_time=datetime.now(timezone.utc) + timedelta(hours=1),
+            next_expected_ranges=['0-'],
+        ), BytesIO(bytes(size))
+    ) for name, size in sizes]
+
+
+@pytest.mark.asyncio
+async def test_scheduler_uploads_small_files_first_within_global_chunk_limit():
+    sizes = [('large', 8192), ('small', 100), ('medium', 2048)]
+    adapter = RoutingAdapter(sizes)
+    progress = []
+    scheduler = UploadScheduler(
+        adapter,
+        max_concurrent_chunks=3,
+        max_concurrent_files=1,
+        max_chunk_size=1024,
+        on_progress=lambda value: progress.append(value.uploaded_bytes)
+    )
+    results = await scheduler.upload(make_uploads(sizes))
+
+    assert [result.location for result in results] == [
+        'https://upload/large', 'https://upload/small', 'https://upload/medium'
+    ]
+    assert all(result.upload_succeeded for result in results)
+    assert adapter.started == ['https://upload/small', 'https://upload/medium', 'https://upload/large']
+    assert adapter.max_in_flight == 3
+    assert progress == sorted(progress)
+    assert scheduler.progress.uploaded_bytes == scheduler.progress.total_bytes == 10340
+    assert scheduler.progress.completed_files == 3
+    for file in adapter.files.values():
+        assert not file.missing_ranges()
+
+
+@pytest.mark.asyncio
+async def test_progress_starts_over_with_a_file_restarted_on_a_new_session():
+    data = bytes(range(256)) * 40
+    adapter = ExpiringUploadAdapter(len(data))
+
+    async def refresh_session(task):
+        adapter.renewed = True
+        adapter.received.clear()
+        session = make_session()
+        session.upload_url = UPLOAD_URL + '/renewed'
+        return session
+
+    progress = []
+    scheduler = UploadScheduler(
+        adapter,
+        max_concurrent_chunks=1,
+        max_chunk_size=1024,
+        session_refresher=refresh_session,
+        on_progress=lambda value: progress.append(value.uploaded_bytes)
+    )
+    await scheduler.upload([(make_session(), BytesIO(data))])
+
+    assert progress[:4] == [1024, 2048, 3072, 1024]
+    assert max(progress) == progress[-1] == scheduler.progress.total_bytes == len(data)
+    assert adapter.assembled() == data
+
+
+@pytest.mark.asyncio
+async def test_scheduler_limits_chunks_across_concurrent_files():
+    sizes = [(str(index), 4096) for index in range(6)]
+    adapter = RoutingAdapter(sizes)
+    scheduler = UploadScheduler(adapter, max_concurrent_chunks=4, max_chunk_size=1024)
+    await scheduler.upload(make_uploads(sizes))
+
+    assert adapter.max_in_flight == 4
+
+
+@pytest.mark.asyncio
+async def test_scheduler_returns_failures_in_place():
+    sizes = [('good', 10), ('bad', 10)]
+    adapter = RoutingAdapter(sizes)
+
+    async def reject(info, response_type, error_map):
+        raise APIError('bad request', response_status_code=400)
+
+    adapter.files['https://upload/bad'].send_primitive_async = reject
+    scheduler = UploadScheduler(adapter, retry_policy=ChunkRetryPolicy(max_retries=0))
+    results = await scheduler.upload(make_uploads(sizes), return_exceptions=True)
+
+    assert results[0].upload_succeeded
+    assert isinstance(results[1], APIError)
+    assert scheduler.progress.completed_files == 1
+    assert scheduler.progress.failed_files == 1
+
+    with pytest.raises(APIError):
+        await scheduler.upload(make_uploads(sizes))
+
+
+@pytest.mark.asyncio
+async def test_bandwidth_limiter_paces_bytes(monkeypatch):
+    delays = []
+
+    async def fake_sleep(delay):
+        delays.append(delay)
+
+    limiter = BandwidthLimiter(1000, burst=500)
+    monkeypatch.setattr(asyncio, 'sleep', fake_sleep)
+    await limiter.acquire(500)
+    await limiter.acquire(1500)
+
+    assert len(delays) == 1
+    assert delays[0] == pytest.approx(1.5, abs=0.01)
+
+
+def test_bandwidth_limiter_requires_positive_rate():
+    with pytest.raises(ValueError):
+        BandwidthLimiter(0)
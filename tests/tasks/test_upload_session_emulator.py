@@ -0,0 +1,83 @@
+import json
+import os
+from io import BytesIO
+
+import pytest
+from kiota_abstractions.api_error import APIError
+
+from msgraph_core.tasks.chunk_sizer import CHUNK_SIZE_MULTIPLE
+from msgraph_core.tasks.large_file_upload import LargeFileUploadTask
+from msgraph_core.tasks.upload_retry import ChunkRetryPolicy
+from msgraph_core.tasks.upload_session_emulator import UploadSessionEmulator
+
+DATA = os.urandom(3 * CHUNK_SIZE_MULTIPLE + 1000)
+
+
+@pytest.mark.asyncio
+async def test_emulator_accepts_concurrent_chunks_and_returns_the_item():
+    emulator = UploadSessionEmulator()
+    session = emulator.create_session(len(DATA), 'report.bin')
+    task = LargeFileUploadTask(
+        session,
+        emulator.create_request_adapter(),
+        BytesIO(DATA),
+        max_chunk_size=CHUNK_SIZE_MULTIPLE,
+        max_concurrency=3,
+        hash_algorithms=['quickXorHash', 'sha1Hash']
+    )
+    result = await task.upload()
+
+    item = json.loads(result.item_response)
+    assert item['name'] == 'report.bin'
+    assert item['size'] == len(DATA)
+    assert emulator.get_content(session.upload_url) == DATA
+    assert item['file']['hashes']['quickXorHash'] == result.hashes['quickXorHash']
+    assert item['file']['hashes']['sha1Hash'] == result.hashes['sha1Hash']
+
+
+@pytest.mark.asyncio
+async def test_emulator_injects_faults_that_are_retried():
+    emulator = UploadSessionEmulator(retry_after=0)
+    session = emulator.create_session(len(DATA))
+    emulator.inject_faults(503, 429)
+    task = LargeFileUploadTask(
+        session,
+        emulator.create_request_adapter(),
+        BytesIO(DATA),
+        max_chunk_size=CHUNK_SIZE_MULTIPLE
+    )
+    await task.upload()
+
+    assert emulator.faults_injected == 2
+    assert task.statistics.throttled == 2
+    assert task.statistics.retries == 2
+    assert emulator.get_content(session.upload_url) == DATA
+
+
+@pytest.mark.asyncio
+async def test_emulator_rejects_misaligned_chunks_and_expired_sessions():
+    emulator = UploadSessionEmulator()
+    session = emulator.create_session(len(DATA))
+    task = LargeFileUploadTask(
+        session,
+        emulator.create_request_adapter(),
+        BytesIO(DATA),
+        max_chunk_size=1000,
+        retry_policy=ChunkRetryPolicy(max_retries=0)
+    )
+    with pytest.raises(APIError) as error:
+        await task.upload()
+    assert error.value.response_status_code == 400
+
+    session = emulator.create_session(len(DATA))
+    emulator.expire_session(session.upload_url)
+    task = LargeFileUploadTask(
+        session,
+        emulator.create_request_adapter(),
+        BytesIO(DATA),
+        max_chunk_size=CHUNK_SIZE_MULTIPLE,
+        retry_policy=ChunkRetryPolicy(max_retries=0)
+    )
+    with pytest.raises(APIError) as error:
+        await task.upload()
+    assert error.value.response_status_code == 404
@@ -0,0 +1,140 @@
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BufferedReader, BytesIO
+
+import pytest
+
+from msgraph_core.tasks.upload_source import (
+    AsyncIteratorUploadSource,
+    ReadAheadBuffer,
+    StreamUploadSource,
+)
+
+DATA = bytes(range(256)) * 4
+
+
+@pytest.mark.asyncio
+async def test_stream_source_slices_in_memory_streams():
+    source = StreamUploadSource(BytesIO(DATA))
+
+    chunk = await source.read(100, 50)
+
+    assert source.size == len(DATA)
+    assert isinstance(chunk, memoryview)
+    assert bytes(chunk) == DATA[100:150]
+    source.close()
+
+
+@pytest.mark.asyncio
+async def test_stream_source_memory_maps_files(tmp_path):
+    path = tmp_path / 'content.bin'
+    path.write_bytes(DATA)
+    with open(path, 'rb') as stream:
+        source = StreamUploadSource(stream)
+        chunk = await source.read(1000, 100)
+        assert source.size == len(DATA)
+        assert isinstance(chunk, memoryview)
+        assert bytes(chunk) == DATA[1000:]
+        del chunk
+        source.close()
+
+
+@pytest.mark.asyncio
+async def test_iterator_source_reads_async_generators_on_demand():
+
+    async def produce():
+        for offset in range(0, len(DATA), 100):
+            yield DATA[offset:offset + 100]
+
+    source = AsyncIteratorUploadSource(produce(), len(DATA))
+
+    assert not source.seekable
+    assert await source.read(0, 256) == DATA[:256]
+    # a chunk can be read again until it is released
+    assert await source.read(0, 256) == DATA[:256]
+    source.release(256)
+    assert await source.read(256, 768) == DATA[256:]
+    with pytest.raises(ValueError):
+        await source.read(0, 256)
+
+
+@pytest.mark.asyncio
+async def test_iterator_source_reads_generators_and_pipes():
+    generator_source = AsyncIteratorUploadSource((DATA[i:i + 7] for i in range(0, 1024, 7)), 1024)
+    assert await generator_source.read(0, 1024) == DATA
+
+    read_fd, write_fd = os.pipe()
+    os.write(write_fd, DATA)
+    os.close(write_fd)
+    with os.fdopen(read_fd, 'rb') as pipe:
+        pipe_source = AsyncIteratorUploadSource(pipe, len(DATA))
+        assert await pipe_source.read(0, 512) == DATA[:512]
+        pipe_source.release(512)
+        assert await pipe_source.read(512, 512) == DATA[512:]
+
+
+@pytest.mark.asyncio
+async def test_iterator_source_skips_bytes_already_uploaded():
+    source = AsyncIteratorUploadSource([DATA[:300], DATA[300:]], len(DATA))
+
+    assert await source.read(512, 512) == DATA[512:]
+    assert len(source._buffer) == 512
+
+
+@pytest.mark.asyncio
+async def test_iterator_source_rejects_short_content():
+    source = AsyncIteratorUploadSource([DATA[:10]], 20)
+    with pytest.raises(ValueError):
+        await source.read(0, 20)
+
+
+def test_iterator_source_requires_size():
+    with pytest.raises(ValueError):
+        AsyncIteratorUploadSource([], None)
+
+
+class CountingExecutor(ThreadPoolExecutor):
+
+    def __init__(self):
+        super().__init__(max_workers=1)
+        self.submitted = 0
+
+    def submit(self, *args, **kwargs):
+        self.submitted += 1
+        return super().submit(*args, **kwargs)
+
+
+@pytest.mark.asyncio
+async def test_stream_source_reads_off_the_event_loop():
+    # a buffered reader over BytesIO exposes neither getbuffer() nor a file descriptor
+    stream = BufferedReader(BytesIO(DATA))
+    with CountingExecutor() as executor:
+        source = StreamUploadSource(stream, size=len(DATA), executor=executor)
+        chunks = await asyncio.gather(source.read(0, 512), source.read(512, 512))
+
+    assert chunks == [DATA[:512], DATA[512:]]
+    assert executor.submitted == 2
+
+
+@pytest.mark.asyncio
+async def test_read_ahead_buffer_is_bounded_and_reuses_reads():
+    reads = []
+
+    class RecordingSource(StreamUploadSource):
+
+        async def read(self, start, length):
+            reads.append(start)
+            return await super().read(start, length)
+
+    buffer = ReadAheadBuffer(RecordingSource(BytesIO(DATA)), depth=2)
+    buffer.schedule([(0, 255), (256, 511), (512, 767)])
+    await asyncio.sleep(0)
+    assert reads == [0, 256]
+
+    assert bytes(await buffer.take(0, 255)) == DATA[:256]
+    assert reads == [0, 256]
+    buffer.schedule([(256, 511), (512, 767)])
+    await asyncio.sleep(0)
+    assert reads == [0, 256, 512]
+    buffer.clear()
@@ -1,5 +1,8 @@
 import httpx
 import pytest
+from kiota_abstractions.api_error import APIError
+from kiota_abstractions.method import Method
+from kiota_abstractions.request_information import RequestInformation
 from kiota_abstractions.serialization import (
     ParseNodeFactoryRegistry,
     SerializationWriterFactoryRegistry,
@@ -22,3 +25,70 @@ def test_create_graph_request_adapter(mock_auth_provider):
 def test_create_request_adapter_no_auth_provider():
     with pytest.raises(TypeError):
         BaseGraphRequestAdapter(None)
+
+
+@pytest.mark.asyncio
+async def test_stream_response_hands_over_the_unread_response(mock_auth_provider):
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=b'{"value": []}'))
+    request_adapter = BaseGraphRequestAdapter(
+        mock_auth_provider, http_client=httpx.AsyncClient(transport=transport)
+    )
+    request_info = RequestInformation(Method.GET)
+    request_info.url = 'https://graph.microsoft.com/v1.0/users'
+
+    async with request_adapter.stream_response(request_info) as response:
+        assert [data async for data in response.aiter_bytes()] == [b'{"value": []}']
+    assert response.is_closed
+
+
+@pytest.mark.asyncio
+async def test_stream_response_raises_for_failed_requests(mock_auth_provider):
+    transport = httpx.MockTransport(
+        lambda request: httpx.Response(404, json={'error': {
+            'code': 'itemNotFound'
+        }})
+    )
+    request_adapter = BaseGraphRequestAdapter(
+        mock_auth_provider, http_client=httpx.AsyncClient(transport=transport)
+    )
+    request_info = RequestInformation(Method.GET)
+    request_info.url = 'https://graph.microsoft.com/v1.0/users'
+
+    with pytest.raises(APIError) as error:
+        async with request_adapter.stream_response(request_info):
+            pass
+    assert error.value.response_status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_stream_response_retries_a_claims_challenge(mock_auth_provider):
+    responses = [
+        httpx.Response(
+            401,
+            headers={
+                'WWW-Authenticate':
+                'Bearer authorization_uri="https://login.microsoftonline.com", '
+                'error="insufficient_claims", claims="eyJhY2Nlc3NfdG9rZW4iOnt9fQ=="'
+            }
+        ),
+        httpx.Response(200, content=b'{"value": []}'),
+    ]
+    transport = httpx.MockTransport(lambda request: responses.pop(0))
+    request_adapter = BaseGraphRequestAdapter(
+        mock_auth_provider, http_client=httpx.AsyncClient(transport=transport)
+    )
+    contexts = []
+    authenticate_request = mock_auth_provider.authenticate_request
+
+    async def record_context(request, additional_authentication_context=None):
+        contexts.append(additional_authentication_context)
+        await authenticate_request(request, additional_authentication_context)
+
+    mock_auth_provider.authenticate_request = record_context
+    request_info = RequestInformation(Method.GET)
+    request_info.url = 'https://graph.microsoft.com/v1.0/users'
+
+    async with request_adapter.stream_response(request_info) as response:
+        assert [data async for data in response.aiter_bytes()] == [b'{"value": []}']
+    assert contexts == [{}, {'claims': 'eyJhY2Nlc3NfdG9rZW4iOnt9fQ=='}]
+    assert not responses